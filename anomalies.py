@@ -0,0 +1,263 @@
+import threading
+import warnings
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from data_layer import data_cache, load_table
+from derived import DERIVED, derived_frame
+from geo import ANY_SUBSCRIBER, SUBSCRIBER_DIMS, location_label, subscriber_scope
+import outage_impact  # noqa: F401  registers DERIVED["outage_impact"]
+import ticket_rollups  # noqa: F401  registers DERIVED["ticket_daily"]
+
+# =====================================================
+# DAILY STREAMS
+# =====================================================
+# Every monitored stream is summed once per (day, city, zone, channel, plan
+# type, subscriber status) into a long table. A breakdown (zone, channel or
+# city) is then a pivot of the rows in the filters' scope into a days x series
+# matrix - one column per series - and the detectors below score all columns
+# at once. Outages are not subscriber facts: like in geo.py, their rows carry
+# ANY_SUBSCRIBER and are kept whatever the plan type and status filters.
+
+STREAMS = {
+    "tickets": ("Ticket volume", ["zone", "ticket_channel", "city"]),
+    "outage_minutes": ("Outage minutes", ["zone", "city"]),
+    "usage_gb": ("Usage (GB)", ["zone", "city"]),
+    "revenue": ("Revenue collected (AED)", ["zone", "city"]),
+}
+BREAKDOWNS = {"zone": "Zone", "ticket_channel": "Channel", "city": "City"}
+STREAM_COLUMNS = ["day", "stream", "city", "zone", "ticket_channel"] + SUBSCRIBER_DIMS + ["value"]
+
+
+def _day(dates):
+    return pd.to_datetime(dates).to_numpy(dtype="datetime64[D]").astype("datetime64[ns]")
+
+
+def _stream_part(stream, day, city, zone, value, channel=None, plan_type=ANY_SUBSCRIBER, sub_status=ANY_SUBSCRIBER):
+    part = pd.DataFrame({"day": day, "city": np.asarray(city, dtype=object), "zone": np.asarray(zone),
+                         "ticket_channel": "All" if channel is None else np.asarray(channel, dtype=object),
+                         "plan_type": np.asarray(plan_type, dtype=object),
+                         "sub_status": np.asarray(sub_status, dtype=object),
+                         "value": np.asarray(value, dtype=float)})
+    keys = ["day", "city", "zone", "ticket_channel"] + SUBSCRIBER_DIMS
+    part = part.dropna(subset=["day"]).groupby(keys)["value"].sum()
+    return part.reset_index().assign(stream=stream)[STREAM_COLUMNS]
+
+
+def build_daily_streams():
+    tickets = derived_frame("ticket_daily", ("bucket", "city", "zone", "ticket_channel", "plan_type", "sub_status",
+                                             "tickets"))
+    outages = derived_frame("outage_impact", ("start", "city", "zone", "minutes"))
+
+    subs = derived_frame("subscribers", ("subscriber_id", "city", "zone", "plan_type", "status"))
+    usage = load_table("usage", ["subscriber_id", "usage_date", "data_usage_gb"])
+    pos = pd.Index(subs["subscriber_id"]).get_indexer(usage["subscriber_id"])
+    usage, pos = usage[pos >= 0], pos[pos >= 0]
+
+    parts = [
+        _stream_part("tickets", tickets["bucket"].to_numpy(), tickets["city"].to_numpy(),
+                     tickets["zone"].to_numpy(), tickets["tickets"], tickets["ticket_channel"].to_numpy(),
+                     tickets["plan_type"].to_numpy(), tickets["sub_status"].to_numpy()),
+        _stream_part("outage_minutes", _day(outages["start"]), outages["city"], outages["zone"],
+                     outages["minutes"]),
+        _stream_part("usage_gb", _day(usage["usage_date"]), subs["city"].to_numpy(dtype=object)[pos],
+                     subs["zone"].to_numpy()[pos], usage["data_usage_gb"].fillna(0),
+                     plan_type=subs["plan_type"].to_numpy(dtype=object)[pos],
+                     sub_status=subs["status"].to_numpy(dtype=object)[pos]),
+    ]
+    bills = derived_frame("billing_fact")
+    if "payment_date" in bills.columns:               # revenue is counted on the day it is paid
+        paid = bills[(bills["payment_status"] == "Paid").to_numpy() & bills["payment_date"].notna().to_numpy()]
+        parts.append(_stream_part("revenue", _day(paid["payment_date"]), paid["city"], paid["zone"],
+                                  paid["bill_amount"], plan_type=paid["plan_type"], sub_status=paid["sub_status"]))
+    return pd.concat(parts, ignore_index=True)
+
+
+DERIVED["daily_streams"] = (build_daily_streams, ("tickets", "outages", "usage", "billing", "subscribers"), 2)
+
+
+def series_matrix(stream, breakdown, cities=None, zones=None, plan_types=None, statuses=None):
+    """Days x series matrix (zero-filled, every calendar day) for one stream,
+    optionally limited to some cities / zones / plan types / statuses."""
+    rows = derived_frame("daily_streams")
+    mask = (rows["stream"] == stream).to_numpy()
+    if cities is not None:
+        mask = mask & rows["city"].isin(cities).to_numpy()
+    if zones is not None:
+        mask = mask & rows["zone"].isin(zones).to_numpy()
+    rows = subscriber_scope(rows[mask], plan_types, statuses)
+    keys = ["city", "zone"] if breakdown == "zone" else [breakdown]
+    matrix = rows.groupby(["day"] + keys)["value"].sum().unstack(keys, fill_value=0)
+    if matrix.empty:
+        return matrix
+    matrix = matrix.asfreq("D", fill_value=0)
+    if breakdown == "zone":
+        matrix.columns = [location_label(k) for k in matrix.columns]
+    return matrix
+
+
+# =====================================================
+# DETECTORS (VECTORISED, INCREMENTAL)
+# =====================================================
+# Both detectors score each day against history before it only:
+#   robust z  (x - rolling median) / (1.4826 x rolling MAD) over WINDOW days,
+#             falling back to 1.2533 x mean absolute deviation when the MAD
+#             is zero (sparse series such as outage minutes)
+#   EWMA z    (x - EWMA mean) / EWMA std, exponentially weighted with ALPHA
+# The scale is floored at sqrt(|median|) and 1, so low counts are not flagged
+# for every non-zero day. State carries the last
+# WINDOW rows and the EWMA moments per series: feeding new days in later
+# calls gives the same scores as one call over the whole history.
+
+WINDOW = 28
+MIN_PERIODS = 14
+ALPHA = 0.1
+ROBUST_Z = 3.5
+EWMA_Z = 4.0
+ROW_BLOCK = 32                      # days scored per block: bounds the window copy
+
+
+def _scale_floor(center):
+    return np.maximum(np.sqrt(np.abs(center)), 1.0)
+
+
+def detect(values, state=None):
+    """Score new rows of a days x series array.
+
+    Returns (robust_z, ewma_z, baseline, state); scores are NaN until a
+    series has MIN_PERIODS days of history.
+    """
+    values = np.asarray(values, dtype=float)
+    n_rows, n_series = values.shape
+    if state is None:
+        state = {"tail": np.empty((0, n_series)), "mean": np.zeros(n_series),
+                 "var": np.zeros(n_series), "n": 0}
+
+    # rolling median / MAD of the WINDOW rows before each new row
+    history = np.vstack([np.full((WINDOW, n_series), np.nan), state["tail"], values])
+    windows = sliding_window_view(history, WINDOW, axis=0)[-n_rows - 1:-1]        # (rows, series, WINDOW)
+    seen = np.minimum(len(state["tail"]) + np.arange(n_rows), WINDOW)
+    median, scale = np.full(values.shape, np.nan), np.full(values.shape, np.nan)
+    for lo in range(0, n_rows, ROW_BLOCK):
+        block = windows[lo:lo + ROW_BLOCK]
+        # nan-aware (slower) statistics only for blocks still warming up
+        stat = np.median if (seen[lo:lo + ROW_BLOCK] == WINDOW).all() else np.nanmedian
+        with warnings.catch_warnings():                     # all-NaN windows before any history
+            warnings.simplefilter("ignore", RuntimeWarning)
+            med = stat(block, axis=2)
+            spread = np.abs(block - med[..., None])
+            mad = stat(spread, axis=2)
+            mean_ad = spread.mean(axis=2) if stat is np.median else np.nanmean(spread, axis=2)
+        median[lo:lo + ROW_BLOCK] = med
+        scale[lo:lo + ROW_BLOCK] = np.where(mad > 0, 1.4826 * mad, 1.2533 * mean_ad)
+    with np.errstate(invalid="ignore"):
+        robust = (values - median) / np.maximum(scale, _scale_floor(median))
+    robust[seen < MIN_PERIODS] = np.nan
+
+    # EWMA moments, one vectorised step per day across every series
+    ewma = np.full_like(values, np.nan)
+    mean, var, n = state["mean"].copy(), state["var"].copy(), state["n"]
+    for i, row in enumerate(values):
+        if n == 0:
+            mean = row.copy()
+        else:
+            if n >= MIN_PERIODS:
+                ewma[i] = (row - mean) / np.maximum(np.sqrt(var), _scale_floor(mean))
+            diff = row - mean
+            mean = mean + ALPHA * diff
+            var = (1 - ALPHA) * (var + ALPHA * diff ** 2)
+        n += 1
+
+    tail = np.vstack([state["tail"], values])[-WINDOW:]
+    return robust, ewma, median, {"tail": tail, "mean": mean, "var": var, "n": n}
+
+
+def flagged(matrix, state=None):
+    """Long frame of flagged points in a days x series frame, and the detector
+    state after its last day."""
+    robust, ewma, baseline, state = detect(matrix.to_numpy(), state)
+    with np.errstate(invalid="ignore"):
+        hit_robust = np.abs(robust) >= ROBUST_Z
+        hit_ewma = np.abs(ewma) >= EWMA_Z
+    day, col = np.nonzero(hit_robust | hit_ewma)
+    detector = np.where(hit_robust[day, col] & hit_ewma[day, col], "both",
+                        np.where(hit_robust[day, col], "robust z", "EWMA"))
+    score = np.where(np.isnan(robust[day, col]), ewma[day, col], robust[day, col])
+    return pd.DataFrame({
+        "day": matrix.index[day],
+        "series": np.asarray(matrix.columns, dtype=object)[col],
+        "value": matrix.to_numpy()[day, col],
+        "baseline": baseline[day, col],
+        "z": np.round(score, 1),
+        "detector": detector,
+    }).sort_values(["day", "series"], ignore_index=True), state
+
+
+def flag_series(series):
+    """Flagged points of a single daily series (for chart annotations)."""
+    return flagged(series.to_frame(series.name or "value"))[0]
+
+
+# =====================================================
+# INCREMENTAL SCORING
+# =====================================================
+# A data change (e.g. the live feed) drops the cached anomaly_view, but the
+# history it rebuilds is mostly the same days. score() keeps, per query, the
+# settled days it last scored - every day but the last, which the feed may
+# still be adding to - with their flags and the detector state after them.
+# When the new matrix starts with exactly those days, only the days after them
+# are scored; anything else (a new series, an edited past day) scores the
+# whole history again.
+
+SCORED_MAX = 64                     # queries whose detector state is kept
+_SCORED = OrderedDict()             # key -> (columns, index, values, flags, state)
+_SCORED_LOCK = threading.Lock()
+
+
+def _resume(matrix, kept):
+    """Rows already scored in `kept`, or 0 when it is not a prefix of `matrix`."""
+    if kept is None:
+        return 0
+    columns, index, values = kept[:3]
+    n = len(index)
+    if (n > len(matrix) or list(matrix.columns) != columns or not matrix.index[:n].equals(index)
+            or not np.array_equal(matrix.to_numpy()[:n], values)):
+        return 0
+    return n
+
+
+def _stack(*frames):
+    """Flag frames one after the other (empty frames add nothing)."""
+    parts = [f for f in frames if len(f)] or frames[:1]
+    return pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]
+
+
+def score(key, matrix):
+    """flagged(matrix), scoring only the days after those kept under `key`."""
+    with _SCORED_LOCK:
+        kept = _SCORED.get(key)
+    start = _resume(matrix, kept)
+    settled = max(len(matrix) - 1, 0)
+    head, state = (kept[3], kept[4]) if start else (flagged(matrix.iloc[:0])[0], None)
+    body, state = flagged(matrix.iloc[start:settled], state)
+    done = _stack(head, body)
+    with _SCORED_LOCK:
+        _SCORED[key] = (list(matrix.columns), matrix.index[:settled], matrix.to_numpy()[:settled].copy(), done, state)
+        _SCORED.move_to_end(key)
+        while len(_SCORED) > SCORED_MAX:
+            _SCORED.popitem(last=False)
+    return _stack(done, flagged(matrix.iloc[settled:], state)[0])
+
+
+# =====================================================
+# QUERIES
+# =====================================================
+@data_cache("tickets", "outages", "usage", "billing", "subscribers", show_spinner=False)
+def anomaly_view(stream, breakdown, cities=None, zones=None, plan_types=None, statuses=None):
+    """{"matrix": days x series, "flags": flagged points} for a stream breakdown."""
+    matrix = series_matrix(stream, breakdown, cities, zones, plan_types, statuses)
+    key = (stream, breakdown, cities, zones, plan_types, statuses)
+    return {"matrix": matrix, "flags": score(key, matrix)}
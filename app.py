@@ -0,0 +1,457 @@
+from dataclasses import replace
+
+import streamlit as st
+
+import startup
+from flags import FLAGS
+
+run = startup.begin_run()
+
+st.set_page_config(
+    page_title="UAE Telecom Revenue & Service Operations Dashboard",
+    layout="wide"
+)
+
+# =====================================================
+# SKELETON (BEFORE ANY HEAVY IMPORT OR DATA LOAD)
+# =====================================================
+TITLES = {
+    "Executive (COO)": "Executive (COO) – Revenue & Subscriber Health",
+    "Managerial & Operational": "Managerial & Operational Dashboard",
+    "Subscriber Drill-down": "Subscriber Drill-down",
+}
+
+st.sidebar.title("Global Filters")
+
+view = st.sidebar.radio(
+    "Dashboard View",
+    list(TITLES)
+)
+
+startup.start_warm_up(view)
+loading = startup.skeleton(TITLES[view])
+run.mark("first_paint")
+
+engine = startup.timed_import("engine")
+if FLAGS["query_server"]:
+    from query_client import RemoteEngine, connect
+    engine = RemoteEngine(engine, connect(FLAGS["query_server"]))
+from charts import annotated_line_chart, heatmap_chart, pie_chart
+from tables import export_panel, paged_table, pager
+from ticket_rollups import RESAMPLE
+
+# =====================================================
+# GLOBAL FILTERS
+# =====================================================
+options = engine.filter_options(view)
+
+city_f = st.sidebar.multiselect("City", options["cities"], default=options["cities"])
+plan_type_f = st.sidebar.multiselect("Plan Type", options["plan_types"], default=options["plan_types"])
+status_f = st.sidebar.multiselect("Subscriber Status", options["statuses"], default=options["statuses"])
+
+# A click in the location table queues the next drill level for this rerun.
+if "location_pending" in st.session_state:
+    st.session_state["location"] = st.session_state.pop("location_pending")
+locations = engine.location_options(city_f)
+if st.session_state.get("location") not in locations:
+    st.session_state["location"] = ()
+location_f = st.sidebar.selectbox("Location", locations, format_func=engine.location_label, key="location")
+
+filters = engine.Filters(tuple(city_f), tuple(plan_type_f), tuple(status_f), location=location_f)
+
+
+def comparison_controls(date_range):
+    """Sidebar period comparison: (mode, baseline start), or None for no comparison."""
+    mode = st.sidebar.selectbox("Compare With", ["None", *engine.COMPARISONS, engine.CUSTOM_BASELINE])
+    if mode == "None":
+        return None
+    baseline_start = None
+    if mode == engine.CUSTOM_BASELINE:
+        baseline_start = st.sidebar.date_input(
+            "Baseline Start", engine.baseline_window(date_range, "MoM")[0].date())
+    return mode, baseline_start
+
+
+def delta(comparison, name):
+    """st.metric delta text for one KPI, e.g. "+4.2% MoM"."""
+    if comparison is None or comparison["kpis"][name]["delta"] is None:
+        return None
+    kpi = comparison["kpis"][name]
+    label = comparison["mode"] if comparison["mode"] in engine.COMPARISONS else "vs baseline"
+    return f"{kpi['delta']:+.1f}{' pts' if kpi['points'] else '%'} {label}"
+
+
+def comparison_caption(comparison):
+    if comparison is None:
+        return
+    window, baseline = comparison["window"], comparison["baseline"]
+    if comparison["covered"]:
+        st.caption(f"Deltas: {window[0]:%d %b %Y} – {window[1]:%d %b %Y} vs "
+                   f"{baseline[0]:%d %b %Y} – {baseline[1]:%d %b %Y}.")
+    else:
+        st.caption(f"No deltas: the baseline {baseline[0]:%d %b %Y} – {baseline[1]:%d %b %Y} starts "
+                   "before the data does.")
+
+# =====================================================
+# EXECUTIVE (COO) VIEW
+# =====================================================
+if view == engine.EXECUTIVE:
+    date_range = st.sidebar.date_input("Billing Period", list(options["billing_months"]))
+    if len(date_range) < 2:
+        date_range = (date_range[0], date_range[0])
+
+    filters = replace(filters, date_range=tuple(date_range))
+    compare = comparison_controls(filters.date_range)
+
+    loading.empty()
+    st.title(TITLES[view])
+    kpi_row = st.container()
+
+    plan_name_f = st.selectbox("Local Filter – Plan Name", ["All"] + engine.plan_name_options(filters))
+
+    local = replace(filters, plan_name=plan_name_f)
+    result = engine.executive_view(local)
+    kpis = result["kpis"]
+
+    comparison = compare and {**engine.executive_comparison(filters, *compare), "mode": compare[0]}
+
+    c1, c2, c3, c4 = kpi_row.columns(4)
+    c1.metric("Total Revenue (AED)", f"{kpis['total_revenue']:,.0f}", delta(comparison, "total_revenue"))
+    c2.metric("ARPU (AED)", f"{kpis['arpu']:.2f}" if kpis["arpu"] else "0", delta(comparison, "arpu"))
+    c3.metric("Retention Ratio (%)", f"{kpis['retention']:.1f}", delta(comparison, "retention"))
+    c4.metric("Overdue Revenue (AED)", f"{kpis['overdue_revenue']:,.0f}", delta(comparison, "overdue_revenue"),
+              delta_color="inverse")
+    with kpi_row:
+        comparison_caption(comparison)
+
+    st.subheader("1️⃣ Monthly ARPU Trend")
+    st.line_chart(result["arpu_trend"])
+    st.caption("ARPU varies month-wise due to churn, promotions, and plan mix changes.")
+    st.bar_chart(result["arpu_breakdown"])
+    st.caption("ARPU by source: plan charges, roaming and add-on usage, less credits issued.")
+
+    st.subheader("2️⃣ Revenue Mix by Plan Type")
+    st.bar_chart(result["revenue_by_plan_type"])
+
+    st.subheader("3️⃣ Revenue by Location")
+    geo = engine.location_view(filters)
+    node, children = geo["node"], geo["children"]
+    g1, g2, g3, g4 = st.columns(4)
+    g1.metric(f"Revenue – {engine.location_label(filters.location)} (AED)", f"{node['revenue']:,.0f}",
+              help="Global filters and the billing period apply; outages count for every plan and status.")
+    g2.metric("Active Subscribers", f"{node['active_subscribers']:,.0f}")
+    g3.metric("Tickets per 1k Subscribers", f"{node['tickets_per_1k']:,.0f}")
+    g4.metric("Outage Minutes", f"{node['outage_minutes']:,.0f}")
+    if geo["parent"] is not None:
+        share = node["revenue"] / geo["parent"]["revenue"] * 100 if geo["parent"]["revenue"] else 0
+        st.caption(f"{share:.1f}% of {engine.location_label(filters.location[:-1])} revenue.")
+    if len(children):
+        st.bar_chart(children["revenue"])
+        picked = st.dataframe(
+            children[["revenue", "arpu", "overdue_revenue", "active_subscribers", "tickets", "open_tickets",
+                      "outages", "outage_minutes", "data_gb"]].reset_index(),
+            on_select="rerun", selection_mode="single-row", hide_index=True, key=f"geo_{filters.location}",
+        )
+        st.caption("Select a row to drill down; pick a broader Location in the sidebar to roll up.")
+        if picked.selection.rows:
+            label = children.index[picked.selection.rows[0]]
+            st.session_state["location_pending"] = next(
+                k for k in locations if engine.location_label(k) == label)
+            st.rerun()
+
+    st.subheader("4️⃣ Payment Status Distribution")
+    pie_chart(result["payment_status"], label_field="payment_status", value_field="bills")
+
+    st.subheader("🔐 Subscriber Service Priority Analysis")
+
+    t1, t2, t3 = st.columns(3)
+    with t1:
+        st.bar_chart(result["tier_counts"])
+        st.caption("Tier distribution across subscriber base.")
+    with t2:
+        st.bar_chart(result["backlog_by_tier"])
+        st.caption("Ticket backlog by service priority tier.")
+    with t3:
+        st.bar_chart(result["sla_by_tier"])
+        st.caption("SLA compliance rate by service tier.")
+
+    # ---------------- Revenue Leakage ----------------
+    st.subheader("💸 Revenue Leakage")
+
+    leak = engine.leakage_view(local)
+    l1, l2, l3, l4 = st.columns(4)
+    l1.metric("Gross Billed (AED)", f"{leak['kpis']['gross_billed']:,.0f}")
+    l2.metric("Credits Issued (AED)", f"{leak['kpis']['credits']:,.0f}")
+    l3.metric("Net Billed (AED)", f"{leak['kpis']['net_billed']:,.0f}")
+    l4.metric("Credit Leakage (%)", f"{leak['kpis']['leakage_pct']:.1f}",
+              help="Credits issued as a share of gross billed revenue.")
+
+    st.bar_chart(leak["monthly"])
+    st.caption("Net billed revenue and credits issued per billing month.")
+
+    r1, r2 = st.columns(2)
+    with r1:
+        st.bar_chart(leak["credits_by_reason"])
+        st.caption("Credits issued by adjustment reason.")
+    with r2:
+        st.bar_chart(leak["credits_by_city"])
+        st.caption("Credits by city, split by adjustment reason.")
+
+    r3, r4, r5 = st.columns(3)
+    with r3:
+        st.bar_chart(leak["credits_by_tier"])
+        st.caption("Credits by service priority tier.")
+    with r4:
+        st.bar_chart(leak["days_to_pay"])
+        st.caption("Days from bill to payment (paid bills).")
+    with r5:
+        st.bar_chart(leak["overdue_ageing"])
+        st.caption("Overdue revenue by age of bill.")
+
+    with st.expander("Overdue bills"):
+        paged_table(engine, "overdue", local, "overdue_bills", "overdue bills")
+
+    # ---------------- Receivables Ageing ----------------
+    st.subheader("📆 Receivables Ageing")
+
+    ageing = engine.ageing_view(local)
+    if len(ageing):
+        as_of = st.select_slider(
+            "As of month-end",
+            options=list(ageing.index),
+            value=ageing.index[-1],
+            format_func=lambda d: d.strftime("%b %Y"),
+        )
+        snapshot = ageing.loc[as_of].rename("Outstanding (AED)")
+        st.metric("Outstanding Receivables (AED)", f"{snapshot.sum():,.0f}")
+        a1, a2 = st.columns(2)
+        with a1:
+            st.bar_chart(snapshot)
+            st.caption(f"Outstanding balance by age as of {as_of:%d %b %Y}.")
+        with a2:
+            st.bar_chart(ageing)
+            st.caption("Ageing history at every month-end; unpaid, partial and pending bills stay open.")
+
+    # ---------------- Cohort Retention ----------------
+    st.subheader("🧬 Cohort Retention")
+
+    cohorts = engine.cohort_view(local)
+    if not cohorts["survival"].empty:
+        c_subs, c_rev = st.tabs(["Subscriber Survival (%)", "Revenue Retention (%)"])
+        with c_subs:
+            heatmap_chart(cohorts["survival"].dropna(axis=1, how="all"), "survival_pct")
+            st.caption("Share of each activation-month cohort still active N months after activation. "
+                       "Inactive subscribers without a churn date count as churned in their first month.")
+        with c_rev:
+            heatmap_chart(cohorts["revenue"].dropna(axis=1, how="all"), "revenue_pct")
+            st.caption("Cohort revenue relative to its first billed month inside the billing history.")
+
+    with st.expander("📤 Export"):
+        export_panel(["bills", "usage"], local, "exec_export")
+
+# =====================================================
+# MANAGERIAL & OPERATIONAL VIEW
+# =====================================================
+elif view == engine.MANAGERIAL:
+    ops_range = st.sidebar.date_input("Operations Period", list(options["ops_period"]))
+    if len(ops_range) < 2:
+        ops_range = (ops_range[0], ops_range[0])
+    compare = comparison_controls(ops_range)
+
+    loading.empty()
+    st.title(TITLES[view])
+
+    zones = engine.zone_options(filters)
+    zone_f = st.multiselect("Local Filter – Zone", zones, default=zones)
+
+    filters = replace(filters, date_range=tuple(ops_range), zones=tuple(zone_f))
+    result = engine.ops_view(filters)
+
+    def ops_kpis(kpis, comparison=None):
+        m1, m2, m3, m4 = st.columns(4)
+        m1.metric("Total Tickets", kpis["total_tickets"], delta(comparison, "total_tickets"))
+        m2.metric("Ticket Backlog", kpis["backlog"], delta(comparison, "backlog"), delta_color="inverse")
+        m3.metric("Avg Resolution Time (hrs)", f"{kpis['avg_resolution_hours']:.1f}",
+                  delta(comparison, "avg_resolution_hours"), delta_color="inverse")
+        m4.metric("SLA Compliance (%)", f"{kpis['sla_compliance']:.1f}", delta(comparison, "sla_compliance"))
+        comparison_caption(comparison)
+
+    if FLAGS["ticket_feed"]:
+        # Only this fragment reruns on the timer; it applies new feed events and redraws.
+        @st.fragment(run_every=FLAGS["feed_refresh"])
+        def live_panel():
+            live = engine.live_view(FLAGS["ticket_feed"], filters)
+            ops_kpis(live["kpis"])
+            last = f"{live['last_event']:%d %b %H:%M:%S}" if live["last_event"] else "none yet"
+            st.caption(f"📡 Live feed: {live['events']:,} events applied ({live['skipped']:,} skipped), "
+                       f"last event {last}. Plan type and status filters do not apply to live KPIs.")
+            with st.expander("Live backlog and daily volume"):
+                f1, f2 = st.columns(2)
+                f1.bar_chart(live["backlog_by_zone"].rename("Backlog"))
+                f2.line_chart(live["daily_volume"])
+
+        live_panel()
+    else:
+        ops_kpis(result["kpis"], compare and {**engine.ops_comparison(filters, *compare), "mode": compare[0]})
+
+    st.subheader("1️⃣ Ticket Volume Trend")
+    granularity = st.radio("Granularity", list(RESAMPLE), index=1, horizontal=True)
+    trend = engine.ticket_trend(filters, granularity)
+    if granularity == "Daily":
+        annotated_line_chart(trend, engine.flag_series(trend), "tickets")
+    else:
+        st.line_chart(trend)
+    st.caption("Insight: Ticket spikes often align with outages or service disruptions."
+               + (" Flagged days are marked with their robust z-score." if granularity == "Daily" else ""))
+
+    st.subheader("2️⃣ Ticket Backlog by Zone")
+    st.bar_chart(result["backlog_by_zone"])
+    st.caption("Tickets still open at the end of the Operations Period. "
+               "Insight: Zones with high backlog need immediate operational focus.")
+
+    with st.expander("Open tickets"):
+        paged_table(engine, "backlog", filters, "backlog_tickets", "open tickets")
+
+    st.subheader("⏱️ SLA Breach Risk")
+    horizon = st.slider("Breaching within (hours)", 1, 72, 24)
+
+    def risk_panel():
+        risk = engine.sla_risk(filters, horizon, FLAGS["ticket_feed"])
+        k1, k2 = st.columns(2)
+        k1.metric("Open Tickets Past SLA", f"{risk['breached']:,}")
+        k2.metric(f"Breaching in Next {horizon} h", f"{risk['due']:,}")
+        if risk["due"]:
+            b1, b2 = st.columns(2)
+            with b1:
+                heatmap_chart(risk["due_matrix"], "tickets", fmt=",.0f")
+                st.caption("Tickets due to breach, by city zone and assigned team.")
+            with b2:
+                st.dataframe(risk["due_list"], hide_index=True)
+                st.caption("Soonest to breach first.")
+
+    if FLAGS["ticket_feed"]:
+        st.fragment(run_every=60)(risk_panel)()
+    else:
+        st.caption("Clocked at the data as-of date; set TELECOM_TICKET_FEED for a live clock.")
+        risk_panel()
+
+    st.subheader("3️⃣ SLA Performance by Channel")
+    st.bar_chart(result["sla_by_channel"])
+    st.caption("Average resolution hours of tickets resolved in the Operations Period. "
+               "Insight: SLA performance varies across support channels.")
+
+    st.subheader("4️⃣ Outage Minutes vs Ticket Volume")
+    st.scatter_chart(result["outages_vs_tickets"])
+    st.caption("Outage minutes and tickets opened in the Operations Period, per zone. "
+               "Insight: Network outages strongly correlate with ticket volume.")
+
+    st.subheader("5️⃣ Outage Impact")
+    impact = engine.outage_view(filters)
+    o1, o2, o3, o4 = st.columns(4)
+    o1.metric("Outages", f"{impact['kpis']['outages']:,}")
+    o2.metric("Subscriber-Minutes Lost", f"{impact['kpis']['subscriber_minutes']:,.0f}")
+    o3.metric("Revenue at Risk (AED)", f"{impact['kpis']['revenue_at_risk']:,.0f}",
+              help="Subscriber-minutes lost valued at the zone's monthly ARPU.")
+    o4.metric("Ticket Uplift", f"{impact['kpis']['ticket_uplift']:,.0f}",
+              help="Tickets raised in the zone from the outage day to 24 h after it ended, "
+                   "above the zone's baseline daily rate.")
+    i1, i2 = st.columns(2)
+    with i1:
+        st.bar_chart(impact["by_type"]["revenue_at_risk"])
+        st.caption("Revenue at risk by outage type.")
+    with i2:
+        st.bar_chart(impact["by_type"]["ticket_uplift"])
+        st.caption("Average extra tickets per outage, by outage type.")
+    with st.expander("Costliest outages"):
+        st.dataframe(impact["top_outages"], hide_index=True)
+
+    st.subheader("6️⃣ Anomalies")
+    a1, a2 = st.columns(2)
+    stream = a1.selectbox("Stream", list(engine.ANOMALY_STREAMS),
+                          format_func=lambda s: engine.ANOMALY_STREAMS[s][0])
+    breakdown = a2.selectbox("Per", engine.ANOMALY_STREAMS[stream][1], format_func=engine.ANOMALY_BREAKDOWNS.get)
+    found = engine.anomalies(filters, stream, breakdown)
+    flags = found["flags"]
+    if flags.empty:
+        st.caption("No anomalies flagged in the Operations Period.")
+    else:
+        counts = flags["series"].value_counts()
+        series = st.selectbox("Series", list(counts.index), format_func=lambda s: f"{s} ({counts[s]} flagged)")
+        annotated_line_chart(found["matrix"][series], flags[flags["series"] == series])
+        st.dataframe(flags.sort_values("day", ascending=False), hide_index=True)
+        st.caption("Days scoring beyond the rolling robust z-score (28-day median / MAD) or EWMA limits, "
+                   "each against its own series' history.")
+
+    with st.expander("📤 Export"):
+        export_panel(["tickets"], filters, "ops_export")
+
+
+# =====================================================
+# SUBSCRIBER DRILL-DOWN
+# =====================================================
+else:
+    loading.empty()
+    st.title(TITLES[view])
+    st.caption("Drill from city to zone to service tier, then into one subscriber's records. "
+               "Only the City global filter applies here.")
+
+    # A click on the summary table queues the next drill level for this rerun.
+    for key, value in st.session_state.pop("dd_pending", {}).items():
+        st.session_state[key] = value
+
+    s1, s2, s3 = st.columns(3)
+    city = s1.selectbox("City", ["All"] + list(city_f), key="dd_city")
+    city = None if city == "All" else city
+    zone = tier = None
+    if city is not None:
+        zone_opts = list(engine.slice_summary(city).index)
+        zone = s2.selectbox("Zone", ["All"] + zone_opts, key="dd_zone")
+        zone = None if zone == "All" else zone
+    if zone is not None:
+        tier_opts = list(engine.slice_summary(city, zone).index)
+        tier = s3.selectbox("Service Tier", ["All"] + tier_opts, key="dd_tier")
+        tier = None if tier == "All" else tier
+
+    if tier is None:
+        summary = engine.slice_summary(city, zone)
+        if city is None:
+            summary = summary[summary.index.isin(city_f)]
+        level = {"city": "dd_city", "zone": "dd_zone", "service_tier": "dd_tier"}[summary.index.name]
+        picked = st.dataframe(summary.reset_index(), on_select="rerun", selection_mode="single-row",
+                              hide_index=True, key=f"dd_summary_{level}")
+        if picked.selection.rows:
+            st.session_state["dd_pending"] = {level: summary.index[picked.selection.rows[0]]}
+            st.rerun()
+
+    st.subheader("Subscribers")
+    page_size = 50
+    scope = tuple(city_f)
+    _, total = engine.subscribers_in_slice(city, zone, tier, 0, 0, scope)
+    page = pager(total, page_size, "dd_subs", "subscribers")
+    subs_page, _ = engine.subscribers_in_slice(city, zone, tier, page, page_size, scope)
+    picked = st.dataframe(subs_page, on_select="rerun", selection_mode="single-row", hide_index=True)
+
+    sid = st.text_input(
+        "Subscriber ID",
+        subs_page["subscriber_id"].iloc[picked.selection.rows[0]] if picked.selection.rows else "",
+    ).strip()
+    profile = engine.subscriber_profile(sid) if sid else None
+    if sid and profile is None:
+        st.warning(f"No subscriber {sid}.")
+    elif profile is not None:
+        st.subheader(f"{profile['subscriber_id']} – {profile.get('subscriber_name', '')}")
+        p1, p2, p3, p4 = st.columns(4)
+        p1.metric("City / Zone", f"{profile['city']} / {profile['zone']}")
+        p2.metric("Plan", f"{profile['plan_type']} {profile['plan_name']}")
+        p3.metric("Service Tier", profile["service_tier"])
+        p4.metric("Status", profile["status"])
+
+        for tab, kind in zip(st.tabs(["Bills", "Tickets", "Usage"]), ["bills", "tickets", "usage"]):
+            with tab:
+                _, n = engine.subscriber_records(sid, kind, 0, 0)
+                rec_page = pager(n, page_size, f"dd_{kind}")
+                rows, _ = engine.subscriber_records(sid, kind, rec_page, page_size)
+                st.dataframe(rows, hide_index=True)
+
+run.mark("ready")
+startup.report(run)
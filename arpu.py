@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+
+from data_layer import load_table, read_header
+from derived import DERIVED, derived_frame
+
+# =====================================================
+# ARPU DECOMPOSITION ROLLUP
+# =====================================================
+# Monthly revenue per subscriber is split into plan charge (bill_amount),
+# roaming and add-on usage charges, and credits. Subscribers are encoded once
+# as integer codes (their row in the subscribers frame); bills and usage are
+# each summed per (code, month) into key-sorted rollups, and the two are
+# joined in one merge-ordered pass over the sorted keys. Only then are the
+# rows collapsed to the subscriber dimensions, so the rollup size depends on
+# months x dimension combinations, not on subscribers or events.
+
+COMPONENTS = ["plan", "roaming", "addons", "credits"]
+LABELS = {"plan": "Plan", "roaming": "Roaming", "addons": "Add-ons", "credits": "Credits"}
+DIMENSIONS = ["city", "zone", "plan_type", "plan_name", "sub_status", "service_tier"]
+
+
+def _month_start(dates):
+    return pd.to_datetime(dates).to_numpy(dtype="datetime64[M]")
+
+
+def _key_sums(keys, values):
+    """Sorted unique keys and the per-key sum of each value column."""
+    uniq, inverse = np.unique(keys, return_inverse=True)
+    return uniq, [np.bincount(inverse, weights=v, minlength=len(uniq)) for v in values]
+
+
+def merge_ordered_sums(left_keys, left, right_keys, right):
+    """Outer-join two key-sorted rollups; missing sides sum to zero.
+
+    A stable argsort of the two concatenated sorted runs is a single linear
+    merge; equal neighbouring keys then share one output row.
+    """
+    keys = np.concatenate([left_keys, right_keys])
+    order = np.argsort(keys, kind="stable")
+    merged = keys[order]
+    first = np.ones(len(merged), dtype=bool)
+    first[1:] = merged[1:] != merged[:-1]
+    slot = np.empty(len(keys), dtype=np.int64)
+    slot[order] = np.cumsum(first) - 1
+    out = []
+    for rows, sums in ((slot[:len(left_keys)], left), (slot[len(left_keys):], right)):
+        for values in sums:
+            col = np.zeros(first.sum())
+            col[rows] = values
+            out.append(col)
+    return merged[first], out
+
+
+def build_arpu_rollup():
+    subs = derived_frame("subscribers", ("subscriber_id", "city", "zone", "plan_type", "plan_name",
+                                         "status", "service_tier"))
+    index = pd.Index(subs["subscriber_id"])
+
+    bill_cols = [c for c in ("subscriber_id", "billing_month", "bill_amount", "credit_adjustment")
+                 if c in read_header("billing")]
+    bills = load_table("billing", bill_cols)
+    usage = load_table("usage", ["subscriber_id", "usage_date", "roaming_charges", "addon_charges"])
+
+    bill_code = index.get_indexer(bills["subscriber_id"])
+    usage_code = index.get_indexer(usage["subscriber_id"])
+    bill_month = _month_start(bills["billing_month"])
+    usage_month = _month_start(usage["usage_date"])
+    months = np.union1d(np.unique(bill_month), np.unique(usage_month))
+    n_months = len(months)
+
+    def keyed(code, month):
+        keep = code >= 0
+        return keep, code[keep].astype(np.int64) * n_months + np.searchsorted(months, month[keep])
+
+    keep, bill_key = keyed(bill_code, bill_month)
+    credits = bills["credit_adjustment"].fillna(0) if "credit_adjustment" in bills.columns else 0
+    credits = pd.Series(credits, index=bills.index).to_numpy(dtype=float)
+    bill_key, bill_sums = _key_sums(bill_key, [bills["bill_amount"].to_numpy(dtype=float)[keep], credits[keep]])
+
+    keep, usage_key = keyed(usage_code, usage_month)
+    roaming = usage["roaming_charges"].fillna(0).to_numpy(dtype=float)[keep]
+    addons = usage["addon_charges"].fillna(0).to_numpy(dtype=float)[keep]
+    usage_key, usage_sums = _key_sums(usage_key, [roaming, addons])
+
+    keys, (plan, credits, roaming, addons) = merge_ordered_sums(bill_key, bill_sums, usage_key, usage_sums)
+    code, month = keys // n_months, keys % n_months
+
+    rows = pd.DataFrame({"month": months[month].astype("datetime64[ns]"),
+                         "zone": subs["zone"].to_numpy()[code]})
+    for dim, col in [("city", "city"), ("plan_type", "plan_type"), ("plan_name", "plan_name"),
+                     ("sub_status", "status"), ("service_tier", "service_tier")]:
+        cat = pd.Categorical(subs[col].to_numpy())
+        rows[dim] = pd.Categorical.from_codes(cat.codes[code], cat.categories)
+    rows["plan"], rows["roaming"], rows["addons"], rows["credits"] = plan, roaming, addons, credits
+    return rows.groupby(["month"] + DIMENSIONS, observed=True)[COMPONENTS].sum().reset_index()
+
+
+DERIVED["arpu_rollup"] = (build_arpu_rollup, ("billing", "usage", "subscribers"), 1)
+
+
+# =====================================================
+# QUERIES
+# =====================================================
+def arpu_components(filters):
+    """Revenue per month split into COMPONENTS, for the Executive filters.
+
+    Credits are returned as positive amounts; net = plan + roaming + addons - credits.
+    """
+    rollup = derived_frame("arpu_rollup")
+    mask = filters.subscriber_mask(rollup)
+    if filters.date_range is not None:
+        start, end = (pd.to_datetime(d) for d in filters.date_range)
+        mask = mask & ((rollup["month"] >= start) & (rollup["month"] <= end)).to_numpy()
+    if filters.plan_name != "All":
+        mask = mask & (rollup["plan_name"] == filters.plan_name).to_numpy()
+    rows = rollup[mask]
+    return rows.groupby("month")[COMPONENTS].sum()
@@ -0,0 +1,160 @@
+"""Benchmark the deployed dashboard computations.
+
+Runs the same engine calls app.py makes for each view, uncached, and prints
+per-step latency. Usage:
+
+    python benchmark.py [--repeat 5] [--json]
+    python benchmark.py --profiles uniform,zipf,hotspot [--subscribers 5000]
+
+--profiles generates one data set per data_generator.py profile and runs the
+benchmark against each in a fresh process, printing a step x profile matrix
+so latency and memory can be compared as the data gets skewed.
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+import startup
+
+# =====================================================
+# SCENARIOS
+# =====================================================
+
+
+def scenarios(engine):
+    """(name, callable) pairs mirroring what one rerun of each view computes."""
+    import paging
+
+    ex = engine.filter_options(engine.EXECUTIVE)
+    ops = engine.filter_options(engine.MANAGERIAL)
+
+    exec_all = engine.Filters(tuple(ex["cities"]), tuple(ex["plan_types"]), tuple(ex["statuses"]),
+                              ex["billing_months"])
+    exec_plan = engine.Filters(exec_all.cities, exec_all.plan_types, exec_all.statuses,
+                               exec_all.date_range, "Premium")
+    ops_all = engine.Filters(tuple(ops["cities"]), tuple(ops["plan_types"]), tuple(ops["statuses"]),
+                             zones=tuple(engine.zone_options(engine.Filters(
+                                 tuple(ops["cities"]), tuple(ops["plan_types"]), tuple(ops["statuses"])))))
+    ops_month = engine.Filters(ops_all.cities, ops_all.plan_types, ops_all.statuses,
+                               (ops["ops_period"][1] - pd.Timedelta(days=30), ops["ops_period"][1]),
+                               zones=ops_all.zones)
+    ops_one_city = engine.Filters(ops_all.cities[:1], ops_all.plan_types, ops_all.statuses,
+                                  zones=ops_all.zones[:3])
+
+    return [
+        ("executive_view[all]", lambda: engine.executive_view.__wrapped__(exec_all)),
+        ("executive_view[plan]", lambda: engine.executive_view.__wrapped__(exec_plan)),
+        ("location_view[network]", lambda: engine.geo_view.__wrapped__((), exec_all.date_range, exec_all.cities,
+                                                                     exec_all.plan_types, exec_all.statuses)),
+        ("location_view[city]", lambda: engine.geo_view.__wrapped__(("Dubai",), exec_all.date_range,
+                                                                  exec_all.cities, exec_all.plan_types,
+                                                                  exec_all.statuses)),
+        ("ops_view[all]", lambda: engine.ops_view.__wrapped__(ops_all)),
+        ("ops_view[city+zones]", lambda: engine.ops_view.__wrapped__(ops_one_city)),
+        ("ticket_trend[daily]", lambda: engine.ticket_trend(ops_all, "Daily")),
+        ("ticket_trend[monthly]", lambda: engine.ticket_trend(ops_one_city, "Monthly")),
+        ("outage_view[month]", lambda: engine.outage_view.__wrapped__(ops_month)),
+        ("backlog_list[sorted]", lambda: paging.record_order.__wrapped__(
+            "backlog", ops_all, "", "priority", True)),
+        ("overdue_list[search]", lambda: paging.record_order.__wrapped__(
+            "overdue", exec_all, "sub_01", "bill_amount", False)),
+    ]
+
+
+def time_call(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def run(repeat=5):
+    t0 = time.perf_counter()
+    engine = startup.timed_import("engine")
+    import_ms = (time.perf_counter() - t0) * 1000
+
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    cases = scenarios(engine)
+    load_ms = (time.perf_counter() - t0) * 1000
+
+    results = {"import_ms": round(import_ms, 1), "first_load_ms": round(load_ms, 1), "steps": {}}
+    for name, fn in cases:
+        samples = time_call(fn, repeat)
+        results["steps"][name] = {
+            "median_ms": round(statistics.median(samples), 2),
+            "max_ms": round(max(samples), 2),
+        }
+    results["peak_traced_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 1)
+    tracemalloc.stop()
+    results["peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return results
+
+
+# =====================================================
+# PROFILE MATRIX
+# =====================================================
+def run_profiles(profiles, subscribers=5000, repeat=5, workdir=None):
+    """{profile: run() results}, each on its own generated data set."""
+    here = Path(__file__).resolve().parent
+    workdir = Path(workdir or tempfile.mkdtemp(prefix="telecom-profiles-"))
+    matrix = {}
+    for profile in profiles:
+        data_dir = workdir / profile
+        data_dir.mkdir(parents=True, exist_ok=True)
+        subprocess.run([sys.executable, str(here / "data_generator.py"), "--profile", profile,
+                        "--subscribers", str(subscribers)], cwd=data_dir, check=True)
+        # a fresh process per data set, so caches and peak memory don't carry over
+        env = {**os.environ, "TELECOM_DATA_DIR": str(data_dir),
+               "TELECOM_SNAPSHOT_DIR": str(data_dir / ".snapshots"), "TELECOM_WARM_UP": "0"}
+        out = subprocess.run([sys.executable, str(here / "benchmark.py"), "--repeat", str(repeat), "--json"],
+                             env=env, check=True, capture_output=True, text=True).stdout
+        matrix[profile] = json.loads(out)
+    return matrix
+
+
+def print_matrix(matrix):
+    profiles = list(matrix)
+    print(f"{'median ms':<24}" + "".join(f"{p:>12}" for p in profiles))
+    for name in matrix[profiles[0]]["steps"]:
+        print(f"  {name:<22}" + "".join(f"{matrix[p]['steps'][name]['median_ms']:>12}" for p in profiles))
+    for key in ["first_load_ms", "peak_traced_mb", "peak_rss_mb"]:
+        print(f"{key:<24}" + "".join(f"{matrix[p][key]:>12}" for p in profiles))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument("--profiles", default=None, help="comma-separated data_generator.py profiles")
+    parser.add_argument("--subscribers", type=int, default=5000, help="subscribers per profile data set")
+    args = parser.parse_args()
+
+    if args.profiles:
+        matrix = run_profiles(args.profiles.split(","), args.subscribers, args.repeat)
+        if args.json:
+            print(json.dumps(matrix, indent=2))
+        else:
+            print_matrix(matrix)
+        sys.exit(0)
+
+    res = run(args.repeat)
+    if args.json:
+        print(json.dumps(res, indent=2))
+    else:
+        print(f"import engine: {res['import_ms']} ms, first load: {res['first_load_ms']} ms, "
+              f"peak traced: {res['peak_traced_mb']} MB, peak RSS: {res['peak_rss_mb']} MB")
+        for name, stats in res["steps"].items():
+            print(f"  {name:<24} median {stats['median_ms']:>9} ms   max {stats['max_ms']:>9} ms")
@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+
+try:                                # fast string building and CSV writing when available
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None
+
+# =====================================================
+# VECTORISED BILLING HISTORY
+# =====================================================
+# A subscriber is billed in month m when activation_date <= m and churn_date
+# is missing or later than m. Months are sorted month starts, so each
+# subscriber's billed months are one contiguous run of month offsets
+# [first, last). Runs are expanded with repeat/arange and every field is
+# drawn in one batched call per chunk of subscribers, instead of filtering
+# and iterrows() per subscriber per month.
+
+PAYMENT_STATUSES = (["Paid", "Overdue", "Partial", "Pending"], [0.7, 0.15, 0.1, 0.05])
+CREDIT_AMOUNTS = [0, 0, 0, 20, 50]
+ADJUSTMENT_REASONS = (["Promo", "Billing Error", "Service Issue", None], [0.2, 0.1, 0.2, 0.5])
+CHUNK_SUBS = 250_000
+
+
+def billed_months(activation, churn, months):
+    """(subscriber position, month position) of every bill, subscriber-major."""
+    months = pd.DatetimeIndex(months).to_numpy()
+    first = np.searchsorted(months, pd.to_datetime(activation).to_numpy(), side="left")
+    churn = pd.to_datetime(churn).to_numpy()
+    last = np.where(pd.isna(churn), len(months), np.searchsorted(months, churn, side="left"))
+    counts = np.maximum(last - first, 0)
+
+    sub_pos = np.repeat(np.arange(len(counts)), counts)
+    starts = np.repeat(np.cumsum(counts) - counts, counts)
+    month_pos = np.repeat(first, counts) + np.arange(len(sub_pos)) - starts
+    return sub_pos, month_pos
+
+
+def categorical(rng, values, p, n):
+    """n draws from `values` (None -> missing) as a Categorical: no per-row strings."""
+    codes = rng.choice(len(values), n, p=p)
+    present = [v for v in values if v is not None]
+    remap = np.array([present.index(v) if v is not None else -1 for v in values])
+    return pd.Categorical.from_codes(remap[codes], present)
+
+
+def sequential_ids(prefix, first, n, width=0):
+    """prefix + first .. prefix + (first + n - 1), zero-padded to `width` digits,
+    built without per-row Python strings."""
+    if pa is None:
+        return prefix + pd.Series(np.arange(first, first + n)).astype(str).str.zfill(width)
+    numbers = pc.cast(pa.array(np.arange(first, first + n)), pa.string())
+    if width:
+        numbers = pc.utf8_lpad(numbers, width, "0")
+    ids = pc.binary_join_element_wise(prefix, numbers, "")
+    return pd.Series(pd.arrays.ArrowStringArray(ids))
+
+
+def synthesize_billing(subs, months, promo, payments=False, rng=np.random, first_id=0):
+    """One bill per subscriber per active month.
+
+    `promo` holds one price factor per month. `payments` adds payment_date,
+    credit_adjustment and adjustment_reason. `rng` is np.random or a
+    RandomState, so generators seeded with np.random.seed stay reproducible.
+    """
+    months = pd.DatetimeIndex(months)
+    churn = subs["churn_date"] if "churn_date" in subs else pd.Series(pd.NaT, index=subs.index)
+    sub_pos, month_pos = billed_months(subs["activation_date"], churn, months)
+    n = len(sub_pos)
+
+    charge = subs["monthly_charge"].to_numpy(dtype=float)[sub_pos]
+    billing_month = months.to_numpy()[month_pos]
+    bills = pd.DataFrame({
+        "bill_id": sequential_ids("BILL_", first_id, n),
+        "subscriber_id": subs["subscriber_id"].take(sub_pos).reset_index(drop=True),
+        "billing_month": billing_month,
+        "bill_amount": np.round(charge * np.asarray(promo)[month_pos] * rng.uniform(0.9, 1.1, n), 2),
+        "payment_status": categorical(rng, *PAYMENT_STATUSES, n),
+    })
+    if payments:
+        bills["payment_date"] = billing_month + rng.randint(1, 20, n).astype("timedelta64[D]")
+        bills["credit_adjustment"] = rng.choice(CREDIT_AMOUNTS, n)
+        bills["adjustment_reason"] = categorical(rng, *ADJUSTMENT_REASONS, n)
+    return bills
+
+
+def append_csv(frame, path, header):
+    if pa is None:
+        frame.to_csv(path, mode="w" if header else "a", header=header, index=False)
+        return
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    for i, field in enumerate(table.schema):
+        if pa.types.is_timestamp(field.type):           # dates as dates, like to_csv
+            stamps = frame[field.name]
+            whole_days = (stamps.isna() | (stamps == stamps.dt.normalize())).all()
+            to = pa.date32() if whole_days else pa.timestamp("s")
+            table = table.set_column(i, field.name, table[field.name].cast(to))
+        elif pa.types.is_dictionary(field.type):
+            table = table.set_column(i, field.name, table[field.name].cast(pa.string()))
+    with open(path, "wb" if header else "ab") as sink:
+        if header:                                      # arrow would quote the column names
+            sink.write((",".join(table.column_names) + "\n").encode())
+        pa_csv.write_csv(table, sink, pa_csv.WriteOptions(include_header=False, quoting_style="none"))
+
+
+def write_billing(subs, months, path, promo_range=(0.85, 1.15), payments=False, rng=np.random,
+                  chunk_subs=CHUNK_SUBS):
+    """Synthesize the billing history chunk by chunk into `path`; returns the row count.
+
+    Memory stays bounded by `chunk_subs` subscribers' bills whatever the
+    history length, so tens of millions of subscribers x years of months fit.
+    """
+    promo = rng.uniform(*promo_range, len(months))
+    rows = 0
+    for lo in range(0, max(len(subs), 1), chunk_subs):
+        bills = synthesize_billing(subs.iloc[lo:lo + chunk_subs], months, promo, payments, rng, rows)
+        append_csv(bills, path, header=lo == 0)
+        rows += len(bills)
+    return rows
@@ -0,0 +1,127 @@
+import streamlit as st
+
+from flags import FLAGS
+from startup import optional_import
+
+# =====================================================
+# DECLARATIVE CHART SPECS (VEGA-LITE)
+# =====================================================
+# Specs are plain dicts built from pre-aggregated values, so rendering is a
+# JSON payload for the browser instead of a server-side rasterised figure.
+
+
+@st.cache_data(show_spinner=False)
+def pie_spec(labels, values, label_field="category", value_field="count"):
+    """Donut chart spec with percentage labels, cached on the aggregated data."""
+    total = float(sum(values)) or 1.0
+    rows = [
+        {label_field: str(lbl), value_field: float(val), "share": float(val) / total}
+        for lbl, val in zip(labels, values)
+    ]
+    theta = {"field": value_field, "type": "quantitative", "stack": True}
+    return {
+        "data": {"values": rows},
+        "encoding": {
+            "theta": theta,
+            "color": {"field": label_field, "type": "nominal", "sort": list(map(str, labels))},
+            "tooltip": [
+                {"field": label_field, "type": "nominal"},
+                {"field": value_field, "type": "quantitative", "format": ","},
+                {"field": "share", "type": "quantitative", "format": ".1%"},
+            ],
+        },
+        "layer": [
+            {"mark": {"type": "arc", "innerRadius": 50, "outerRadius": 110}},
+            {
+                "mark": {"type": "text", "radius": 135},
+                "encoding": {"text": {"field": "share", "type": "quantitative", "format": ".1%"}},
+            },
+        ],
+    }
+
+
+def pie_chart(counts, label_field="category", value_field="count"):
+    """Render a value_counts()-style Series as a pie.
+
+    Uses Vega-Lite unless the deployment opts into plotly (and has it).
+    """
+    if FLAGS["charts"] == "plotly":
+        px = optional_import("plotly.express")
+        if px is not None:
+            frame = counts.rename_axis(label_field).reset_index(name=value_field)
+            st.plotly_chart(px.pie(frame, names=label_field, values=value_field))
+            return
+    spec = pie_spec(tuple(counts.index), tuple(counts.values.tolist()), label_field, value_field)
+    st.vega_lite_chart(spec)
+
+
+def heatmap_spec(x_field, y_field, value_field, fmt=".1f", scheme="blues"):
+    return {
+        "mark": {"type": "rect"},
+        "encoding": {
+            "x": {"field": x_field, "type": "ordinal"},
+            "y": {"field": y_field, "type": "ordinal", "sort": "descending"},
+            "color": {"field": value_field, "type": "quantitative", "scale": {"scheme": scheme}},
+            "tooltip": [
+                {"field": y_field, "type": "ordinal"},
+                {"field": x_field, "type": "ordinal"},
+                {"field": value_field, "type": "quantitative", "format": fmt},
+            ],
+        },
+    }
+
+
+def heatmap_chart(matrix, value_field="value", fmt=".1f"):
+    """Render a 2-D frame (index -> rows, columns -> x axis) as a heatmap.
+
+    NaN cells are dropped rather than drawn.
+    """
+    y_field = matrix.index.name or "row"
+    x_field = matrix.columns.name or "column"
+    long = matrix.rename_axis(index=y_field, columns=x_field).stack().rename(value_field).reset_index()
+    st.vega_lite_chart(long, heatmap_spec(x_field, y_field, value_field, fmt))
+
+
+def annotated_line_spec(value_field, date_field="day"):
+    """Line with flagged points drawn and labelled with their z-score on top."""
+    x = {"field": date_field, "type": "temporal", "title": None}
+    y = {"field": value_field, "type": "quantitative"}
+    return {
+        "layer": [
+            {"data": {"name": "series"}, "mark": {"type": "line"}, "encoding": {"x": x, "y": y}},
+            {
+                "data": {"name": "flags"},
+                "mark": {"type": "point", "filled": True, "size": 70, "color": "#d62728"},
+                "encoding": {
+                    "x": x, "y": y,
+                    "tooltip": [
+                        {"field": date_field, "type": "temporal"},
+                        {"field": value_field, "type": "quantitative", "format": ",.1f"},
+                        {"field": "baseline", "type": "quantitative", "format": ",.1f"},
+                        {"field": "z", "type": "quantitative"},
+                        {"field": "detector", "type": "nominal"},
+                    ],
+                },
+            },
+            {
+                "data": {"name": "flags"},
+                "mark": {"type": "text", "dy": -12, "color": "#d62728", "fontSize": 10},
+                "encoding": {"x": x, "y": y, "text": {"field": "label"}},
+            },
+        ],
+    }
+
+
+def annotated_line_chart(series, flags, value_field="value"):
+    """Render a daily series with its anomaly flags (anomalies.flagged) as annotations."""
+    date_field = series.index.name or "day"
+    line = series.rename(value_field).rename_axis(date_field).reset_index()
+    points = flags.rename(columns={"value": value_field, "day": date_field})
+    points = points.assign(label=[f"{z:+.1f}σ" for z in points["z"]])
+    for frame in (line, points):
+        frame[date_field] = frame[date_field].dt.strftime("%Y-%m-%d")
+    spec = annotated_line_spec(value_field, date_field)
+    spec["datasets"] = {"series": line.to_dict("records"),
+                        "flags": points[[date_field, value_field, "baseline", "z", "detector", "label"]]
+                        .to_dict("records")}
+    st.vega_lite_chart(spec)
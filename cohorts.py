@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+
+from data_layer import data_cache
+from derived import TODAY, derived_frame
+
+# =====================================================
+# COHORT x PERIOD RETENTION MATRICES
+# =====================================================
+# Subscribers are grouped by activation month. Every date becomes an integer
+# month index (year * 12 + month), so a subscriber's churn period and a bill's
+# period are plain integer offsets from the cohort. Each matrix is one
+# np.bincount over flattened (cohort, period) cells plus a cumulative sum -
+# no per-cohort or per-month Python loops.
+
+MAX_PERIODS = 60
+COHORT_COLUMNS = ("subscriber_id", "city", "zone", "plan_type", "plan_name", "status",
+                  "activation_date", "churn_date")
+
+
+def month_index(dates):
+    dates = pd.DatetimeIndex(dates)
+    return np.where(dates.isna(), -1, dates.year * 12 + dates.month - 1).astype(np.int64)
+
+
+def _label(idx):
+    return pd.PeriodIndex.from_ordinals(idx - (1970 * 12), freq="M").strftime("%Y-%m")
+
+
+def churn_months(subs, activation_idx):
+    """Churn month index per subscriber (-1 = still active).
+
+    Same rule as engine.active_at: a subscriber who is no longer Active but
+    has no churn date counts as churned from activation (period 0).
+    """
+    churn_idx = month_index(subs["churn_date"])
+    gone = (churn_idx < 0) & (subs["status"] != "Active").to_numpy()
+    return np.where(gone, activation_idx, churn_idx)
+
+
+def survival_matrix(activation_idx, churn_idx, as_of_idx, periods=MAX_PERIODS):
+    """Share of each cohort still active `p` months after activation.
+
+    Cells beyond `as_of_idx` (not yet observed) are NaN.
+    """
+    cohorts, c = np.unique(activation_idx, return_inverse=True)
+    n, p = len(cohorts), periods + 1
+
+    sizes = np.bincount(c, minlength=n).astype(float)
+    churned = churn_idx >= 0
+    offset = np.clip(churn_idx[churned] - activation_idx[churned], 0, p)   # p == "after window"
+    churn_counts = np.bincount(c[churned] * (p + 1) + offset, minlength=n * (p + 1)).reshape(n, p + 1)[:, :p]
+
+    survivors = sizes[:, None] - np.cumsum(churn_counts, axis=1)
+    survival = survivors / np.where(sizes[:, None] > 0, sizes[:, None], 1)
+
+    observed = cohorts[:, None] + np.arange(p)[None, :] <= as_of_idx
+    return cohorts, np.where(observed, survival, np.nan)
+
+
+def revenue_matrix(cohorts, bill_cohort_idx, bill_month_idx, amount, coverage, periods=MAX_PERIODS):
+    """Revenue per cohort per period, relative to the cohort's first period
+    inside the billing `coverage` window (first, last month index).
+
+    Periods outside the window are NaN, so they never read as churned revenue.
+    """
+    n, p = len(cohorts), periods + 1
+    c = np.searchsorted(cohorts, bill_cohort_idx)
+    offset = bill_month_idx - bill_cohort_idx
+    keep = (offset >= 0) & (offset < p)
+
+    revenue = np.bincount(c[keep] * p + offset[keep], weights=amount[keep], minlength=n * p).reshape(n, p)
+
+    month = cohorts[:, None] + np.arange(p)[None, :]
+    observed = (month >= coverage[0]) & (month <= coverage[1])
+    first = np.clip(coverage[0] - cohorts, 0, p - 1)
+    base = revenue[np.arange(n), first]
+
+    relative = revenue / np.where(base > 0, base, np.nan)[:, None]
+    return np.where(observed, relative, np.nan)
+
+
+@data_cache("subscribers", "billing", show_spinner=False)
+def cohort_view(filters, periods=MAX_PERIODS):
+    subs = derived_frame("subscribers", COHORT_COLUMNS)
+    mask = filters.subscriber_mask(subs, status_col="status")
+    if filters.plan_name != "All":
+        mask &= (subs["plan_name"] == filters.plan_name).to_numpy()
+    subs = subs[mask & subs["activation_date"].notna().to_numpy()]
+    if subs.empty:
+        empty = pd.DataFrame()
+        return {"survival": empty, "revenue": empty, "sizes": pd.Series(dtype=float)}
+
+    act_idx = month_index(subs["activation_date"])
+    churn_idx = churn_months(subs, act_idx)
+    as_of_idx = month_index([TODAY])[0]
+    cohorts, survival = survival_matrix(act_idx, churn_idx, as_of_idx, periods)
+
+    billing = derived_frame("billing_fact", ("subscriber_id", "billing_month", "bill_amount"))
+    bill_idx = month_index(billing["billing_month"])
+    pos = pd.Index(subs["subscriber_id"]).get_indexer(billing["subscriber_id"])
+    hit = pos >= 0
+    revenue = revenue_matrix(
+        cohorts, act_idx[pos[hit]], bill_idx[hit], billing["bill_amount"].to_numpy()[hit],
+        (bill_idx.min(), bill_idx.max()), periods,
+    )
+
+    labels = pd.Index(_label(cohorts), name="cohort")
+    columns = pd.RangeIndex(periods + 1, name="period")
+    return {
+        "survival": pd.DataFrame(survival * 100, index=labels, columns=columns),
+        "revenue": pd.DataFrame(revenue * 100, index=labels, columns=columns),
+        "sizes": pd.Series(np.bincount(np.searchsorted(cohorts, act_idx), minlength=len(cohorts)), index=labels),
+    }
@@ -0,0 +1,237 @@
+import functools
+import inspect
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from pathlib import Path
+
+import streamlit as st
+import pandas as pd
+
+import snapshots
+from flags import FLAGS
+
+logger = logging.getLogger(__name__)
+
+# =====================================================
+# SOURCES
+# =====================================================
+DATA_DIR = Path(os.environ.get("TELECOM_DATA_DIR", Path(__file__).resolve().parent))
+
+SOURCES = {
+    "subscribers": {"file": "subscribers.csv", "dates": ["activation_date", "churn_date"]},
+    "billing": {"file": "billing.csv", "dates": ["billing_month", "payment_date"]},
+    "tickets": {"file": "tickets.csv", "dates": ["ticket_date", "resolution_date"]},
+    "outages": {"file": "network_outages.csv", "dates": ["outage_date", "outage_start_time", "outage_end_time"]},
+    "usage": {"file": "usage_records.csv", "dates": ["usage_date"]},
+}
+
+# Raw columns each dashboard view reads directly. Everything else comes from
+# the snapshot-backed derived frames, and tables not listed are never loaded.
+VIEW_COLUMNS = {
+    "Executive (COO)": {
+        "subscribers": ["subscriber_id", "city", "zone", "plan_type", "plan_name", "status",
+                        "activation_date", "churn_date"],
+    },
+    "Managerial & Operational": {
+        "subscribers": ["subscriber_id", "city", "plan_type", "status", "zone"],
+    },
+    "Subscriber Drill-down": {
+        "subscribers": ["subscriber_id", "city", "plan_type", "status"],
+    },
+}
+
+def source_path(name):
+    return DATA_DIR / SOURCES[name]["file"]
+
+
+# =====================================================
+# DATA VERSIONS
+# =====================================================
+# Streamlit caches key on code and arguments, not on the files behind them.
+# Every data cache declares the source tables it reads (data_cache /
+# data_resource below) and is keyed by their current versions as well, so a
+# new tickets.csv misses only the ticket-derived caches and everything else
+# keeps its entries.
+#
+# A version is the file's content hash, memoised on (size, mtime) and shared
+# with the snapshot fingerprints, so touching a file without changing it
+# invalidates nothing. With snapshots off (no files written) the (size, mtime)
+# stamp is the version. Files are stat'ed at most every CHECK_INTERVAL
+# seconds. When a version changes, the entries computed from the old one are
+# dropped as well, so superseded results don't hold memory.
+#
+# The registry holds one record per (cache, versions, arguments), so a key
+# recomputed after eviction is not recorded twice. Per cache it keeps at most
+# that cache's max_entries records, the oldest miss going first: a live entry
+# whose record was dropped that way is still bounded by the cache's own
+# eviction.
+
+CHECK_INTERVAL = 1.0
+_VERSIONS = {}                      # source -> (checked_at, stamp, version)
+_ENTRIES = defaultdict(dict)        # source -> {cache: OrderedDict(entry key -> (versions, args, kwargs))}
+_VERSION_LOCK = threading.Lock()
+
+
+def _entry_key(versions, args, kwargs):
+    key = (versions, args, tuple(sorted(kwargs.items())))
+    try:
+        hash(key)
+    except TypeError:               # e.g. a list of columns; repr is stable for those
+        key = repr(key)
+    return key
+
+
+def _remember(name, cached, versions, args, kwargs, limit):
+    entries = _ENTRIES[name].setdefault(cached, OrderedDict())
+    key = _entry_key(versions, args, kwargs)
+    entries[key] = (versions, args, kwargs)
+    entries.move_to_end(key)
+    if limit is not None and len(entries) > limit:
+        entries.popitem(last=False)
+
+
+def data_version(name):
+    now = time.monotonic()
+    seen = _VERSIONS.get(name)
+    if seen and now - seen[0] < CHECK_INTERVAL:
+        return seen[2]
+
+    path = source_path(name)
+    try:
+        stat = path.stat()
+        stamp = (stat.st_size, stat.st_mtime_ns)
+    except OSError:
+        stamp = None
+    if seen and seen[1] == stamp:
+        version = seen[2]
+    elif stamp is None:
+        version = "missing"
+    elif FLAGS["snapshots"]:
+        version = snapshots.content_hash(path)
+    else:
+        version = f"{stamp[0]}:{stamp[1]}"
+
+    with _VERSION_LOCK:
+        _VERSIONS[name] = (now, stamp, version)
+        changed = seen is not None and seen[2] != version
+        stale = _ENTRIES.pop(name, {}) if changed else {}
+    if changed:
+        logger.info("%s changed (%s -> %s); dropping %d cache entries", name, seen[2], version,
+                    sum(map(len, stale.values())))
+    for cached, entries in stale.items():
+        for versions, args, kwargs in entries.values():
+            cached.clear(versions, *args, **kwargs)
+    return version
+
+
+def data_versions(names=None):
+    """Current version of each source table (all of them by default)."""
+    return {name: data_version(name) for name in (SOURCES if names is None else names)}
+
+
+def _versioned(cache, sources, options):
+    def decorate(fn):
+        def source_names(args, kwargs):
+            return sources(*args, **kwargs) if callable(sources) else sources
+
+        def compute(versions, *args, **kwargs):
+            # Runs on a miss only: remember the entry so it can be dropped
+            # once one of its sources has a new version.
+            with _VERSION_LOCK:
+                for name in source_names(args, kwargs):
+                    _remember(name, cached, versions, args, kwargs, options.get("max_entries"))
+            return fn(*args, **kwargs)
+
+        # Streamlit keys a cache on module, qualname and source: take them from
+        # `fn`, so every wrapped function gets its own cache and editing it
+        # still invalidates. The signature stays the wrapper's (with versions).
+        compute.__signature__ = inspect.signature(compute)
+        compute.__module__, compute.__qualname__, compute.__wrapped__ = fn.__module__, fn.__qualname__, fn
+        cached = cache(**options)(compute)
+
+        @functools.wraps(fn)
+        def call(*args, **kwargs):
+            versions = tuple(data_version(name) for name in source_names(args, kwargs))
+            return cached(versions, *args, **kwargs)
+
+        def clear():
+            with _VERSION_LOCK:
+                for entries in _ENTRIES.values():
+                    entries.pop(cached, None)
+            cached.clear()
+
+        call.clear = clear
+        return call
+    return decorate
+
+
+def data_cache(*sources, **options):
+    """st.cache_data that is also keyed by the versions of `sources`.
+
+    `sources` are SOURCES names, or one callable mapping the call's arguments
+    to them.
+    """
+    return _versioned(st.cache_data, sources[0] if sources and callable(sources[0]) else sources, options)
+
+
+def data_resource(*sources, **options):
+    """st.cache_resource that is also keyed by the versions of `sources`."""
+    return _versioned(st.cache_resource, sources[0] if sources and callable(sources[0]) else sources, options)
+
+
+# =====================================================
+# CACHED LOADERS (ONE ENTRY PER TABLE + PROJECTION)
+# =====================================================
+@data_cache(lambda name: (name,), show_spinner=False)
+def read_header(name):
+    return list(pd.read_csv(source_path(name), nrows=0).columns)
+
+
+@data_cache(lambda name, columns=None: (name,), show_spinner="Loading data...")
+def load_table(name, columns=None):
+    """Read one source table, optionally projected to `columns`.
+
+    Date columns that the file does not carry (e.g. `churn_date` in older
+    subscriber extracts) are added as NaT so callers never need to check.
+    """
+    header = read_header(name)
+    if columns is None:
+        wanted = header + [c for c in SOURCES[name]["dates"] if c not in header]
+    else:
+        wanted = list(columns)
+    present = [c for c in wanted if c in header]
+
+    frame = pd.read_csv(source_path(name), usecols=present)
+    for col in SOURCES[name]["dates"]:
+        if col in present:
+            frame[col] = pd.to_datetime(frame[col], errors="coerce")
+        elif col in wanted:
+            frame[col] = pd.NaT
+
+    return frame[[c for c in wanted if c in frame.columns]]
+
+
+class TableHandle:
+    """Lazy reference to a projected table; nothing is read until `.frame`."""
+
+    def __init__(self, name, columns=None):
+        self.name = name
+        self.columns = tuple(columns) if columns is not None else None
+
+    @property
+    def frame(self):
+        return load_table(self.name, self.columns)
+
+    def __repr__(self):
+        return f"TableHandle({self.name!r}, columns={self.columns!r})"
+
+
+def table(name, columns=None):
+    return TableHandle(name, columns)
+
+
+def view_tables(view):
+    return {name: table(name, cols) for name, cols in VIEW_COLUMNS[view].items()}
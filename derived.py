@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+
+import snapshots
+from data_layer import data_resource, load_table, source_path
+
+# =====================================================
+# SERVICE PRIORITY TIERS (VECTORISED)
+# =====================================================
+TODAY = pd.Timestamp("2026-01-01")
+
+TIERS = [
+    "Priority 1 – Critical",
+    "Priority 2 – High",
+    "Priority 3 – Standard",
+    "Priority 4 – Basic",
+]
+
+OPEN_STATUSES = ["Open", "In Progress", "Escalated"]
+
+
+def open_at(tickets, end=None):
+    """Mask of tickets still open at the end of day `end` (None = now): opened
+    by then and not resolved by then, as counted by the backlog KPI."""
+    if end is None:
+        return tickets["status"].isin(OPEN_STATUSES).to_numpy()
+    stop = pd.Timestamp(end).normalize() + pd.Timedelta(days=1)
+    resolved = (tickets["status"] == "Resolved") & (tickets["resolution_date"] < stop)
+    return ((tickets["ticket_date"] < stop) & ~resolved).to_numpy()
+
+
+def assign_tiers(subs, today=TODAY):
+    tenure = (today - subs["activation_date"]).dt.days / 365
+    postpaid = subs["plan_type"] == "Postpaid"
+
+    conditions = [
+        (postpaid & (subs["plan_name"] == "Unlimited")) | (tenure > 3),
+        (postpaid & (subs["plan_name"] == "Premium")) | (tenure > 1),
+        postpaid,
+    ]
+    tier = np.select(conditions, TIERS[:3], default=TIERS[3])
+    return tenure, pd.Series(tier, index=subs.index, dtype="object")
+
+
+# =====================================================
+# DERIVED FRAME BUILDERS
+# =====================================================
+SUB_DIMENSIONS = ["subscriber_id", "city", "zone", "plan_type", "plan_name", "sub_status", "service_tier"]
+
+
+def build_subscribers():
+    subs = load_table("subscribers").copy()
+    subs["tenure_years"], subs["service_tier"] = assign_tiers(subs)
+    return subs
+
+
+def _subscriber_dimensions():
+    subs = derived_frame("subscribers")
+    return subs.rename(columns={"status": "sub_status"})[SUB_DIMENSIONS]
+
+
+def build_ticket_fact():
+    tickets = load_table("tickets")
+    fact = tickets.merge(_subscriber_dimensions(), on="subscriber_id", how="left")
+    fact["res_hours"] = (fact["resolution_date"] - fact["ticket_date"]).dt.total_seconds() / 3600
+    return fact
+
+
+def build_resolved_tickets():
+    fact = derived_frame("ticket_fact")
+    return fact[fact["status"] == "Resolved"].reset_index(drop=True)
+
+
+def build_billing_fact():
+    billing = load_table("billing")
+    return billing.merge(_subscriber_dimensions(), on="subscriber_id", how="left")
+
+
+# name -> (builder, source tables, builder version). Bump the version whenever
+# a builder's output changes so existing snapshots are rebuilt.
+DERIVED = {
+    "subscribers": (build_subscribers, ("subscribers",), 1),
+    "ticket_fact": (build_ticket_fact, ("tickets", "subscribers"), 1),
+    "resolved_tickets": (build_resolved_tickets, ("tickets", "subscribers"), 1),
+    "billing_fact": (build_billing_fact, ("billing", "subscribers"), 1),
+}
+
+
+@data_resource(lambda name, columns=None: DERIVED[name][1], show_spinner="Preparing derived data...")
+def derived_frame(name, columns=None):
+    """Snapshot-backed derived frame, shared read-only across sessions.
+
+    Callers must treat the result as immutable: filter or copy before
+    adding columns.
+    """
+    builder, sources, version = DERIVED[name]
+    return snapshots.load_or_build(
+        name, builder, [source_path(s) for s in sources], columns, version
+    )
+
+
+def tiered_subscribers(columns=None):
+    if columns is not None:
+        columns = tuple(columns) + ("tenure_years", "service_tier")
+    return derived_frame("subscribers", columns)
@@ -0,0 +1,157 @@
+import numpy as np
+import pandas as pd
+
+from data_layer import data_resource, load_table
+from derived import DERIVED, derived_frame
+from paging import paged
+
+# =====================================================
+# SORTED-BY-KEY STORAGE FOR POINT LOOKUPS
+# =====================================================
+# Each record table is snapshotted once sorted by subscriber_id, and the
+# subscriber list once sorted by (city, zone, service_tier, subscriber_id).
+# An offset index (distinct keys + start row of each run) is built once per
+# table, so a lookup is one binary search for the [lo, hi) row range plus an
+# iloc slice of the k matching rows: O(log n + k), never a full-frame mask.
+
+LOCATION_KEYS = ["city", "zone", "service_tier", "subscriber_id"]
+PROFILE_COLUMNS = ["subscriber_id", "subscriber_name", "city", "zone", "service_tier",
+                   "plan_type", "plan_name", "monthly_charge", "status",
+                   "activation_date", "churn_date", "tenure_years"]
+
+
+def _sorted(frame, keys):
+    return frame.sort_values(keys, kind="stable", ignore_index=True)
+
+
+def _subscribers_by_location():
+    subs = derived_frame("subscribers")
+    return _sorted(subs[[c for c in PROFILE_COLUMNS if c in subs.columns]], LOCATION_KEYS)
+
+
+DERIVED["subscribers_by_location"] = (_subscribers_by_location, ("subscribers",), 1)
+DERIVED["subscribers_by_id"] = (
+    lambda: _sorted(derived_frame("subscribers"), ["subscriber_id"]), ("subscribers",), 1)
+DERIVED["bills_by_subscriber"] = (
+    lambda: _sorted(derived_frame("billing_fact"), ["subscriber_id", "billing_month"]),
+    ("billing", "subscribers"), 1)
+DERIVED["tickets_by_subscriber"] = (
+    lambda: _sorted(derived_frame("ticket_fact"), ["subscriber_id", "ticket_date"]),
+    ("tickets", "subscribers"), 1)
+DERIVED["usage_by_subscriber"] = (
+    lambda: _sorted(load_table("usage"), ["subscriber_id", "usage_date"]), ("usage",), 1)
+
+RECORD_TABLES = {
+    "bills": "bills_by_subscriber",
+    "tickets": "tickets_by_subscriber",
+    "usage": "usage_by_subscriber",
+}
+
+
+class OffsetIndex:
+    """Distinct keys of a sorted column with the row offset where each starts.
+
+    Rows for `keys[i]` are `offsets[i]:offsets[i + 1]`.
+    """
+
+    def __init__(self, sorted_keys):
+        n = len(sorted_keys)
+        if n:
+            starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        else:
+            starts = np.array([], dtype=np.int64)
+        self.keys = sorted_keys[starts]
+        self.offsets = np.r_[starts, n].astype(np.int64)
+
+    def range(self, key):
+        probe = np.empty((), dtype=object)
+        probe[()] = key                       # keeps tuple keys from broadcasting
+        i = int(np.searchsorted(self.keys, probe))
+        if i < len(self.keys) and self.keys[i] == key:
+            return int(self.offsets[i]), int(self.offsets[i + 1])
+        return 0, 0
+
+    def within(self, lo, hi):
+        """Keys starting inside rows [lo, hi) and their row counts."""
+        i0, i1 = np.searchsorted(self.offsets[:-1], [lo, hi])
+        return self.keys[i0:i1], np.diff(self.offsets[i0:i1 + 1])
+
+
+def _composite(frame, columns):
+    keys = np.empty(len(frame), dtype=object)
+    keys[:] = list(zip(*(frame[c].tolist() for c in columns)))
+    return keys
+
+
+@data_resource(lambda name, column="subscriber_id": DERIVED[name][1], show_spinner=False)
+def key_index(name, column="subscriber_id"):
+    return OffsetIndex(derived_frame(name, (column,))[column].to_numpy(dtype=object))
+
+
+@data_resource("subscribers", show_spinner=False)
+def location_index(depth):
+    """Offset index over the first `depth` LOCATION_KEYS, keyed by tuples."""
+    columns = tuple(LOCATION_KEYS[:depth])
+    return OffsetIndex(_composite(derived_frame("subscribers_by_location", columns), columns))
+
+
+def location_range(keys):
+    """[lo, hi) rows of subscribers_by_location under a (city, zone, tier) prefix."""
+    if not keys:
+        return 0, len(derived_frame("subscribers_by_location", ("subscriber_id",)))
+    return location_index(len(keys)).range(tuple(keys))
+
+
+# =====================================================
+# LOOKUPS
+# =====================================================
+def _prefix(city=None, zone=None, tier=None):
+    keys = []
+    for value in (city, zone, tier):
+        if value is None:
+            break
+        keys.append(value)
+    return keys
+
+
+def slice_summary(city=None, zone=None):
+    """Subscriber counts one level below the current slice (city -> zone -> tier)."""
+    keys = _prefix(city, zone)
+    lo, hi = location_range(keys)
+    depth = len(keys) + 1
+    children, counts = location_index(depth).within(lo, hi)
+    return pd.Series(counts, index=pd.Index([k[-1] for k in children], name=LOCATION_KEYS[depth - 1]),
+                     name="subscribers")
+
+
+def _paged_runs(frame, runs, page, page_size):
+    """One page over several [lo, hi) row runs read one after the other."""
+    start, stop, seen, parts = page * page_size, (page + 1) * page_size, 0, []
+    for lo, hi in runs:
+        a, b = max(start - seen, 0), min(stop - seen, hi - lo)
+        if a < b:
+            parts.append(frame.iloc[lo + a:lo + b])
+        seen += hi - lo
+    return pd.concat(parts) if len(parts) > 1 else (parts[0] if parts else frame.iloc[:0])
+
+
+def subscribers_in_slice(city=None, zone=None, tier=None, page=0, page_size=50, cities=None):
+    """One page of subscribers in a slice; without a city, `cities` (None = all)
+    limits the list to those cities' runs of rows."""
+    frame = derived_frame("subscribers_by_location")
+    if city is None and cities is not None:
+        runs = sorted(location_range([c]) for c in set(cities))
+        return _paged_runs(frame, runs, page, page_size), sum(hi - lo for lo, hi in runs)
+    lo, hi = location_range(_prefix(city, zone, tier))
+    return paged(frame, lo, hi, page, page_size), hi - lo
+
+
+def subscriber_profile(subscriber_id):
+    lo, hi = key_index("subscribers_by_id").range(subscriber_id)
+    return derived_frame("subscribers_by_id").iloc[lo] if hi > lo else None
+
+
+def subscriber_records(subscriber_id, kind, page=0, page_size=50):
+    name = RECORD_TABLES[kind]
+    lo, hi = key_index(name).range(subscriber_id)
+    return paged(derived_frame(name), lo, hi, page, page_size), hi - lo
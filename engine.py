@@ -0,0 +1,432 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from data_layer import VIEW_COLUMNS, data_cache, table
+from derived import OPEN_STATUSES, derived_frame, open_at, tiered_subscribers
+from ageing import ageing_view
+from anomalies import BREAKDOWNS as ANOMALY_BREAKDOWNS, STREAMS as ANOMALY_STREAMS, anomaly_view, flag_series
+from arpu import LABELS as ARPU_LABELS, arpu_components
+from cohorts import cohort_view
+from drilldown import slice_summary, subscriber_profile, subscriber_records, subscribers_in_slice
+from geo import location_label, location_options, geo_view
+from leakage import leakage_view
+from live_feed import live_risk, live_view
+from outage_impact import outage_slice, outage_view
+from paging import record_page
+from sla_risk import snapshot_risk
+from ticket_rollups import KPI_FLOWS, ticket_volume
+
+# =====================================================
+# SHARED COMPUTATION ENGINE
+# =====================================================
+# Every KPI and chart series the dashboard shows is computed here, once, from
+# the snapshot-backed fact tables. The Streamlit app only renders results.
+
+EXECUTIVE = "Executive (COO)"
+MANAGERIAL = "Managerial & Operational"
+DRILLDOWN = "Subscriber Drill-down"
+VIEWS = [EXECUTIVE, MANAGERIAL, DRILLDOWN]
+
+# Derived frames each view reads on its default render. The startup warm-up
+# builds only the selected view's, so a view nobody opens is never loaded.
+# Managerial needs billing too: outage revenue at risk and the revenue
+# anomaly stream are valued from bills.
+VIEW_FRAMES = {
+    EXECUTIVE: ("subscribers", "billing_fact", "ticket_fact", "resolved_tickets", "billing_leakage",
+                "arpu_rollup", "geo_cube", "geo_hierarchy", "geo_locations"),
+    MANAGERIAL: ("ticket_fact", "ticket_kpi_daily", "ticket_daily", "outage_impact", "daily_streams"),
+    DRILLDOWN: ("subscribers_by_location", "subscribers_by_id"),
+}
+
+
+@dataclass(frozen=True)
+class Filters:
+    cities: tuple
+    plan_types: tuple
+    statuses: tuple
+    date_range: tuple = None      # (start, end): billing months (Executive), operations period (Managerial)
+    plan_name: str = "All"        # Executive local filter
+    zones: tuple = None           # Managerial local filter
+    location: tuple = ()          # () / (city,) / (city, zone), see geo.py
+
+    def subscriber_mask(self, frame, status_col="sub_status"):
+        mask = (
+            frame["city"].isin(self.cities).to_numpy()
+            & frame["plan_type"].isin(self.plan_types).to_numpy()
+            & frame[status_col].isin(self.statuses).to_numpy()
+        )
+        return mask & self.location_mask(frame)
+
+    def location_mask(self, frame):
+        if not self.location:
+            return np.ones(len(frame), dtype=bool)
+        mask = (frame["city"] == self.location[0]).to_numpy()
+        if len(self.location) > 1:
+            mask = mask & (frame["zone"] == self.location[1]).to_numpy()
+        return mask
+
+    def scope(self):
+        """(cities, zones or None) after applying the location."""
+        cities = set(self.cities)
+        zones = None if self.zones is None else set(self.zones)
+        if self.location:
+            cities &= {self.location[0]}
+        if len(self.location) > 1:
+            zones = {self.location[1]} if zones is None else zones & {self.location[1]}
+        return cities, zones
+
+
+def subscribers(view):
+    cols = table("subscribers", VIEW_COLUMNS[view]["subscribers"]).columns
+    return tiered_subscribers(cols) if view == EXECUTIVE else table("subscribers", cols).frame
+
+
+def filter_options(view):
+    subs = subscribers(view)
+    options = {
+        "cities": list(subs["city"].unique()),
+        "plan_types": list(subs["plan_type"].unique()),
+        "statuses": list(subs["status"].unique()),
+    }
+    if view == EXECUTIVE:
+        months = derived_frame("billing_fact", ("billing_month",))["billing_month"]
+        options["billing_months"] = (months.min(), months.max())
+    if view == MANAGERIAL:
+        # the period covers outages and ticket activity (opened and resolved);
+        # raw outage times, so the sidebar doesn't wait on outage_impact (which reads billing)
+        outages = table("outages", ("outage_start_time", "outage_end_time")).frame
+        days = derived_frame("ticket_kpi_daily", ("day",))["day"]
+        options["ops_period"] = (min(outages["outage_start_time"].min(), days.min()),
+                                 max(outages["outage_end_time"].max(), days.max()))
+    return options
+
+
+def subscriber_slice(view, filters):
+    subs = subscribers(view)
+    return subs[filters.subscriber_mask(subs, status_col="status")]
+
+
+def plan_name_options(filters):
+    return list(subscriber_slice(EXECUTIVE, filters)["plan_name"].unique())
+
+
+# =====================================================
+# ARPU
+# =====================================================
+def active_subscribers_at(subs, months):
+    """Active count at each month: activated on/before and not yet churned.
+
+    Two sorted arrays + searchsorted instead of one full scan per month.
+    """
+    months = np.asarray(pd.to_datetime(months), dtype="datetime64[ns]")
+    activated = np.sort(subs["activation_date"].dropna().to_numpy(dtype="datetime64[ns]"))
+    churned = np.sort(subs["churn_date"].dropna().to_numpy(dtype="datetime64[ns]"))
+    return (
+        np.searchsorted(activated, months, side="right")
+        - np.searchsorted(churned, months, side="right")
+    )
+
+
+def arpu_trend(billing, subs):
+    monthly = billing.groupby("billing_month")["bill_amount"].sum().reset_index()
+    active = active_subscribers_at(subs, monthly["billing_month"])
+    monthly["active_subs"] = active
+    monthly["ARPU"] = monthly["bill_amount"] / np.maximum(active, 1)
+    return monthly
+
+
+def arpu_breakdown(filters, subs):
+    """ARPU per month split into plan, roaming, add-ons and (negative) credits.
+
+    Same denominator as arpu_trend, so the plan component is the billed ARPU.
+    """
+    components = arpu_components(filters)
+    active = active_subscribers_at(subs, components.index)
+    per_sub = components.div(np.maximum(active, 1), axis=0)
+    per_sub["credits"] = -per_sub["credits"]
+    return per_sub.rename(columns=ARPU_LABELS)
+
+
+# =====================================================
+# EXECUTIVE (COO) VIEW
+# =====================================================
+BILLING_COLUMNS = ("subscriber_id", "billing_month", "bill_amount", "payment_status",
+                   "city", "zone", "plan_type", "plan_name", "sub_status")
+TIER_TICKET_COLUMNS = ("status", "city", "zone", "plan_type", "plan_name", "sub_status", "service_tier")
+
+
+def plan_name_mask(frame, filters):
+    if filters.plan_name == "All":
+        return np.ones(len(frame), dtype=bool)
+    return (frame["plan_name"] == filters.plan_name).to_numpy()
+
+
+@data_cache("subscribers", "billing", "tickets", "usage", show_spinner=False)
+def executive_view(filters):
+    subs_f = subscriber_slice(EXECUTIVE, filters)
+    billing = derived_frame("billing_fact", BILLING_COLUMNS)
+    start, end = (pd.to_datetime(d) for d in filters.date_range)
+    billing_f = billing[
+        filters.subscriber_mask(billing)
+        & (billing["billing_month"] >= start).to_numpy()
+        & (billing["billing_month"] <= end).to_numpy()
+    ]
+
+    if filters.plan_name == "All":
+        subs_l, billing_l = subs_f, billing_f
+    else:
+        subs_l = subs_f[subs_f["plan_name"] == filters.plan_name]
+        billing_l = billing_f[billing_f["plan_name"] == filters.plan_name]
+
+    tickets = derived_frame("ticket_fact", TIER_TICKET_COLUMNS)
+    tickets_l = tickets[filters.subscriber_mask(tickets) & plan_name_mask(tickets, filters)]
+    resolved = derived_frame("resolved_tickets", TIER_TICKET_COLUMNS + ("res_hours", "sla_target_hours"))
+    resolved = resolved[filters.subscriber_mask(resolved) & plan_name_mask(resolved, filters)]
+
+    return {
+        "kpis": executive_kpis(filters, [filters.date_range])[0],
+        "arpu_trend": arpu_trend(billing_l, subs_l).set_index("billing_month")["ARPU"],
+        "arpu_breakdown": arpu_breakdown(filters, subs_l),
+        "revenue_by_plan_type": billing_l.groupby("plan_type")["bill_amount"].sum(),
+        "payment_status": billing_l["payment_status"].value_counts(),
+        "tier_counts": subs_l["service_tier"].value_counts(),
+        "backlog_by_tier": tickets_l.loc[tickets_l["status"].isin(OPEN_STATUSES), "service_tier"].value_counts(),
+        "sla_by_tier": (resolved["res_hours"] <= resolved["sla_target_hours"]).groupby(resolved["service_tier"]).mean() * 100,
+    }
+
+
+# =====================================================
+# MANAGERIAL & OPERATIONAL VIEW
+# =====================================================
+TICKET_COLUMNS = ("subscriber_id", "status", "zone", "city", "plan_type", "sub_status",
+                  "ticket_channel", "ticket_date", "resolution_date", "res_hours", "sla_target_hours")
+
+
+def zone_options(filters):
+    return sorted(subscriber_slice(MANAGERIAL, filters)["zone"].unique())
+
+
+def trend_filters(filters):
+    cities, zones = filters.scope()
+    dims = {"city": tuple(cities), "plan_type": filters.plan_types, "sub_status": filters.statuses}
+    if zones is not None:
+        dims["zone"] = tuple(zones)
+    return dims
+
+
+def ticket_trend(filters, granularity="Daily"):
+    return ticket_volume(trend_filters(filters), granularity)
+
+
+def by_location(series):
+    """Re-index a (city, zone) grouped series by location label."""
+    series.index = pd.Index([location_label(k) for k in series.index], name="location")
+    return series
+
+
+def in_period(dates, date_range):
+    """Mask of `dates` inside the (start, end) whole-day period (None = all)."""
+    if date_range is None:
+        return dates.notna().to_numpy()
+    start, end = (pd.Timestamp(d).normalize() for d in date_range)
+    return ((dates >= start) & (dates < end + pd.Timedelta(days=1))).to_numpy()
+
+
+@data_cache("tickets", "subscribers", "outages", "billing", show_spinner=False)
+def ops_view(filters):
+    """Managerial panels for the period, counted like the KPI cards: backlog
+    still open at the period end, resolution times of tickets resolved in it
+    and tickets opened in it next to the outage minutes inside it."""
+    tickets = derived_frame("ticket_fact", TICKET_COLUMNS)
+    mask = filters.subscriber_mask(tickets)
+    if filters.zones is not None:
+        mask &= tickets["zone"].isin(filters.zones).to_numpy()
+    tickets_m = tickets[mask]
+
+    resolved = tickets_m[(tickets_m["status"] == "Resolved").to_numpy()
+                         & in_period(tickets_m["resolution_date"], filters.date_range)]
+    backlog = tickets_m[open_at(tickets_m, filters.date_range and filters.date_range[1])]
+    opened = tickets_m[in_period(tickets_m["ticket_date"], filters.date_range)]
+
+    return {
+        "kpis": operations_kpis(filters, [filters.date_range])[0],
+        "backlog_by_zone": by_location(backlog.groupby(["city", "zone"]).size()),
+        "sla_by_channel": resolved.groupby("ticket_channel")["res_hours"].mean(),
+        "outages_vs_tickets": pd.DataFrame({
+            "Outage Minutes": by_location(outage_slice(filters).groupby(["city", "zone"])["minutes"].sum()),
+            "Ticket Count": by_location(opened.groupby(["city", "zone"]).size()),
+        }).fillna(0),
+    }
+
+
+def anomalies(filters, stream, breakdown):
+    """Anomaly matrix and flagged points for a stream, scoped to the filters'
+    cities / zones / plan types / statuses and cut to the period (detection
+    still sees all history)."""
+    cities, zones = filters.scope()
+    found = anomaly_view(stream, breakdown, tuple(sorted(cities)), None if zones is None else tuple(sorted(zones)),
+                         tuple(sorted(filters.plan_types)), tuple(sorted(filters.statuses)))
+    matrix, flags = found["matrix"], found["flags"]
+    if filters.date_range is not None and len(matrix):
+        start, end = (pd.to_datetime(d).normalize() for d in filters.date_range)
+        matrix = matrix.loc[start:end]
+        flags = flags[((flags["day"] >= start) & (flags["day"] <= end)).to_numpy()]
+    return {"matrix": matrix, "flags": flags}
+
+
+def location_view(filters):
+    return geo_view(filters.location, filters.date_range, filters.cities, filters.plan_types, filters.statuses)
+
+
+def sla_risk(filters, hours, feed_path=""):
+    """Open tickets breaching SLA within `hours`: live clock when a feed is set,
+    otherwise the snapshot as-of date."""
+    if feed_path:
+        return live_risk(feed_path, filters, hours)
+    return snapshot_risk(filters, hours)
+
+
+# =====================================================
+# PERIOD KPIS AND COMPARISON
+# =====================================================
+# The KPI cards and their comparison deltas come from the same functions:
+# executive_kpis / operations_kpis compute every KPI for a list of (start, end)
+# windows, so the card is always the "current" side of its own delta. The
+# selected period is compared with a baseline window of the same length:
+# shifted back a month, a quarter or a year, or starting at a custom date.
+# All windows are read from the same rollups in one pass - a (windows x rows)
+# membership matrix times the rollup's measure columns - so a comparison
+# costs one masked matrix product, not a second run of the view.
+
+COMPARISONS = {"MoM": pd.DateOffset(months=1), "QoQ": pd.DateOffset(months=3), "YoY": pd.DateOffset(years=1)}
+CUSTOM_BASELINE = "Custom baseline"
+
+
+def baseline_window(date_range, mode, baseline_start=None):
+    start, end = (pd.Timestamp(d) for d in date_range)
+    if mode == CUSTOM_BASELINE:
+        b_start = pd.Timestamp(baseline_start)
+        return b_start, b_start + (end - start)
+    return start - COMPARISONS[mode], end - COMPARISONS[mode]
+
+
+def window_totals(dates, values, windows):
+    """Column sums of `values` (rows x measures) for rows whose date falls in
+    each (start, end) window, inclusive; one row per window."""
+    dates = np.asarray(dates, dtype="datetime64[ns]")
+    member = np.stack([(dates >= np.datetime64(lo)) & (dates <= np.datetime64(hi)) for lo, hi in windows])
+    return member.astype(float) @ np.asarray(values, dtype=float)
+
+
+def active_at(subs, dates):
+    """Subscribers active at each date: activated on/before it and not churned by then.
+
+    A subscriber whose status is no longer Active but who has no churn date
+    counts as churned at every date: the data says when they joined, not
+    when they left.
+    """
+    dates = np.asarray(pd.to_datetime(dates), dtype="datetime64[ns]")
+    churn = subs["churn_date"].to_numpy(dtype="datetime64[ns]")
+    gone = np.isnat(churn) & (subs["status"] != "Active").to_numpy()
+    activated = np.sort(subs["activation_date"].to_numpy(dtype="datetime64[ns]")[~gone])
+    churned = np.sort(churn[~gone & ~np.isnat(churn)])
+    return np.searchsorted(activated, dates, side="right") - np.searchsorted(churned, dates, side="right")
+
+
+def executive_kpis(filters, windows):
+    """Executive KPIs for each (start, end) billing window, one dict per window.
+
+      revenue, overdue   billed in the window
+      ARPU               revenue / subscribers active at the window end
+      retention          active at the window end / activated by then
+    """
+    windows = [tuple(pd.Timestamp(d) for d in window) for window in windows]
+    rollup = derived_frame("billing_leakage", ("billing_month", "city", "zone", "plan_type", "plan_name",
+                                               "sub_status", "payment_status", "billed"))
+    rows = rollup[filters.subscriber_mask(rollup)]
+    overdue = (rows["payment_status"] == "Overdue").to_numpy()
+    billed = rows["billed"].to_numpy()
+    revenue, overdue_revenue = window_totals(rows["billing_month"], np.column_stack([billed, billed * overdue]),
+                                             windows).T
+
+    subs = subscriber_slice(EXECUTIVE, filters)
+    ends = [end for _, end in windows]
+    active = active_at(subs, ends)
+    activated = np.sort(subs["activation_date"].dropna().to_numpy(dtype="datetime64[ns]"))
+    started = np.searchsorted(activated, np.asarray(ends, dtype="datetime64[ns]"), side="right")
+    return [{
+        "total_revenue": revenue[i],
+        "arpu": revenue[i] / active[i] if active[i] else 0,
+        "retention": active[i] / started[i] * 100 if started[i] else 0,
+        "overdue_revenue": overdue_revenue[i],
+    } for i in range(len(windows))]
+
+
+def operations_kpis(filters, windows):
+    """Managerial KPIs for each (start, end) window (whole days; None for the
+    whole history), one dict per window.
+
+      tickets                 opened in the window
+      backlog                 opened minus resolved up to the window end
+      resolution time, SLA    tickets resolved in the window
+    """
+    rollup = derived_frame("ticket_kpi_daily")
+    windows = [(rollup["day"].min(), rollup["day"].max()) if window is None
+               else tuple(pd.Timestamp(d).normalize() for d in window) for window in windows]
+    mask = filters.subscriber_mask(rollup)
+    if filters.zones is not None:
+        mask = mask & rollup["zone"].isin(filters.zones).to_numpy()
+    rows = rollup[mask]
+    first = rollup["day"].min()
+    # flows inside each window, then everything up to each window's end (for the backlog)
+    totals = window_totals(rows["day"], rows[KPI_FLOWS].to_numpy(),
+                           windows + [(first, end) for _, end in windows])
+    kpis = []
+    for i in range(len(windows)):
+        opened, resolved, hours, met = totals[i]
+        kpis.append({
+            "total_tickets": int(opened),
+            "backlog": int(totals[len(windows) + i][0] - totals[len(windows) + i][1]),
+            "avg_resolution_hours": hours / resolved if resolved else np.nan,
+            "sla_compliance": met / resolved * 100 if resolved else np.nan,
+        })
+    return kpis
+
+
+def change(current, baseline, points=False):
+    """Relative change in % (or the difference in points), None without a baseline."""
+    if baseline is None or current is None or pd.isna(baseline) or pd.isna(current):
+        return None
+    if points:
+        return current - baseline
+    return (current - baseline) / abs(baseline) * 100 if baseline else None
+
+
+def _compare(current, baseline, covered, points=()):
+    return {name: {"current": current[name], "baseline": baseline[name] if covered else None,
+                   "delta": change(current[name], baseline[name], name in points) if covered else None,
+                   "points": name in points}
+            for name in current}
+
+
+@data_cache("subscribers", "billing", show_spinner=False)
+def executive_comparison(filters, mode, baseline_start=None):
+    current = tuple(pd.Timestamp(d) for d in filters.date_range)
+    baseline = baseline_window(current, mode, baseline_start)
+    first = derived_frame("billing_leakage", ("billing_month",))["billing_month"].min()
+    covered = pd.notna(first) and baseline[0] >= first
+    return {"window": current, "baseline": baseline, "covered": covered,
+            "kpis": _compare(*executive_kpis(filters, [current, baseline]), covered, points=("retention",))}
+
+
+@data_cache("tickets", "subscribers", show_spinner=False)
+def ops_comparison(filters, mode, baseline_start=None):
+    current = tuple(pd.Timestamp(d).normalize() for d in filters.date_range)
+    baseline = baseline_window(current, mode, baseline_start)
+    first = derived_frame("ticket_kpi_daily", ("day",))["day"].min()
+    covered = pd.notna(first) and baseline[0] >= first
+    return {"window": current, "baseline": baseline, "covered": covered,
+            "kpis": _compare(*operations_kpis(filters, [current, baseline]), covered,
+                             points=("sla_compliance",))}
@@ -0,0 +1,323 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from billing_synthesis import append_csv, sequential_ids
+
+# =====================================================
+# CORRELATED OUTAGE / TICKET / USAGE EVENTS
+# =====================================================
+# Events are simulated per (city, zone) on an hourly grid:
+#
+# outages  a self-exciting (Hawkes) process in cluster form: background
+#          outages arrive as a Poisson process per zone, and each outage
+#          triggers Poisson(outage_branching) follow-up outages of the same
+#          type in the same zone, exponentially delayed. Generations are
+#          drawn for all zones at once until none are left.
+# tickets  Poisson counts per zone-hour. The intensity is the subscriber
+#          base x diurnal / weekly seasonality x promo lift, plus an
+#          excitation from every outage in the zone: affected subscribers x
+#          tickets_per_affected_hour while it lasts, decaying exponentially
+#          after it ends, so longer and wider outages raise more tickets.
+#          Outage-driven tickets skew to network categories and higher
+#          priorities. Optional burst days lift every zone at once, and
+#          ticketer_skew concentrates tickets on a few heavy ticketers.
+# usage    Poisson records per zone-day, thinned and shrunk by the share of
+#          the zone's subscriber-day lost to outages, lifted by promos.
+#
+# Everything is array work over the zone x hour grid and the expanded event
+# index, so millions of events take seconds.
+
+SCENARIO = {
+    "days": 120,
+    "tickets_per_sub_day": 0.006,       # background ticket rate
+    "outages_per_zone_day": 0.03,       # background outage rate
+    "outage_branching": 0.35,           # follow-up outages per outage (< 1)
+    "aftershock_hours": 18,             # mean delay of a follow-up outage
+    "tickets_per_affected_hour": 0.02,  # extra tickets per affected subscriber-hour
+    "ticket_decay_hours": 6,            # excitation decay after an outage ends
+    "usage_per_sub_day": 0.08,
+    "outage_usage_drop": 0.7,           # usage lost per affected subscriber-day
+    "promos": 3,
+    "promo_days": 10,
+    "promo_ticket_lift": 1.2,
+    "promo_usage_lift": 1.35,
+    "ticketer_skew": 1.0,               # > 1 concentrates a zone's tickets on a few subscribers
+    "burst_days": 0,                    # days with a network-wide ticket burst
+    "burst_lift": 4.0,
+}
+
+# type -> (share of outages, median minutes, share of the zone affected)
+OUTAGE_TYPES = {
+    "Planned Maintenance": (0.25, 120, 0.3),
+    "Equipment Failure": (0.25, 180, 0.4),
+    "Power Outage": (0.2, 150, 0.7),
+    "Fiber Cut": (0.15, 360, 0.6),
+    "Weather": (0.15, 240, 0.5),
+}
+DIURNAL = np.array([0.3, 0.2, 0.15, 0.15, 0.2, 0.35, 0.6, 0.9, 1.2, 1.4, 1.5, 1.5,
+                    1.4, 1.4, 1.4, 1.3, 1.3, 1.4, 1.5, 1.5, 1.3, 1.0, 0.7, 0.45])
+WEEKLY = np.array([1.1, 1.05, 1.0, 1.0, 1.05, 0.85, 0.8])            # Monday first
+
+CHANNELS = ["App", "Call Center", "Online Chat", "Retail Store"]
+CATEGORIES = ["Network Issue", "Billing Query", "Technical Support", "Plan Change", "Complaint"]
+PRIORITIES = ["Low", "Medium", "High", "Critical"]
+TEAMS = ["Tier 1", "Tier 2", "Tier 3", "Field Ops"]
+OPEN_STATUSES = ["Open", "In Progress", "Escalated"]
+# background vs outage-driven draw probabilities
+CHANNEL_P = ([0.3, 0.35, 0.25, 0.1], [0.35, 0.45, 0.15, 0.05])
+CATEGORY_P = ([0.15, 0.3, 0.2, 0.15, 0.2], [0.7, 0.02, 0.18, 0.0, 0.1])
+PRIORITY_P = ([0.4, 0.35, 0.2, 0.05], [0.1, 0.3, 0.4, 0.2])
+TEAM_P = ([0.4, 0.3, 0.15, 0.15], [0.2, 0.25, 0.2, 0.35])
+RESOLUTION_HOURS = {"Low": 40, "Medium": 30, "High": 20, "Critical": 10}    # median
+STUCK_SHARE = 0.05                      # tickets left open whatever their age
+
+
+def _pick(rng, values, p_background, p_driven, driven):
+    """Per-row draw from the driven distribution where `driven`, as a Categorical."""
+    cum = np.where(driven[:, None], np.cumsum(p_driven), np.cumsum(p_background))
+    idx = (rng.rand(len(driven))[:, None] > cum).sum(axis=1)
+    return pd.Categorical.from_codes(np.minimum(idx, len(values) - 1), values)
+
+
+def _hour_cells(start_h, span):
+    """(event row, hour) for `span` consecutive hours from each event's start hour."""
+    row = np.repeat(np.arange(len(span)), span)
+    first = np.floor(start_h).astype(int)
+    return row, np.repeat(first, span) + np.arange(span.sum()) - np.repeat(np.cumsum(span) - span, span)
+
+
+def zone_index(subs):
+    """Subscribers grouped by (city, zone): zones frame + row order + offsets."""
+    keys = pd.MultiIndex.from_arrays([subs["city"].to_numpy(dtype=object), subs["zone"].to_numpy()])
+    codes, zones = pd.factorize(keys, sort=True)
+    order = np.argsort(codes, kind="stable")
+    counts = np.bincount(codes, minlength=len(zones))
+    zones = zones.to_frame(index=False, name=["city", "zone"]).assign(subscribers=counts)
+    return zones, order, np.cumsum(counts) - counts
+
+
+def seasonality(start, hours, promos, lift):
+    """Hourly intensity multiplier (mean ~1) with promo windows lifted."""
+    stamps = pd.date_range(start, periods=hours, freq="h")
+    shape = DIURNAL[stamps.hour] * WEEKLY[stamps.dayofweek]
+    shape = shape / shape.mean()
+    day = np.arange(hours) // 24
+    for lo, hi in promos:
+        shape[(day >= lo) & (day < hi)] *= lift
+    return shape
+
+
+def promo_windows(rng, scenario):
+    days, length = scenario["days"], scenario["promo_days"]
+    starts = np.sort(rng.randint(0, max(days - length, 1), scenario["promos"]))
+    return [(s, s + length) for s in starts]
+
+
+# =====================================================
+# OUTAGES (HAWKES CLUSTER PROCESS)
+# =====================================================
+def simulate_outages(rng, zones, scenario):
+    hours = scenario["days"] * 24
+    n_zones = len(zones)
+    names = list(OUTAGE_TYPES)
+    shares = np.array([OUTAGE_TYPES[t][0] for t in names])
+
+    counts = rng.poisson(scenario["outages_per_zone_day"] * scenario["days"], n_zones)
+    zone = np.repeat(np.arange(n_zones), counts)
+    start = rng.uniform(0, hours, len(zone))
+    kind = rng.choice(len(names), len(zone), p=shares / shares.sum())
+    parts = [(zone, start, kind)]
+    while len(zone):                    # one generation of follow-up outages per pass
+        kids = rng.poisson(scenario["outage_branching"], len(zone))
+        zone, kind = np.repeat(zone, kids), np.repeat(kind, kids)
+        start = np.repeat(start, kids) + rng.exponential(scenario["aftershock_hours"], kids.sum())
+        keep = start < hours
+        zone, start, kind = zone[keep], start[keep], kind[keep]
+        parts.append((zone, start, kind))
+    zone, start, kind = (np.concatenate(p) for p in zip(*parts))
+
+    planned = kind == names.index("Planned Maintenance")          # overnight windows
+    start = np.where(planned, np.floor(start / 24) * 24 + rng.uniform(1, 4, len(start)), start)
+    median = np.array([OUTAGE_TYPES[t][1] for t in names])[kind]
+    minutes = np.clip(np.round(rng.lognormal(np.log(median), 0.6)), 15, 24 * 60).astype(int)
+    reach = np.array([OUTAGE_TYPES[t][2] for t in names])[kind]
+    reach = np.clip(rng.beta(4, 4, len(zone)) * reach * 2, 0, 1)
+    affected = rng.binomial(zones["subscribers"].to_numpy()[zone], reach)
+    order = np.argsort(start, kind="stable")
+    return pd.DataFrame({"zone_pos": zone, "start_h": start, "minutes": minutes, "affected": affected,
+                         "outage_type": np.asarray(names, dtype=object)[kind]}).iloc[order].reset_index(drop=True)
+
+
+def outage_excitation(outages, n_zones, hours, scenario):
+    """Extra tickets per zone-hour caused by outages (zone x hour matrix)."""
+    decay = scenario["ticket_decay_hours"]
+    dur = outages["minutes"].to_numpy() / 60
+    row, h = _hour_cells(outages["start_h"].to_numpy(), np.ceil(dur + 5 * decay).astype(int) + 1)
+    since_end = (h + 0.5) - (outages["start_h"].to_numpy() + dur)[row]
+    level = outages["affected"].to_numpy() * scenario["tickets_per_affected_hour"]
+    rate = level[row] * np.where(since_end <= 0, 1.0, np.exp(-since_end / decay))
+    inside = (h >= 0) & (h < hours)
+    excite = np.zeros((n_zones, hours))
+    np.add.at(excite, (outages["zone_pos"].to_numpy()[row][inside], h[inside]), rate[inside])
+    return excite
+
+
+# =====================================================
+# USAGE
+# =====================================================
+USAGE_CHUNK_DAYS = 30
+
+
+def usage_rates(raw, zones, start, promos, scenario):
+    """Expected usage records per zone-day, the promo shape per day and the
+    share of each zone-day's usage kept after outages."""
+    hours, days = scenario["days"] * 24, scenario["days"]
+    n_zones = len(zones)
+    # share of each zone-day's subscriber time lost to outages
+    lost_hours = np.zeros((n_zones, hours))
+    begin = raw["start_h"].to_numpy()
+    dur = raw["minutes"].to_numpy() / 60
+    row, h = _hour_cells(begin, np.ceil(dur).astype(int) + 1)
+    overlap = np.clip(np.minimum(h + 1, (begin + dur)[row]) - np.maximum(h, begin[row]), 0, 1)
+    zone_row = raw["zone_pos"].to_numpy()[row]
+    frac = overlap * raw["affected"].to_numpy()[row] / np.maximum(zones["subscribers"].to_numpy(), 1)[zone_row]
+    inside = h < hours
+    np.add.at(lost_hours, (zone_row[inside], h[inside]), frac[inside])
+    lost = np.clip(lost_hours.reshape(n_zones, days, 24).mean(axis=2), 0, 1)
+    daily_shape = seasonality(start, hours, promos, scenario["promo_usage_lift"]).reshape(days, 24).mean(axis=1)
+    keep = 1 - scenario["outage_usage_drop"] * lost
+    rate = scenario["usage_per_sub_day"] * zones["subscribers"].to_numpy()[:, None] * daily_shape[None, :] * keep
+    return rate, daily_shape, keep
+
+
+def synthesize_usage(rng, rates, zones, offsets, sub_ids, start, days, first_id=0):
+    """Usage records for the day slice `days` of the usage_rates() matrices."""
+    rate, daily_shape, keep = rates
+    counts = rng.poisson(rate[:, days])
+    zone_pos, day = np.nonzero(counts)
+    n_cell = counts[zone_pos, day]
+    zone_pos, day = np.repeat(zone_pos, n_cell), np.repeat(day, n_cell) + days.start
+    n = len(zone_pos)
+    pick = offsets[zone_pos] + (rng.rand(n) * zones["subscribers"].to_numpy()[zone_pos]).astype(int)
+    scale = daily_shape[day] * keep[zone_pos, day]
+    return pd.DataFrame({
+        "usage_id": sequential_ids("USG_", first_id, n),
+        "subscriber_id": sub_ids.take(pick),
+        "usage_date": start + pd.to_timedelta(day, unit="D"),
+        "data_usage_gb": np.round(rng.exponential(6, n) * scale, 2),
+        "voice_minutes": (rng.randint(0, 600, n) * scale).astype(int),
+        "sms_count": rng.randint(0, 120, n),
+        "roaming_charges": np.round(rng.exponential(12, n), 2),
+        "addon_charges": np.round(rng.exponential(6, n) * daily_shape[day], 2),
+    })
+
+
+# =====================================================
+# SCENARIO
+# =====================================================
+def _simulate(subs, start, scenario, rng):
+    """Outages and tickets, plus a generator of usage chunks (USAGE_CHUNK_DAYS each)."""
+    scenario = {**SCENARIO, **(scenario or {})}
+    start = pd.Timestamp(start)
+    hours = scenario["days"] * 24
+    zones, order, offsets = zone_index(subs)
+    n_zones = len(zones)
+    sub_ids = subs["subscriber_id"].array.take(order)
+    promos = promo_windows(rng, scenario)
+
+    # ---------------- outages ----------------
+    raw = simulate_outages(rng, zones, scenario)
+    outage_start = start + pd.to_timedelta(raw["start_h"], unit="h").dt.round("min")
+    outages = pd.DataFrame({
+        "outage_id": sequential_ids("OUT_", 0, len(raw)),
+        "zone": zones["zone"].to_numpy()[raw["zone_pos"]],
+        "city": zones["city"].to_numpy()[raw["zone_pos"]],
+        "outage_date": outage_start.dt.date,
+        "outage_start_time": outage_start,
+        "outage_end_time": outage_start + pd.to_timedelta(raw["minutes"], unit="min"),
+        "outage_duration_mins": raw["minutes"],
+        "outage_type": raw["outage_type"],
+        "affected_subscribers": raw["affected"],
+    })
+
+    # ---------------- tickets ----------------
+    base = (scenario["tickets_per_sub_day"] / 24) * zones["subscribers"].to_numpy()[:, None] \
+        * seasonality(start, hours, promos, scenario["promo_ticket_lift"])[None, :]
+    if scenario["burst_days"]:
+        burst = rng.choice(scenario["days"], min(scenario["burst_days"], scenario["days"]), replace=False)
+        base.reshape(n_zones, -1, 24)[:, burst] *= scenario["burst_lift"]
+    excite = outage_excitation(raw, n_zones, hours, scenario)
+    counts = rng.poisson(base + excite)
+    zone_pos, hour = np.nonzero(counts)
+    n_cell = counts[zone_pos, hour]
+    zone_pos, hour = np.repeat(zone_pos, n_cell), np.repeat(hour, n_cell)
+    share = (excite / np.maximum(base + excite, 1e-12))[zone_pos, hour]
+    del base, excite, counts
+    n = len(zone_pos)
+    driven = rng.rand(n) < share
+
+    opened = start + pd.to_timedelta(hour + rng.rand(n), unit="h").round("min")
+    # u ** skew piles draws onto the first subscribers of each zone: a power-law of ticketers
+    u = rng.rand(n) ** scenario["ticketer_skew"]
+    pick = offsets[zone_pos] + (u * zones["subscribers"].to_numpy()[zone_pos]).astype(int)
+    priority = _pick(rng, PRIORITIES, *PRIORITY_P, driven)
+    median = np.array([RESOLUTION_HOURS[p] for p in priority.categories])[priority.codes]
+    res_hours = np.maximum(rng.lognormal(np.log(median), 0.8), 0.5)
+    resolved_at = opened + pd.to_timedelta(res_hours, unit="h").round("min")
+    horizon = start + pd.Timedelta(hours=hours)
+    resolved = (resolved_at <= horizon) & (rng.rand(n) >= STUCK_SHARE)
+    tickets = pd.DataFrame({
+        "subscriber_id": sub_ids.take(pick),
+        "ticket_date": opened,
+        "ticket_channel": _pick(rng, CHANNELS, *CHANNEL_P, driven),
+        "ticket_category": _pick(rng, CATEGORIES, *CATEGORY_P, driven),
+        "priority": priority,
+        "status": pd.Categorical.from_codes(np.where(resolved, 0, rng.randint(1, 4, n)), ["Resolved", *OPEN_STATUSES]),
+        "resolution_date": resolved_at.where(resolved),
+        "sla_target_hours": rng.choice([24, 48, 72], n),
+        "assigned_team": _pick(rng, TEAMS, *TEAM_P, driven),
+    }).sort_values("ticket_date", kind="stable", ignore_index=True)
+    tickets.insert(0, "ticket_id", sequential_ids("TIC_", 0, len(tickets)))
+
+    # ---------------- usage ----------------
+    rates = usage_rates(raw, zones, start, promos, scenario)
+
+    def usage_chunks():
+        rows = 0
+        for lo in range(0, scenario["days"], USAGE_CHUNK_DAYS):
+            chunk = synthesize_usage(rng, rates, zones, offsets, sub_ids, start,
+                                     slice(lo, min(lo + USAGE_CHUNK_DAYS, scenario["days"])), rows)
+            rows += len(chunk)
+            yield chunk
+
+    return outages, tickets, usage_chunks()
+
+
+def simulate_events(subs, start, scenario=None, rng=np.random):
+    """Outages, tickets and usage for `subs` over scenario["days"] from `start`.
+
+    Returns {"outages", "tickets", "usage"} frames in the CSV layouts the
+    dashboard reads. `rng` is np.random or a RandomState.
+    """
+    outages, tickets, usage = _simulate(subs, start, scenario, rng)
+    return {"outages": outages, "tickets": tickets, "usage": pd.concat(usage, ignore_index=True)}
+
+
+def write_events(subs, start, directory=".", scenario=None, rng=np.random):
+    """Simulate into network_outages.csv, tickets.csv and usage_records.csv.
+
+    Usage is written a chunk of days at a time, so a year of usage for
+    millions of subscribers never sits in memory at once. Returns row counts.
+    """
+    directory = Path(directory)
+    outages, tickets, usage = _simulate(subs, start, scenario, rng)
+    append_csv(outages, directory / "network_outages.csv", header=True)
+    append_csv(tickets, directory / "tickets.csv", header=True)
+    rows = {"outages": len(outages), "tickets": len(tickets), "usage": 0}
+    del outages, tickets
+    for chunk in usage:
+        append_csv(chunk, directory / "usage_records.csv", header=rows["usage"] == 0)
+        rows["usage"] += len(chunk)
+    return rows
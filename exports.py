@@ -0,0 +1,383 @@
+import argparse
+import html
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+import engine
+from data_layer import load_table
+from derived import DERIVED, SUB_DIMENSIONS, derived_frame
+from flags import FLAGS
+from paging import _filter_mask
+from startup import optional_import
+
+# =====================================================
+# USAGE ROLLUP
+# =====================================================
+# Usage is exported as monthly totals per subscriber dimension combination,
+# not as raw events: the rollup size depends on months x dimensions only.
+
+USAGE_DIMENSIONS = SUB_DIMENSIONS[1:]
+USAGE_MEASURES = {"data_usage_gb": "data_gb", "voice_minutes": "voice_minutes", "sms_count": "sms",
+                  "roaming_charges": "roaming_charges", "addon_charges": "addon_charges"}
+
+
+def build_usage_rollup():
+    subs = derived_frame("subscribers", ("subscriber_id", "city", "zone", "plan_type", "plan_name",
+                                         "status", "service_tier"))
+    usage = load_table("usage", ["subscriber_id", "usage_date", *USAGE_MEASURES])
+    code = pd.Index(subs["subscriber_id"]).get_indexer(usage["subscriber_id"])
+    keep = code >= 0
+    code = code[keep]
+
+    rows = pd.DataFrame({"month": pd.to_datetime(usage["usage_date"]).to_numpy(dtype="datetime64[M]")[keep]
+                         .astype("datetime64[ns]")})
+    for dim, col in zip(USAGE_DIMENSIONS, ("city", "zone", "plan_type", "plan_name", "status", "service_tier")):
+        cat = pd.Categorical(subs[col].to_numpy())
+        rows[dim] = pd.Categorical.from_codes(cat.codes[code], cat.categories)
+    rows["records"] = 1
+    for source, name in USAGE_MEASURES.items():
+        rows[name] = usage[source].fillna(0).to_numpy(dtype=float)[keep]
+    return rows.groupby(["month"] + USAGE_DIMENSIONS, observed=True).sum().reset_index()
+
+
+DERIVED["usage_rollup"] = (build_usage_rollup, ("usage", "subscribers"), 1)
+
+
+# =====================================================
+# STREAMING EXPORTS
+# =====================================================
+# An export walks the snapshot-backed fact table CHUNK_ROWS rows at a time,
+# applies the view filters to that slice only and hands the matching rows to
+# a format writer, which appends them to the sink (CSV text, one Parquet row
+# group, or XLSX rows in xlsxwriter's constant-memory mode). Neither the full
+# filtered frame nor its row positions are ever built.
+
+CHUNK_ROWS = 100_000
+XLSX_MAX_ROWS = 1_048_575                         # sheet limit, less the header row
+
+EXPORTS = {
+    "bills": {
+        "label": "Bills",
+        "frame": "billing_fact",
+        "columns": ["bill_id", "subscriber_id", "billing_month", "bill_amount", "payment_status",
+                    "payment_date", "credit_adjustment", "adjustment_reason", "city", "zone",
+                    "plan_type", "plan_name", "service_tier"],
+        "date": "billing_month",
+    },
+    "tickets": {
+        "label": "Tickets",
+        "frame": "ticket_fact",
+        "columns": ["ticket_id", "subscriber_id", "ticket_date", "ticket_channel", "ticket_category",
+                    "priority", "status", "resolution_date", "sla_target_hours", "assigned_team",
+                    "city", "zone", "plan_type", "plan_name", "service_tier"],
+        "date": "ticket_date",                    # opened in the period, like the Total Tickets card
+    },
+    "usage": {
+        "label": "Usage (monthly rollup)",
+        "frame": "usage_rollup",
+        "columns": ["month", *USAGE_DIMENSIONS, "records", *USAGE_MEASURES.values()],
+        "date": "month",
+    },
+}
+FILTER_COLUMNS = ("city", "zone", "plan_type", "plan_name", "sub_status")
+
+FORMATS = {
+    "csv": ("CSV", "text/csv", None),
+    "parquet": ("Parquet", "application/vnd.apache.parquet", "pyarrow.parquet"),
+    "xlsx": ("Excel", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsxwriter"),
+}
+
+
+def available_formats():
+    return [fmt for fmt, (_, _, module) in FORMATS.items() if module is None or optional_import(module)]
+
+
+def export_chunks(kind, filters, chunk_rows=CHUNK_ROWS):
+    """Filtered rows of an export, CHUNK_ROWS source rows at a time (always at
+    least one, possibly empty, chunk so writers see the columns)."""
+    spec = EXPORTS[kind]
+    frame = derived_frame(spec["frame"])
+    columns = [c for c in spec["columns"] if c in frame.columns]
+    wanted = set(columns) | set(FILTER_COLUMNS) | ({spec["date"]} if spec["date"] else set())
+    frame = derived_frame(spec["frame"], tuple(c for c in frame.columns if c in wanted))
+    sent = False
+    for lo in range(0, len(frame), chunk_rows):
+        part = frame.iloc[lo:lo + chunk_rows]
+        part = part[_filter_mask(part, filters, spec["date"])]
+        if len(part):
+            sent = True
+            yield part[columns]
+    if not sent:
+        yield frame[columns].iloc[:0]
+
+
+def _write_csv(chunks, sink):
+    rows = 0
+    for i, chunk in enumerate(chunks):
+        sink.write(chunk.to_csv(index=False, header=i == 0).encode())
+        rows += len(chunk)
+    return rows
+
+
+def _write_parquet(chunks, sink):
+    pa = optional_import("pyarrow")
+    pq = optional_import("pyarrow.parquet")
+    rows, writer = 0, None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(sink, table.schema)
+            writer.write_table(table.cast(writer.schema))
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def _write_xlsx(chunks, sink, sheet="export"):
+    rows, sheet_rows, sheets = 0, 0, 1
+    with pd.ExcelWriter(sink, engine="xlsxwriter",
+                        engine_kwargs={"options": {"constant_memory": True}}) as writer:
+        for chunk in chunks:
+            for lo in range(0, max(len(chunk), 1), XLSX_MAX_ROWS):
+                if sheet_rows == XLSX_MAX_ROWS:             # rows only ever go forward: next sheet
+                    sheets, sheet_rows = sheets + 1, 0
+                part = chunk.iloc[lo:lo + XLSX_MAX_ROWS - sheet_rows]
+                name = sheet if sheets == 1 else f"{sheet} ({sheets})"
+                part.to_excel(writer, sheet_name=name, index=False, header=sheet_rows == 0,
+                              startrow=sheet_rows + (sheet_rows > 0))
+                sheet_rows += len(part)
+                rows += len(part)
+    return rows
+
+
+WRITERS = {"csv": _write_csv, "parquet": _write_parquet, "xlsx": _write_xlsx}
+
+
+def write_export(kind, filters, fmt, sink):
+    """Stream the filtered `kind` records to a binary file object; returns the row count."""
+    if fmt not in available_formats():
+        raise ValueError(f"Export format {fmt!r} is not available (missing {FORMATS[fmt][2]}).")
+    if fmt == "xlsx":
+        return _write_xlsx(export_chunks(kind, filters), sink, sheet=kind)
+    return WRITERS[fmt](export_chunks(kind, filters), sink)
+
+
+def export_to_disk(kind, filters, fmt, path):
+    """Write an export to `path` (atomically); returns the row count."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as sink:
+            rows = write_export(kind, filters, fmt, sink)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return rows
+
+
+def export_file(kind, filters, fmt):
+    """The export as a rewound temporary file (spooled to disk past 16 MB),
+    for st.download_button."""
+    sink = tempfile.SpooledTemporaryFile(max_size=16 << 20)
+    write_export(kind, filters, fmt, sink)
+    sink.seek(0)
+    return sink
+
+
+def export_name(kind, fmt, filters=None):
+    period = ""
+    if filters is not None and EXPORTS[kind]["date"] and filters.date_range is not None:
+        start, end = (pd.Timestamp(d) for d in filters.date_range)
+        period = f"_{start:%Y%m%d}-{end:%Y%m%d}"
+    return f"{kind}{period}.{fmt}"
+
+
+# =====================================================
+# KPI REPORTS PER FILTER PRESET
+# =====================================================
+# A preset names a global filter selection; None keeps every option. Reports
+# cover the last REPORT_MONTHS months of billing (Executive) and outage
+# (Managerial) data, compared with the period before, and are rendered to a
+# self-contained HTML page - and to PDF when weasyprint is installed. The
+# batch CLI writes one file per preset into the report directory, where the
+# dashboard serves them from without recomputing.
+
+REPORT_MONTHS = 1
+REPORT_COMPARISON = "MoM"
+
+PRESETS = {
+    "network": {"label": "Whole network"},
+    "postpaid": {"label": "Postpaid subscribers", "plan_types": ("Postpaid",)},
+    "prepaid": {"label": "Prepaid subscribers", "plan_types": ("Prepaid",)},
+    "dubai": {"label": "Dubai", "cities": ("Dubai",)},
+    "abu_dhabi": {"label": "Abu Dhabi", "cities": ("Abu Dhabi",)},
+    "sharjah": {"label": "Sharjah", "cities": ("Sharjah",)},
+}
+
+EXECUTIVE_KPIS = [("total_revenue", "Total Revenue (AED)", "{:,.0f}"), ("arpu", "ARPU (AED)", "{:,.2f}"),
+                  ("retention", "Retention Ratio (%)", "{:.1f}"),
+                  ("overdue_revenue", "Overdue Revenue (AED)", "{:,.0f}")]
+OPS_KPIS = [("total_tickets", "Tickets Opened", "{:,.0f}"), ("backlog", "Ticket Backlog", "{:,.0f}"),
+            ("avg_resolution_hours", "Avg Resolution Time (hrs)", "{:.1f}"),
+            ("sla_compliance", "SLA Compliance (%)", "{:.1f}")]
+
+
+def report_dir():
+    return Path(FLAGS["export_dir"]) / "reports" if FLAGS["export_dir"] else None
+
+
+def _window(last, monthly):
+    """The last REPORT_MONTHS months up to `last`: whole billing months, or days."""
+    end = pd.Timestamp(last).normalize()
+    if monthly:
+        return (end - pd.DateOffset(months=REPORT_MONTHS - 1)).date(), end.date()
+    return (end - pd.DateOffset(months=REPORT_MONTHS) + pd.Timedelta(days=1)).date(), end.date()
+
+
+def preset_filters(name, view):
+    preset, options = PRESETS[name], engine.filter_options(view)
+    filters = engine.Filters(*(tuple(v for v in options[key] if preset.get(key) is None or v in preset[key])
+                               for key in ("cities", "plan_types", "statuses")))
+    if view == engine.EXECUTIVE:
+        window = _window(options["billing_months"][1], monthly=True)
+    else:
+        window = _window(options["ops_period"][1], monthly=False)
+    return engine.Filters(filters.cities, filters.plan_types, filters.statuses, date_range=window)
+
+
+def _kpi_table(comparison, kpis):
+    rows = []
+    for key, label, fmt in kpis:
+        kpi = comparison["kpis"][key]
+        value = "–" if pd.isna(kpi["current"]) else fmt.format(kpi["current"])
+        delta = "–" if kpi["delta"] is None else f"{kpi['delta']:+.1f}{' pts' if kpi['points'] else '%'}"
+        rows.append(f"<tr><th>{html.escape(label)}</th><td>{value}</td><td>{delta}</td></tr>")
+    return (f"<table class='kpis'><tr><th></th><th>Value</th><th>{REPORT_COMPARISON}</th></tr>"
+            + "".join(rows) + "</table>")
+
+
+def _frame_table(frame, fmt="{:,.0f}"):
+    return frame.to_html(float_format=fmt.format, border=0, classes="table")
+
+
+def _period(window, fmt="%d %b %Y"):
+    start, end = (pd.Timestamp(d).strftime(fmt) for d in window)
+    return start if start == end else f"{start} – {end}"
+
+
+REPORT_STYLE = """
+body { font-family: sans-serif; margin: 2em; color: #222; }
+h1 { margin-bottom: 0; } .meta { color: #666; margin-top: 0.2em; }
+table { border-collapse: collapse; margin: 0.5em 0 1.5em; }
+th, td { padding: 0.25em 0.8em; border-bottom: 1px solid #ddd; text-align: right; }
+th:first-child { text-align: left; }
+"""
+
+
+def render_report(name):
+    """HTML KPI report for one filter preset."""
+    exec_filters = preset_filters(name, engine.EXECUTIVE)
+    ops_filters = preset_filters(name, engine.MANAGERIAL)
+    executive = engine.executive_view(exec_filters)
+    exec_cmp = engine.executive_comparison(exec_filters, REPORT_COMPARISON)
+    ops = engine.ops_view(ops_filters)
+    ops_cmp = engine.ops_comparison(ops_filters, REPORT_COMPARISON)
+    flags = engine.anomalies(ops_filters, "tickets", "zone")["flags"]
+
+    arpu = executive["arpu_breakdown"].copy()
+    arpu.index = arpu.index.strftime("%b %Y")
+    sections = [
+        f"<h2>Revenue &amp; Subscriber Health</h2><p class='meta'>Billing period {_period(exec_cmp['window'], '%b %Y')}</p>",
+        _kpi_table(exec_cmp, EXECUTIVE_KPIS),
+        "<h3>ARPU by source (AED)</h3>", _frame_table(arpu, "{:,.2f}"),
+        "<h3>Revenue by plan type (AED)</h3>", _frame_table(executive["revenue_by_plan_type"].to_frame("revenue")),
+        f"<h2>Service Operations</h2><p class='meta'>Period {_period(ops_cmp['window'])}</p>",
+        _kpi_table(ops_cmp, OPS_KPIS),
+        "<h3>Ticket backlog by zone (top 10)</h3>",
+        _frame_table(ops["backlog_by_zone"].sort_values(ascending=False).head(10).to_frame("open tickets")),
+        "<h3>Average resolution hours by channel</h3>",
+        _frame_table(ops["sla_by_channel"].to_frame("hours"), "{:,.1f}"),
+        f"<h3>Ticket anomalies by zone ({len(flags):,} flagged days)</h3>",
+        _frame_table(flags.sort_values("day", ascending=False).head(15).set_index("day"), "{:,.1f}")
+        if len(flags) else "<p>None flagged.</p>",
+    ]
+    title = f"KPI Report – {html.escape(PRESETS[name]['label'])}"
+    return (f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{title}</title>"
+            f"<style>{REPORT_STYLE}</style></head><body><h1>{title}</h1>"
+            f"<p class='meta'>Generated {pd.Timestamp.now():%d %b %Y %H:%M}</p>"
+            + "".join(sections) + "</body></html>")
+
+
+def write_reports(directory, names=None, pdf=True):
+    """Render every (or the named) preset's report into `directory`; returns the paths written."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    weasyprint = optional_import("weasyprint") if pdf else None
+    written = []
+    for name in names or PRESETS:
+        page = render_report(name)
+        path = directory / f"{name}.html"
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(page, encoding="utf-8")
+        os.replace(tmp, path)
+        written.append(path)
+        if weasyprint is not None:
+            weasyprint.HTML(string=page).write_pdf(directory / f"{name}.pdf")
+            written.append(directory / f"{name}.pdf")
+    return written
+
+
+def stored_report(name):
+    """The precomputed HTML report for a preset, rendered on demand if missing."""
+    directory = report_dir()
+    if directory is not None and (directory / f"{name}.html").exists():
+        return (directory / f"{name}.html").read_bytes()
+    return render_report(name).encode()
+
+
+# =====================================================
+# CLI
+# =====================================================
+def main():
+    parser = argparse.ArgumentParser(description="Export filtered records or batch KPI reports.")
+    parser.add_argument("kind", nargs="?", choices=list(EXPORTS), help="records to export")
+    parser.add_argument("--format", choices=list(FORMATS), default="csv")
+    parser.add_argument("--out", help="export file (default: <export dir or .>/<kind>.<format>)")
+    parser.add_argument("--preset", choices=list(PRESETS), default="network",
+                        help="filter preset for record exports")
+    parser.add_argument("--reports", metavar="DIR", nargs="?", const="",
+                        help="write every preset's KPI report to DIR (default: <export dir>/reports)")
+    parser.add_argument("--no-pdf", action="store_true", help="HTML reports only")
+    args = parser.parse_args()
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+    if args.reports is not None:
+        directory = args.reports or report_dir()
+        if directory is None:
+            parser.error("--reports needs a directory when TELECOM_EXPORT_DIR is not set")
+        if not args.no_pdf and optional_import("weasyprint") is None:
+            print("weasyprint is not installed: writing HTML reports only")
+        for path in write_reports(directory, pdf=not args.no_pdf):
+            print(path)
+    if args.kind:
+        view = engine.MANAGERIAL if args.kind == "tickets" else engine.EXECUTIVE
+        preset = preset_filters(args.preset, view)
+        # records cover the whole history, not the report window
+        filters = engine.Filters(preset.cities, preset.plan_types, preset.statuses)
+        out = args.out or Path(FLAGS["export_dir"] or ".") / export_name(args.kind, args.format)
+        rows = export_to_disk(args.kind, filters, args.format, out)
+        print(f"{rows:,} rows -> {out}")
+    if args.reports is None and not args.kind:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,57 +1,43 @@
+import argparse
 
 import pandas as pd
 import numpy as np
 from datetime import timedelta
 
-np.random.seed(42)
-
-MONTHS = pd.date_range("2025-09-01", periods=4, freq="MS")
-N_SUBS = 5000
+from billing_synthesis import append_csv, categorical, sequential_ids, write_billing
 
-# SUBSCRIBERS
-subs = []
-for i in range(N_SUBS):
-    activation = pd.Timestamp("2023-01-01") + timedelta(days=np.random.randint(0,900))
-    churn = None
-    if np.random.rand() < 0.15:
-        churn = activation + timedelta(days=np.random.randint(300,900))
+parser = argparse.ArgumentParser(description="Write subscribers, billing, tickets and outages into the current folder.")
+parser.add_argument("--subscribers", type=int, default=5000)
+parser.add_argument("--months", type=int, default=4, help="billed months from 2025-09")
+args = parser.parse_args()
 
-    subs.append({
-        "subscriber_id": f"SUB_{i:05d}",
-        "subscriber_name": f"User_{i}",
-        "city": np.random.choice(["Dubai","Abu Dhabi","Sharjah","Ajman","Fujairah"],
-                                 p=[0.35,0.3,0.2,0.1,0.05]),
-        "zone": np.random.randint(1,9),
-        "plan_type": np.random.choice(["Prepaid","Postpaid"], p=[0.6,0.4]),
-        "plan_name": np.random.choice(["Basic","Standard","Premium","Unlimited"],
-                                      p=[0.3,0.35,0.25,0.1]),
-        "monthly_charge": np.random.choice([75,120,180,250,350]),
-        "activation_date": activation,
-        "churn_date": churn,
-        "status": "Active" if churn is None or churn > MONTHS[-1] else "Churned"
-    })
+np.random.seed(42)
 
-subs = pd.DataFrame(subs)
-subs.to_csv("subscribers.csv", index=False)
+MONTHS = pd.date_range("2025-09-01", periods=args.months, freq="MS")
+N_SUBS = args.subscribers
 
-# BILLING (MONTH VARIATION)
-billing = []
-for m in MONTHS:
-    promo = np.random.uniform(0.85,1.2)
-    active = subs[(subs["activation_date"]<=m) & ((subs["churn_date"].isna()) | (subs["churn_date"]>m))]
+# SUBSCRIBERS (one batched draw per column)
+activation = pd.Timestamp("2023-01-01") + pd.to_timedelta(np.random.randint(0, 900, N_SUBS), unit="D")
+churns = np.random.rand(N_SUBS) < 0.15
+churn = pd.Series(activation + pd.to_timedelta(np.random.randint(300, 900, N_SUBS), unit="D")).where(churns)
 
-    for _, s in active.iterrows():
-        amt = s["monthly_charge"] * promo * np.random.uniform(0.9,1.1)
-        billing.append({
-            "bill_id": f"BILL_{np.random.randint(1e6)}",
-            "subscriber_id": s["subscriber_id"],
-            "billing_month": m,
-            "bill_amount": round(amt,2),
-            "payment_status": np.random.choice(["Paid","Overdue","Partial","Pending"],
-                                               p=[0.7,0.15,0.1,0.05])
-        })
+subs = pd.DataFrame({
+    "subscriber_id": sequential_ids("SUB_", 0, N_SUBS, width=5),
+    "subscriber_name": sequential_ids("User_", 0, N_SUBS),
+    "city": categorical(np.random, ["Dubai","Abu Dhabi","Sharjah","Ajman","Fujairah"],
+                        [0.35,0.3,0.2,0.1,0.05], N_SUBS),
+    "zone": np.random.randint(1, 9, N_SUBS),
+    "plan_type": categorical(np.random, ["Prepaid","Postpaid"], [0.6,0.4], N_SUBS),
+    "plan_name": categorical(np.random, ["Basic","Standard","Premium","Unlimited"], [0.3,0.35,0.25,0.1], N_SUBS),
+    "monthly_charge": np.random.choice([75,120,180,250,350], N_SUBS),
+    "activation_date": activation,
+    "churn_date": churn,
+    "status": np.where(churn <= MONTHS[-1], "Churned", "Active"),
+})
+append_csv(subs, "subscribers.csv", header=True)
 
-pd.DataFrame(billing).to_csv("billing.csv", index=False)
+# BILLING (MONTH VARIATION)
+write_billing(subs, MONTHS, "billing.csv", promo_range=(0.85,1.2))
 
 # TICKETS
 tickets = []
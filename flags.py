@@ -0,0 +1,39 @@
+import os
+
+# =====================================================
+# DEPLOYMENT FEATURE FLAGS
+# =====================================================
+# One app serves every deployment; the differences between the old app
+# variants are expressed here and read from the environment.
+#
+#   TELECOM_CHARTS      native (Vega-Lite, default) | plotly
+#   TELECOM_CLOUD_SAFE  1 -> no background warm-up, no snapshot files on
+#                       disk, native charts only (read-only / small hosts)
+#   TELECOM_WARM_UP     0 -> skip the background warm-up
+#   TELECOM_SNAPSHOTS   0 -> build derived frames in memory only
+#   TELECOM_TICKET_FEED path of an append-only JSONL ticket event file;
+#                       enables the live feed in the Managerial view
+#   TELECOM_FEED_REFRESH seconds between live feed polls (default 5)
+#   TELECOM_QUERY_SERVER URL of a query_server.py instance; engine queries
+#                       are sent there instead of computed in-process
+#   TELECOM_EXPORT_DIR  directory for exports saved on the server and for
+#                       precomputed KPI reports (exports.py); unset ->
+#                       downloads only
+
+
+def _env_flag(name, default):
+    return os.environ.get(name, "1" if default else "0").strip().lower() in ("1", "true", "yes", "on")
+
+
+CLOUD_SAFE = _env_flag("TELECOM_CLOUD_SAFE", False)
+
+FLAGS = {
+    "cloud_safe": CLOUD_SAFE,
+    "charts": "native" if CLOUD_SAFE else os.environ.get("TELECOM_CHARTS", "native").strip().lower(),
+    "warm_up": _env_flag("TELECOM_WARM_UP", True) and not CLOUD_SAFE,
+    "snapshots": _env_flag("TELECOM_SNAPSHOTS", True) and not CLOUD_SAFE,
+    "ticket_feed": os.environ.get("TELECOM_TICKET_FEED", "").strip(),
+    "feed_refresh": float(os.environ.get("TELECOM_FEED_REFRESH", "5")),
+    "query_server": os.environ.get("TELECOM_QUERY_SERVER", "").strip(),
+    "export_dir": "" if CLOUD_SAFE else os.environ.get("TELECOM_EXPORT_DIR", "").strip(),
+}
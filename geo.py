@@ -0,0 +1,205 @@
+import numpy as np
+import pandas as pd
+
+from data_layer import data_cache, load_table
+from derived import DERIVED, OPEN_STATUSES, derived_frame
+import outage_impact  # noqa: F401  registers DERIVED["outage_impact"]
+
+# =====================================================
+# LOCATION HIERARCHY (NETWORK -> CITY -> ZONE)
+# =====================================================
+# Zones are numbered within a city, so a location is always the pair
+# (city, zone). A location key is a tuple: () for the whole network, (city,)
+# or (city, zone).
+#
+# geo_cube       monthly flow measures per (city, zone, plan type, status),
+#                one pass per source
+# geo_hierarchy  the cube rolled up once to the city and zone levels, so any
+#                node, its parent and its children are row lookups
+# geo_locations  the location dimension with stock measures (subscribers)
+#
+# Plan type and status keep the global filters applying to every figure.
+# Outages are not subscriber facts: their rows carry ANY_SUBSCRIBER in both
+# columns and are kept whatever the filter. The network node is the sum of
+# the selected cities' rows, not a stored total.
+#
+# Roll-up and drill-down read precomputed rows and only sum across months
+# for the selected period; raw bills / tickets / outages / usage are never
+# regrouped.
+
+LEVELS = ["network", "city", "zone"]
+NETWORK = "All locations"
+SUBSCRIBER_DIMS = ["plan_type", "sub_status"]
+ANY_SUBSCRIBER = ""
+FLOW_MEASURES = ["revenue", "bills", "overdue_revenue", "tickets", "open_tickets", "outages",
+                 "outage_minutes", "subscriber_minutes", "data_gb", "voice_minutes"]
+
+
+def location_label(key):
+    if not key:
+        return NETWORK
+    return key[0] if len(key) == 1 else f"{key[0]} › Zone {key[1]}"
+
+
+def _month(dates):
+    return pd.to_datetime(dates).dt.to_period("M").dt.to_timestamp()
+
+
+def _cube_part(frame, month, measures):
+    keys = pd.DataFrame({"month": _month(month), "city": frame["city"].to_numpy(dtype=object),
+                         "zone": frame["zone"].to_numpy()})
+    for dim in SUBSCRIBER_DIMS:
+        keys[dim] = frame[dim].to_numpy(dtype=object) if dim in frame else ANY_SUBSCRIBER
+    for name, values in measures.items():
+        keys[name] = values
+    return keys.groupby(["month", "city", "zone"] + SUBSCRIBER_DIMS)[list(measures)].sum()
+
+
+def build_geo_cube():
+    bills = derived_frame("billing_fact", ("billing_month", "city", "zone", "plan_type", "sub_status",
+                                           "bill_amount", "payment_status"))
+    amount = bills["bill_amount"].to_numpy()
+    tickets = derived_frame("ticket_fact", ("ticket_date", "status", "city", "zone", "plan_type", "sub_status"))
+    outages = derived_frame("outage_impact", ("start", "city", "zone", "minutes", "subscriber_minutes"))
+
+    subs = derived_frame("subscribers", ("subscriber_id", "city", "zone", "plan_type", "status"))
+    usage = load_table("usage", ["subscriber_id", "usage_date", "data_usage_gb", "voice_minutes"])
+    pos = pd.Index(subs["subscriber_id"]).get_indexer(usage["subscriber_id"])
+    usage, pos = usage[pos >= 0], pos[pos >= 0]
+    usage_loc = pd.DataFrame({"city": subs["city"].to_numpy(dtype=object)[pos],
+                              "zone": subs["zone"].to_numpy()[pos],
+                              "plan_type": subs["plan_type"].to_numpy(dtype=object)[pos],
+                              "sub_status": subs["status"].to_numpy(dtype=object)[pos]})
+
+    parts = [
+        _cube_part(bills, bills["billing_month"], {
+            "revenue": amount, "bills": 1,
+            "overdue_revenue": np.where(bills["payment_status"].to_numpy() == "Overdue", amount, 0.0)}),
+        _cube_part(tickets, tickets["ticket_date"], {
+            "tickets": 1, "open_tickets": tickets["status"].isin(OPEN_STATUSES).to_numpy()}),
+        _cube_part(outages, outages["start"], {
+            "outages": 1, "outage_minutes": outages["minutes"].to_numpy(),
+            "subscriber_minutes": outages["subscriber_minutes"].to_numpy()}),
+        _cube_part(usage_loc, usage["usage_date"].reset_index(drop=True), {
+            "data_gb": usage["data_usage_gb"].to_numpy(), "voice_minutes": usage["voice_minutes"].to_numpy()}),
+    ]
+    cube = pd.concat(parts, axis=1).fillna(0)
+    return cube[FLOW_MEASURES].reset_index()
+
+
+def build_geo_hierarchy():
+    cube = derived_frame("geo_cube")
+    zone = cube.assign(level="zone")
+    city = cube.groupby(["month", "city"] + SUBSCRIBER_DIMS, as_index=False)[FLOW_MEASURES].sum().assign(
+        level="city", zone=0)
+    frame = pd.concat([city, zone], ignore_index=True)
+    return frame[["level", "city", "zone", "month"] + SUBSCRIBER_DIMS + FLOW_MEASURES].sort_values(
+        ["level", "city", "zone", "month"], kind="stable", ignore_index=True)
+
+
+def build_geo_locations():
+    subs = derived_frame("subscribers", ("city", "zone", "plan_type", "status"))
+    zone = pd.DataFrame({"city": subs["city"].to_numpy(dtype=object), "zone": subs["zone"].to_numpy(),
+                         "plan_type": subs["plan_type"].to_numpy(dtype=object),
+                         "sub_status": subs["status"].to_numpy(dtype=object),
+                         "subscribers": 1, "active_subscribers": (subs["status"] == "Active").to_numpy()})
+    zone = zone.groupby(["city", "zone"] + SUBSCRIBER_DIMS, as_index=False)[
+        ["subscribers", "active_subscribers"]].sum()
+    # zones with outages but no subscribers still exist as locations
+    known = derived_frame("geo_cube", ("city", "zone")).drop_duplicates().astype({"city": object})
+    missing = known.merge(zone[["city", "zone"]].drop_duplicates(), how="left", indicator=True)
+    missing = missing[(missing["_merge"] == "left_only").to_numpy()][["city", "zone"]]
+    zone = pd.concat([zone, missing.assign(plan_type=ANY_SUBSCRIBER, sub_status=ANY_SUBSCRIBER,
+                                           subscribers=0, active_subscribers=0)], ignore_index=True)
+    city = zone.groupby(["city"] + SUBSCRIBER_DIMS, as_index=False)[
+        ["subscribers", "active_subscribers"]].sum().assign(zone=0)
+    frame = pd.concat([city.assign(level="city"), zone.assign(level="zone")], ignore_index=True)
+    return frame[["level", "city", "zone"] + SUBSCRIBER_DIMS + ["subscribers", "active_subscribers"]]
+
+
+DERIVED["geo_cube"] = (build_geo_cube, ("billing", "tickets", "outages", "usage", "subscribers"), 2)
+DERIVED["geo_hierarchy"] = (build_geo_hierarchy, ("billing", "tickets", "outages", "usage", "subscribers"), 2)
+DERIVED["geo_locations"] = (build_geo_locations, ("billing", "tickets", "outages", "usage", "subscribers"), 2)
+
+
+# =====================================================
+# QUERIES
+# =====================================================
+def location_options(cities):
+    """Location keys in hierarchy order (network, then each city and its zones)."""
+    locs = derived_frame("geo_locations", ("level", "city", "zone"))
+    zones = locs[(locs["level"] == "zone").to_numpy()].drop_duplicates(["city", "zone"]).sort_values(
+        ["city", "zone"])
+    options = [()]
+    for city, group in zones.groupby("city", sort=True):
+        if city in cities:
+            options.append((city,))
+            options += [(city, int(z)) for z in group["zone"]]
+    return options
+
+
+def subscriber_scope(frame, plan_types, statuses):
+    """Rows for the selected plan types and statuses, plus the rows that are not
+    subscriber facts (outages)."""
+    mask = np.ones(len(frame), dtype=bool)
+    for dim, values in zip(SUBSCRIBER_DIMS, (plan_types, statuses)):
+        if values is not None:
+            mask &= (frame[dim].isin(values) | (frame[dim] == ANY_SUBSCRIBER)).to_numpy()
+    return frame[mask]
+
+
+def _node_rows(frame, key, cities):
+    """Rows summing to the node `key`; the network node is its selected cities."""
+    if not key:
+        return frame[((frame["level"] == "city") & frame["city"].isin(cities)).to_numpy()]
+    mask = ((frame["level"] == LEVELS[len(key)]) & (frame["city"] == key[0])).to_numpy()
+    if len(key) > 1:
+        mask = mask & (frame["zone"] == key[1]).to_numpy()
+    return frame[mask]
+
+
+def _children_rows(frame, key, cities):
+    mask = (frame["level"] == LEVELS[len(key) + 1]).to_numpy()
+    within = (frame["city"] == key[0]) if key else frame["city"].isin(cities)
+    return frame[mask & within.to_numpy()]
+
+
+def _with_ratios(frame):
+    active = frame["active_subscribers"].replace(0, np.nan)
+    return frame.assign(
+        arpu=frame["revenue"] / active,
+        tickets_per_1k=frame["tickets"] / frame["subscribers"].replace(0, np.nan) * 1000,
+    )
+
+
+@data_cache("billing", "tickets", "outages", "usage", "subscribers", show_spinner=False)
+def geo_view(location=(), date_range=None, cities=None, plan_types=None, statuses=None):
+    """Totals for `location`, its parent, and one row per child location.
+
+    Flow measures are summed over the months in `date_range`; `cities`,
+    `plan_types` and `statuses` (None = all) apply to every figure.
+    """
+    hierarchy = subscriber_scope(derived_frame("geo_hierarchy"), plan_types, statuses)
+    if date_range is not None:
+        start, end = (pd.to_datetime(d) for d in date_range)
+        months = hierarchy["month"]
+        hierarchy = hierarchy[((months >= start.to_period("M").to_timestamp()) & (months <= end)).to_numpy()]
+    locations = subscriber_scope(derived_frame("geo_locations"), plan_types, statuses)
+    cities = list(cities) if cities is not None else list(locations["city"].unique())
+
+    def totals(key):
+        flows = _node_rows(hierarchy, key, cities)[FLOW_MEASURES].sum()
+        stock = _node_rows(locations, key, cities)[["subscribers", "active_subscribers"]].sum()
+        return _with_ratios(pd.concat([flows, stock]).to_frame().T).iloc[0]
+
+    result = {"node": totals(location), "parent": totals(location[:-1]) if location else None,
+              "children": pd.DataFrame()}
+    if len(location) < 2:
+        flows = _children_rows(hierarchy, location, cities).groupby(["city", "zone"])[FLOW_MEASURES].sum()
+        stock = _children_rows(locations, location, cities).groupby(["city", "zone"])[
+            ["subscribers", "active_subscribers"]].sum()
+        children = _with_ratios(flows.join(stock, how="outer").fillna(0))
+        keys = [(c,) if not location else (c, int(z)) for c, z in children.index]
+        children.index = pd.Index([location_label(k) for k in keys], name="location")
+        result["children"] = children
+    return result
@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+
+from data_layer import data_cache
+from derived import DERIVED, TODAY, derived_frame
+
+# =====================================================
+# REVENUE LEAKAGE ROLLUP
+# =====================================================
+# Bills are collapsed once into a rollup keyed by month, subscriber
+# dimensions, adjustment reason, payment status and days-to-pay. Row count is
+# bounded by the dimension combinations, not by the number of bills, so the
+# same queries stay interactive as billing grows.
+
+DIMENSIONS = ["billing_month", "city", "zone", "plan_type", "plan_name", "sub_status", "service_tier",
+              "adjustment_reason", "payment_status", "days_to_pay"]
+
+AGEING_BUCKETS = [0, 31, 61, 91]
+AGEING_LABELS = ["0–30 days", "31–60 days", "61–90 days", "90+ days"]
+
+
+def ageing_bucket(age_days):
+    """Bucket index (0..3) for ages in days; negative ages map to -1."""
+    return np.searchsorted(AGEING_BUCKETS, age_days, side="right") - 1
+
+
+def build_leakage_rollup():
+    fact = derived_frame("billing_fact")
+    keys = pd.DataFrame({"billing_month": fact["billing_month"], "zone": fact["zone"].to_numpy()})
+    for dim in ["city", "plan_type", "plan_name", "sub_status", "service_tier", "payment_status"]:
+        keys[dim] = pd.Categorical(fact[dim].to_numpy())
+
+    reason = fact["adjustment_reason"] if "adjustment_reason" in fact.columns else None
+    keys["adjustment_reason"] = pd.Categorical(
+        reason.fillna("None").to_numpy() if reason is not None else np.full(len(fact), "None")
+    )
+    if "payment_date" in fact.columns:
+        days = (fact["payment_date"] - fact["billing_month"]).dt.days
+        keys["days_to_pay"] = days.fillna(-1).astype(np.int32).to_numpy()
+    else:
+        keys["days_to_pay"] = np.int32(-1)
+
+    keys["bills"] = np.int32(1)
+    keys["billed"] = fact["bill_amount"].to_numpy()
+    credits = fact["credit_adjustment"] if "credit_adjustment" in fact.columns else 0
+    keys["credits"] = pd.Series(credits, index=fact.index).fillna(0).to_numpy(dtype=float)
+
+    return (
+        keys.groupby(DIMENSIONS, observed=True, dropna=False)[["bills", "billed", "credits"]]
+        .sum()
+        .reset_index()
+    )
+
+
+DERIVED["billing_leakage"] = (build_leakage_rollup, ("billing", "subscribers"), 2)
+
+
+# =====================================================
+# QUERIES
+# =====================================================
+def leakage_slice(filters):
+    rollup = derived_frame("billing_leakage")
+    mask = filters.subscriber_mask(rollup)
+    if filters.date_range is not None:
+        start, end = (pd.to_datetime(d) for d in filters.date_range)
+        mask &= ((rollup["billing_month"] >= start) & (rollup["billing_month"] <= end)).to_numpy()
+    if filters.plan_name != "All":
+        mask &= (rollup["plan_name"] == filters.plan_name).to_numpy()
+    return rollup[mask]
+
+
+@data_cache("billing", "subscribers", show_spinner=False)
+def leakage_view(filters, as_of=TODAY):
+    rows = leakage_slice(filters)
+    gross = rows["billed"].sum()
+    credits = rows["credits"].sum()
+
+    adjusted = rows[rows["credits"] > 0]
+    paid = rows[(rows["payment_status"] == "Paid") & (rows["days_to_pay"] >= 0)]
+    overdue = rows[rows["payment_status"] == "Overdue"]
+
+    age = (pd.Timestamp(as_of) - overdue["billing_month"]).dt.days.to_numpy()
+    bucket = ageing_bucket(age)
+    keep = bucket >= 0
+    ageing = pd.Series(
+        np.bincount(bucket[keep], weights=overdue["billed"].to_numpy()[keep], minlength=len(AGEING_LABELS)),
+        index=AGEING_LABELS,
+    )
+
+    return {
+        "kpis": {
+            "gross_billed": gross,
+            "credits": credits,
+            "net_billed": gross - credits,
+            "leakage_pct": credits / gross * 100 if gross else 0,
+        },
+        "monthly": rows.groupby("billing_month")[["billed", "credits"]].sum()
+            .assign(net=lambda d: d["billed"] - d["credits"])[["net", "credits"]],
+        "credits_by_reason": adjusted.groupby("adjustment_reason", observed=True)["credits"].sum()
+            .sort_values(ascending=False),
+        "credits_by_city": adjusted.pivot_table(
+            index="city", columns="adjustment_reason", values="credits",
+            aggfunc="sum", fill_value=0, observed=True),
+        "credits_by_tier": adjusted.groupby("service_tier", observed=True)["credits"].sum(),
+        "days_to_pay": paid.groupby("days_to_pay")["bills"].sum(),
+        "overdue_ageing": ageing,
+    }
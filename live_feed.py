@@ -0,0 +1,302 @@
+"""Live ticket feed: incremental Managerial KPIs from an append-only event file.
+
+The dashboard tails the file named by TELECOM_TICKET_FEED. For local testing,
+append simulated events with:
+
+    python live_feed.py --simulate [--path feed.jsonl] [--rate 5]
+"""
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from data_layer import data_resource
+from derived import OPEN_STATUSES, derived_frame
+from flags import FLAGS
+from geo import ANY_SUBSCRIBER, location_label
+from sla_risk import BreachQueue
+
+# =====================================================
+# INCREMENTAL TICKET AGGREGATES
+# =====================================================
+# Counters are seeded once from the ticket snapshot, keyed by (city, zone).
+# Each event then touches a constant number of counters:
+#
+#   {"type": "open",    "ticket_id": "...", "ts": "...", "city": "...", "zone": 3,
+#    "assigned_team": "Tier 1", "status": "Open", "sla_target_hours": 24}
+#   {"type": "status",  "ticket_id": "...", "ts": "...", "status": "Escalated"}
+#   {"type": "resolve", "ticket_id": "...", "ts": "..."}
+#
+# Only open tickets are tracked individually; events for unknown or already
+# resolved tickets are counted as skipped. A view sums the counters over the
+# selected (city, zone) keys, never over tickets. Open tickets with an SLA
+# target are also kept in a BreachQueue (sla_risk.py) on the wall clock,
+# keyed by plan type and status too; a feed ticket without them is kept under
+# every plan type and status filter.
+
+SEED_COLUMNS = ("ticket_id", "ticket_date", "status", "city", "zone", "assigned_team", "plan_type",
+                "sub_status", "res_hours", "sla_target_hours")
+LIVE_DAYS = 30
+
+
+class LiveTickets:
+    def __init__(self):
+        self.open = {}                  # ticket_id -> (key, status, opened, sla_target_hours)
+        self.total = Counter()
+        self.backlog = Counter()
+        self.resolved = Counter()
+        self.res_hours = Counter()
+        self.res_n = Counter()
+        self.sla_met = Counter()
+        self.daily = Counter()          # (city, zone, day)
+        self.events = 0
+        self.skipped = 0
+        self.last_event = None
+        self.risk = BreachQueue()
+
+    def seed(self, tickets):
+        keys = list(zip(tickets["city"].tolist(), tickets["zone"].tolist()))
+        key_idx = pd.Index(keys)
+        codes, uniq = pd.factorize(key_idx)
+
+        def add(counter, weights, mask):
+            sums = np.bincount(codes[mask], weights=weights[mask] if weights is not None else None,
+                               minlength=len(uniq))
+            counter.update({k: v for k, v in zip(uniq, sums) if v})
+
+        status = tickets["status"].to_numpy()
+        res_hours = tickets["res_hours"].to_numpy(dtype=float)
+        resolved = status == "Resolved"
+        is_open = np.isin(status, OPEN_STATUSES)
+        timed = resolved & ~np.isnan(res_hours)
+
+        add(self.total, None, np.ones(len(tickets), dtype=bool))
+        add(self.backlog, None, is_open)
+        add(self.resolved, None, resolved)
+        add(self.res_n, None, timed)
+        add(self.res_hours, res_hours, timed)
+        add(self.sla_met, None, resolved & (res_hours <= tickets["sla_target_hours"].to_numpy()))
+
+        days = tickets["ticket_date"].dt.floor("D")
+        self.daily.update(Counter(zip(tickets["city"].tolist(), tickets["zone"].tolist(), days.tolist())))
+
+        rows = tickets[is_open]
+        self.open = {
+            tid: ((city, zone), status, opened.to_pydatetime(), sla)
+            for tid, city, zone, status, opened, sla in zip(
+                rows["ticket_id"], rows["city"], rows["zone"], rows["status"],
+                rows["ticket_date"], rows["sla_target_hours"])
+        }
+        self.risk.seed(tickets)
+
+    # ---------------- events (O(1) each) ----------------
+    def apply(self, event):
+        kind = event.get("type")
+        skipped = self.skipped
+        ts = datetime.fromisoformat(event["ts"]) if event.get("ts") else datetime.now()
+        if kind == "open":
+            self._open(event, ts)
+        elif kind == "status" and event.get("status") == "Resolved":
+            self._resolve(event["ticket_id"], ts)
+        elif kind == "status":
+            self._status(event["ticket_id"], event["status"])
+        elif kind == "resolve":
+            self._resolve(event["ticket_id"], ts)
+        else:
+            self.skipped += 1
+        if self.skipped != skipped:
+            return
+        self.events += 1
+        self.last_event = ts
+
+    def _open(self, event, ts):
+        tid = event["ticket_id"]
+        if tid in self.open:
+            self.skipped += 1
+            return
+        key = (event["city"], event["zone"])
+        status = event.get("status", "Open")
+        self.total[key] += 1
+        self.daily[key + (pd.Timestamp(ts.date()),)] += 1
+        if status in OPEN_STATUSES:
+            sla = event.get("sla_target_hours")
+            self.open[tid] = (key, status, ts, np.inf if sla is None else sla)
+            self.backlog[key] += 1
+            if sla is not None:
+                dims = (event.get("assigned_team", "Unassigned"), event.get("plan_type", ANY_SUBSCRIBER),
+                        event.get("sub_status", ANY_SUBSCRIBER))
+                self.risk.push(tid, key + dims, ts + pd.Timedelta(hours=sla))
+
+    def _status(self, tid, status):
+        ticket = self.open.get(tid)
+        if ticket is None:
+            self.skipped += 1
+            return
+        key, _, opened, sla = ticket
+        if status in OPEN_STATUSES:
+            self.open[tid] = (key, status, opened, sla)
+        else:                           # closed without resolution (e.g. Cancelled)
+            del self.open[tid]
+            self.backlog[key] -= 1
+            self.risk.discard(tid)
+
+    def _resolve(self, tid, ts):
+        ticket = self.open.pop(tid, None)
+        if ticket is None:
+            self.skipped += 1
+            return
+        key, _, opened, sla = ticket
+        self.risk.discard(tid)
+        hours = (ts - opened).total_seconds() / 3600
+        self.backlog[key] -= 1
+        self.resolved[key] += 1
+        self.res_n[key] += 1
+        self.res_hours[key] += hours
+        self.sla_met[key] += hours <= sla
+
+    # ---------------- reads ----------------
+    def view(self, cities, zones=None):
+        def selected(key):
+            return key[0] in cities and (zones is None or key[1] in zones)
+
+        def total(counter):
+            return sum(v for k, v in counter.items() if selected(k))
+
+        resolved, res_n = total(self.resolved), total(self.res_n)
+        backlog = {location_label(key): n for key, n in sorted(self.backlog.items()) if selected(key)}
+        daily = Counter()
+        for (city, zone, day), n in self.daily.items():
+            if selected((city, zone)):
+                daily[day] += n
+        daily = pd.Series(daily, dtype=float).sort_index()
+        if len(daily):
+            days = pd.date_range(end=daily.index[-1], periods=LIVE_DAYS, freq="D")
+            daily = daily.reindex(days, fill_value=0)
+        return {
+            "kpis": {
+                "total_tickets": total(self.total),
+                "backlog": total(self.backlog),
+                "avg_resolution_hours": total(self.res_hours) / res_n if res_n else float("nan"),
+                "sla_compliance": total(self.sla_met) / resolved * 100 if resolved else float("nan"),
+            },
+            "backlog_by_zone": pd.Series(backlog, dtype=float).rename_axis("location"),
+            "daily_volume": daily.rename("Tickets"),
+            "events": self.events,
+            "skipped": self.skipped,
+            "last_event": self.last_event,
+        }
+
+
+# =====================================================
+# FILE TAIL
+# =====================================================
+class FeedTail:
+    """Reads only the bytes appended since the last poll; a partial last line
+    is kept for the next poll."""
+
+    def __init__(self, path, state):
+        self.path = path
+        self.state = state
+        self.offset = 0
+        self.partial = b""
+        self.lock = threading.Lock()
+
+    def poll(self):
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            return 0
+        if size < self.offset:          # truncated / rotated: re-read, duplicates are skipped
+            self.offset, self.partial = 0, b""
+        if size == self.offset:
+            return 0
+        with open(self.path, "rb") as fh:
+            fh.seek(self.offset)
+            data = fh.read(size - self.offset)
+        self.offset += len(data)
+        lines = (self.partial + data).split(b"\n")
+        self.partial = lines.pop()
+        applied = 0
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                self.state.apply(json.loads(line))
+                applied += 1
+            except (ValueError, KeyError, TypeError):
+                self.state.skipped += 1
+        return applied
+
+
+@data_resource("tickets", "subscribers", show_spinner=False)
+def feed(path):
+    state = LiveTickets()
+    state.seed(derived_frame("ticket_fact", SEED_COLUMNS))
+    return FeedTail(path, state)
+
+
+def live_view(path, filters):
+    """Poll the feed and return live Managerial KPIs for the filter's cities and zones."""
+    tail = feed(path)
+    with tail.lock:
+        tail.poll()
+        return tail.state.view(*filters.scope())
+
+
+def live_risk(path, filters, hours):
+    """SLA breach report for the live feed, clocked at the current time."""
+    tail = feed(path)
+    with tail.lock:
+        tail.poll()
+        return tail.state.risk.report(datetime.now(), hours, *filters.scope(), filters.plan_types,
+                                      filters.statuses)
+
+
+# =====================================================
+# LOCAL EVENT SIMULATOR
+# =====================================================
+def simulate(path, rate=5.0, seed=None):
+    """Append open / status / resolve events to `path` at ~`rate` events per second."""
+    from data_layer import load_table
+
+    rng = random.Random(seed)
+    subs = load_table("subscribers", ["city", "zone"]).drop_duplicates()
+    locations = list(zip(subs["city"], subs["zone"].astype(int)))
+    live, n = [], 0
+    while True:
+        now = datetime.now().isoformat(timespec="seconds")
+        roll = rng.random()
+        if not live or roll < 0.5:
+            n += 1
+            city, zone = rng.choice(locations)
+            event = {"type": "open", "ticket_id": f"LIVE_{os.getpid()}_{n}", "ts": now, "city": city,
+                     "zone": zone, "assigned_team": rng.choice(["Tier 1", "Tier 2", "Tier 3", "Field Ops"]),
+                     "status": "Open", "sla_target_hours": rng.choice([4, 24, 48, 72])}
+            live.append(event["ticket_id"])
+        elif roll < 0.7:
+            event = {"type": "status", "ticket_id": rng.choice(live), "ts": now,
+                     "status": rng.choice(["In Progress", "Escalated"])}
+        else:
+            event = {"type": "resolve", "ticket_id": live.pop(rng.randrange(len(live))), "ts": now}
+        with open(path, "a") as fh:
+            fh.write(json.dumps(event) + "\n")
+        time.sleep(1 / rate)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--simulate", action="store_true")
+    parser.add_argument("--path", default=FLAGS["ticket_feed"] or "ticket_events.jsonl")
+    parser.add_argument("--rate", type=float, default=5.0)
+    args = parser.parse_args()
+    if args.simulate:
+        simulate(args.path, args.rate)
+    else:
+        parser.print_help()
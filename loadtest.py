@@ -0,0 +1,475 @@
+"""Load-test the dashboard with simulated concurrent users.
+
+Each virtual user replays a random but realistic sequence of sidebar
+interactions (view switches, city / plan / status multiselects, date range
+changes, zone and location picks, trend granularity) and, after every
+interaction, performs the work of one app rerun. Users run concurrently;
+the report gives rerun latency percentiles, throughput and memory per user.
+
+Targets:
+    engine  the engine calls app.py makes, in this process (default)
+    server  the same calls sent to a running query_server.py (--url)
+    app     the real app script, headless, one AppTest session per user
+
+Usage:
+
+    python loadtest.py [--users 8] [--steps 25] [--target engine|server|app]
+                       [--url http://127.0.0.1:8765 [--workers 1,2,4]] [--uncached] [--seed 0]
+                       [--data-dir DIR [--generate [--profile uniform|zipf|hotspot]]] [--json]
+
+With --target server --workers 1,2,4 the load test starts its own query
+server at --url once per worker count and prints each run's throughput
+relative to the first.
+
+--data-dir points the dashboard at another data set (TELECOM_DATA_DIR);
+with --generate, data_generator.py first writes a fresh one there, using
+the given skew profile.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from streamlit import logger as st_logger
+
+HERE = Path(__file__).resolve().parent
+
+# =====================================================
+# SIMULATED USERS
+# =====================================================
+# Relative weights of the interactions a user performs between reruns.
+ACTIONS = {
+    "view": 2, "cities": 3, "plan_types": 1, "statuses": 1, "dates": 3,
+    "plan_name": 2, "zones": 2, "location": 2, "granularity": 1,
+}
+
+
+def _subset(rng, values, keep_all=0.3):
+    """All values, or a random non-empty subset in their original order."""
+    values = list(values)
+    if len(values) < 2 or rng.random() < keep_all:
+        return values
+    picked = set(rng.sample(values, rng.randint(1, len(values) - 1)))
+    return [v for v in values if v in picked]
+
+
+def _months(lo, hi):
+    return list(pd.date_range(pd.Timestamp(lo).to_period("M").to_timestamp(), hi, freq="MS").date)
+
+
+class User:
+    """Sidebar state of one dashboard session, mutated one interaction at a time."""
+
+    def __init__(self, rng, engine, options):
+        self.rng = rng
+        self.engine = engine
+        self.options = options
+        ex, ops = options[engine.EXECUTIVE], options[engine.MANAGERIAL]
+        self.state = {
+            "view": engine.EXECUTIVE,
+            "cities": list(ex["cities"]), "plan_types": list(ex["plan_types"]), "statuses": list(ex["statuses"]),
+            "billing": tuple(pd.Timestamp(d).date() for d in ex["billing_months"]),
+            "outage": tuple(pd.Timestamp(d).date() for d in ops["ops_period"]),
+            "plan_name": "All", "zones": None, "location": (), "granularity": "Daily",
+        }
+        # Option lists the user last saw on screen; refreshed by every rerun.
+        self.seen = {"plan_names": [], "zones": [], "locations": [()]}
+
+    def act(self):
+        """Apply one random interaction; returns its name."""
+        rng, state, engine = self.rng, self.state, self.engine
+        action = rng.choices(list(ACTIONS), weights=list(ACTIONS.values()))[0]
+        options = self.options[state["view"]] if state["view"] in self.options else self.options[engine.EXECUTIVE]
+
+        if action == "view":
+            state["view"] = rng.choice([v for v in engine.VIEWS if v != state["view"]])
+        elif action in ("cities", "plan_types", "statuses"):
+            state[action] = _subset(rng, options[action])
+            if state["location"] and state["location"][0] not in state["cities"]:
+                state["location"] = ()
+        elif action == "dates" and state["view"] == engine.MANAGERIAL:
+            lo, hi = (pd.Timestamp(d).date() for d in self.options[engine.MANAGERIAL]["ops_period"])
+            days = min(rng.choice([7, 14, 30, 60, 90]), (hi - lo).days)
+            start = lo + pd.Timedelta(days=rng.randint(0, (hi - lo).days - days))
+            state["outage"] = (start, start + pd.Timedelta(days=days))
+        elif action == "dates":
+            months = _months(*self.options[engine.EXECUTIVE]["billing_months"])
+            i = rng.randrange(len(months))
+            j = rng.randrange(i, len(months))
+            state["billing"] = (months[i], months[j])
+        elif action == "plan_name":
+            state["plan_name"] = rng.choice(["All"] + self.seen["plan_names"])
+        elif action == "zones":
+            state["zones"] = _subset(rng, self.seen["zones"]) or None
+        elif action == "location":
+            locations = self.seen["locations"]
+            state["location"] = () if rng.random() < 0.3 else rng.choice(locations)
+        else:
+            state["granularity"] = rng.choice(["Daily", "Weekly", "Monthly"])
+        return action
+
+    def filters(self):
+        state = self.state
+        return self.engine.Filters(tuple(state["cities"]), tuple(state["plan_types"]), tuple(state["statuses"]),
+                                   location=tuple(state["location"]))
+
+
+# =====================================================
+# TARGETS
+# =====================================================
+class EngineTarget:
+    """Engine calls in this process; `cache=False` bypasses the view caches."""
+
+    def __init__(self, engine, cache=True):
+        self.engine = engine
+        self.cache = cache
+
+    def call(self, name, *args, **kwargs):
+        fn = getattr(self.engine, name)
+        if not self.cache:
+            fn = getattr(fn, "__wrapped__", fn)
+        return fn(*args, **kwargs)
+
+
+class ServerTarget:
+    """Engine queries sent to a query server over one shared connection pool."""
+
+    def __init__(self, engine, client, cache=True):
+        self.engine = engine
+        self.client = client
+        self.cache = cache
+
+    def call(self, name, *args, **kwargs):
+        return self.client.query(name, *args, cache=self.cache, **kwargs)
+
+
+def rerun(target, user):
+    """The queries one app rerun issues for the user's current state (see app.py)."""
+    engine, state = target.engine, user.state
+    filters = user.filters()
+    user.seen["locations"] = target.call("location_options", tuple(state["cities"]))
+    if filters.location not in user.seen["locations"]:
+        filters = replace(filters, location=())
+        state["location"] = ()
+
+    if state["view"] == engine.EXECUTIVE:
+        filters = replace(filters, date_range=tuple(state["billing"]))
+        user.seen["plan_names"] = target.call("plan_name_options", filters)
+        local = replace(filters, plan_name=state["plan_name"])
+        target.call("executive_view", local)
+        target.call("location_view", filters)
+        target.call("leakage_view", local)
+        target.call("record_page", "overdue", local, page=0, page_size=50)
+        target.call("ageing_view", local)
+        target.call("cohort_view", local)
+    elif state["view"] == engine.MANAGERIAL:
+        user.seen["zones"] = target.call("zone_options", filters)
+        zones = state["zones"] if state["zones"] is not None else user.seen["zones"]
+        filters = replace(filters, date_range=tuple(state["outage"]),
+                          zones=tuple(z for z in zones if z in user.seen["zones"]))
+        target.call("ops_view", filters)
+        target.call("ticket_trend", filters, state["granularity"])
+        target.call("record_page", "backlog", filters, page=0, page_size=50)
+        target.call("sla_risk", filters, 24)
+        target.call("outage_view", filters)
+    else:
+        city = state["location"][0] if state["location"] else None
+        zone = state["location"][1] if len(state["location"]) > 1 else None
+        target.call("slice_summary", city, zone)
+        target.call("subscribers_in_slice", city, zone, None, 0, 0)
+        target.call("subscribers_in_slice", city, zone, None, 0, 50)
+
+
+class AppSession:
+    """One headless app session; interactions become widget changes + reruns."""
+
+    def __init__(self, user, timeout=120):
+        from streamlit.testing.v1 import AppTest
+
+        self.user = user
+        self.at = AppTest.from_file(str(HERE / "app.py"), default_timeout=timeout).run()
+        self._check()
+
+    def _check(self):
+        if self.at.exception:
+            raise RuntimeError(self.at.exception[0].value)
+
+    def _widget(self, kind, label):
+        return next(w for w in getattr(self.at, kind) if w.label == label)
+
+    def sync(self):
+        """Push the user's state into the widgets, rerunning as the app would."""
+        at, state, engine = self.at, self.user.state, self.user.engine
+        if self._widget("radio", "Dashboard View").value != state["view"]:
+            self._widget("radio", "Dashboard View").set_value(state["view"])
+            at.run()
+        for label, key in (("City", "cities"), ("Plan Type", "plan_types"), ("Subscriber Status", "statuses")):
+            self._widget("multiselect", label).set_value(state[key])
+        self.user.seen["locations"] = engine.location_options(state["cities"])
+        if state["location"] in self.user.seen["locations"]:
+            at.sidebar.selectbox(key="location").set_value(tuple(state["location"]))
+        if state["view"] == engine.EXECUTIVE:
+            self._widget("date_input", "Billing Period").set_value(state["billing"])
+            plan = self._widget("selectbox", "Local Filter – Plan Name")
+            if state["plan_name"] in plan.options:
+                plan.set_value(state["plan_name"])
+        elif state["view"] == engine.MANAGERIAL:
+            self._widget("date_input", "Operations Period").set_value(state["outage"])
+            zones = self._widget("multiselect", "Local Filter – Zone")
+            if state["zones"] is not None:
+                zones.set_value([z for z in state["zones"] if str(z) in zones.options])
+            self._widget("radio", "Granularity").set_value(state["granularity"])
+        at.run()
+        self._check()
+        self._observe()
+
+    def _observe(self):
+        state, engine = self.user.state, self.user.engine
+        if state["view"] == engine.EXECUTIVE:
+            self.user.seen["plan_names"] = self._widget("selectbox", "Local Filter – Plan Name").options[1:]
+        elif state["view"] == engine.MANAGERIAL:
+            self.user.seen["zones"] = [int(z) for z in self._widget("multiselect", "Local Filter – Zone").options]
+
+
+# =====================================================
+# MEASUREMENT
+# =====================================================
+def _rss_mb():
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class RssSampler(threading.Thread):
+    """Tracks this process's peak resident memory while the users run."""
+
+    def __init__(self, interval=0.05):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = self.start_mb = _rss_mb()
+        self.done = threading.Event()
+
+    def run(self):
+        while not self.done.wait(self.interval):
+            self.peak = max(self.peak, _rss_mb())
+
+    def stop(self):
+        self.done.set()
+        self.join()
+        self.peak = max(self.peak, _rss_mb())
+        return self.peak
+
+
+def simulate(user_id, make_session, steps, seed, samples, errors, lock):
+    rng = random.Random(seed * 1000 + user_id)
+    try:
+        session = make_session(rng)
+    except Exception as exc:
+        with lock:
+            errors.append(f"user {user_id} start: {exc!r}")
+        return
+    for _ in range(steps):
+        action = session.user.act()
+        t0 = time.perf_counter()
+        try:
+            session.step()
+        except Exception as exc:
+            with lock:
+                errors.append(f"user {user_id} {action}: {exc!r}")
+            continue
+        elapsed = (time.perf_counter() - t0) * 1000
+        with lock:
+            samples[action].append(elapsed)
+            samples["*"].append(elapsed)
+
+
+class QuerySession:
+    def __init__(self, target, user):
+        self.target = target
+        self.user = user
+        self.step()
+
+    def step(self):
+        rerun(self.target, self.user)
+
+
+class HeadlessSession(AppSession):
+    def step(self):
+        self.sync()
+
+
+def _percentiles(samples):
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+    return {"n": len(samples), "p50_ms": round(p50, 1), "p95_ms": round(p95, 1), "p99_ms": round(p99, 1),
+            "max_ms": round(max(samples), 1)}
+
+
+def run(target="engine", users=8, steps=25, url="http://127.0.0.1:8765", cache=True, seed=0):
+    import startup
+
+    st_logger.set_log_level("error")        # bare-mode warnings, one per thread and cached call
+    engine = startup.timed_import("engine")
+    options = {view: engine.filter_options(view) for view in (engine.EXECUTIVE, engine.MANAGERIAL)}
+
+    if target == "server":
+        from query_client import QueryClient
+
+        client = QueryClient(url, pool_size=users)
+        client.health()
+        backend = ServerTarget(engine, client, cache)
+        options = {view: client.query("filter_options", view) for view in options}
+    else:
+        backend = EngineTarget(engine, cache)
+
+    def make_session(rng):
+        user = User(rng, engine, options)
+        return HeadlessSession(user) if target == "app" else QuerySession(backend, user)
+
+    # One warm-up session, so snapshot loading and first-touch imports are not counted.
+    make_session(random.Random(seed))
+
+    samples, errors, lock = defaultdict(list), [], threading.Lock()
+    sampler = RssSampler()
+    sampler.start()
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=simulate, args=(i, make_session, steps, seed, samples, errors, lock))
+               for i in range(users)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+    peak = sampler.stop()
+
+    reruns = samples.pop("*", [])
+    return {
+        "target": target, "users": users, "steps": steps, "cached": cache,
+        "wall_s": round(wall, 2),
+        "reruns": len(reruns),
+        "throughput_rps": round(len(reruns) / wall, 1) if wall else 0.0,
+        "latency": _percentiles(reruns) if reruns else {},
+        "by_action": {name: _percentiles(s) for name, s in sorted(samples.items())},
+        "rss_start_mb": round(sampler.start_mb, 1),
+        "rss_peak_mb": round(peak, 1),
+        "mb_per_user": round((peak - sampler.start_mb) / users, 1),
+        "errors": errors,
+    }
+
+
+class QueryServer:
+    """A query_server.py subprocess with `workers` workers, for --workers runs."""
+
+    def __init__(self, url, workers, timeout=300):
+        from urllib.parse import urlsplit
+
+        parts = urlsplit(url)
+        self.url, self.workers, self.timeout = url, workers, timeout
+        self.args = [sys.executable, str(HERE / "query_server.py"), "--host", parts.hostname,
+                     "--port", str(parts.port or 80), "--workers", str(workers)]
+
+    def __enter__(self):
+        from query_client import QueryClient
+
+        self.proc = subprocess.Popen(self.args, cwd=HERE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        client, deadline = QueryClient(self.url, pool_size=1, timeout=5), time.monotonic() + self.timeout
+        while True:
+            try:
+                if client.health()["workers"] == self.workers:
+                    return self
+            except OSError:
+                pass
+            if self.proc.poll() is not None or time.monotonic() > deadline:
+                self.__exit__()
+                raise RuntimeError(f"query server with {self.workers} workers did not start")
+            time.sleep(0.5)
+
+    def __exit__(self, *exc):
+        self.proc.terminate()
+        self.proc.wait()
+
+
+def report(res):
+    lat = res["latency"]
+    server = f", {res['workers']} server workers" if "workers" in res else ""
+    print(f"{res['users']} users x {res['steps']} steps on {res['target']} "
+          f"({'cached' if res['cached'] else 'uncached'}{server}): {res['reruns']} reruns in {res['wall_s']} s, "
+          f"{res['throughput_rps']} reruns/s")
+    if lat:
+        print(f"  rerun latency  p50 {lat['p50_ms']} ms   p95 {lat['p95_ms']} ms   p99 {lat['p99_ms']} ms   "
+              f"max {lat['max_ms']} ms")
+    print(f"  memory         {res['rss_start_mb']} -> {res['rss_peak_mb']} MB peak RSS, "
+          f"{res['mb_per_user']} MB per user")
+    for name, stats in res["by_action"].items():
+        print(f"  after {name:<12} n {stats['n']:>4}   p50 {stats['p50_ms']:>8} ms   p95 {stats['p95_ms']:>8} ms")
+    for err in res["errors"][:10]:
+        print(f"  ERROR {err}")
+    if len(res["errors"]) > 10:
+        print(f"  ... {len(res['errors']) - 10} more errors")
+
+
+def generate(data_dir, profile="uniform"):
+    """Write a fresh generated data set into `data_dir`."""
+    Path(data_dir).mkdir(parents=True, exist_ok=True)
+    subprocess.run([sys.executable, str(HERE / "data_generator.py"), "--profile", profile],
+                   cwd=data_dir, check=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", choices=["engine", "server", "app"], default="engine")
+    parser.add_argument("--users", type=int, default=8)
+    parser.add_argument("--steps", type=int, default=25, help="interactions per user")
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    parser.add_argument("--uncached", action="store_true", help="bypass the engine's view caches")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", default=None)
+    parser.add_argument("--generate", action="store_true")
+    parser.add_argument("--profile", default="uniform", help="data_generator.py profile for --generate")
+    parser.add_argument("--workers", type=lambda v: [int(n) for n in v.split(",")], default=None,
+                        help="start a query server per worker count (e.g. 1,2,4) and compare throughput")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+    if args.uncached and args.target == "app":
+        parser.error("--uncached applies to the engine and server targets; the app always uses its caches")
+    if args.workers and args.target != "server":
+        parser.error("--workers applies to the server target")
+
+    if args.data_dir:
+        if args.generate:
+            generate(args.data_dir, args.profile)
+        os.environ["TELECOM_DATA_DIR"] = str(Path(args.data_dir).resolve())
+    # Background warm-up would compete with the simulated users for the CPU.
+    os.environ.setdefault("TELECOM_WARM_UP", "0")
+
+    if args.workers:
+        # One server per worker count, same users and seed: throughput scaling with workers.
+        results = []
+        for workers in args.workers:
+            with QueryServer(args.url, workers):
+                results.append({"workers": workers, **run("server", args.users, args.steps, args.url,
+                                                          not args.uncached, args.seed)})
+    else:
+        results = [run(args.target, args.users, args.steps, args.url, not args.uncached, args.seed)]
+
+    if args.json:
+        print(json.dumps(results if args.workers else results[0], indent=2))
+    else:
+        for res in results:
+            report(res)
+        if args.workers:
+            base = results[0]["throughput_rps"] or float("nan")
+            print(f"scaling on {os.cpu_count()} CPU(s): " + ", ".join(
+                f"{r['workers']} workers {r['throughput_rps']} reruns/s ({r['throughput_rps'] / base:.2f}x)"
+                for r in results))
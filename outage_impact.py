@@ -0,0 +1,158 @@
+import numpy as np
+import pandas as pd
+
+from data_layer import data_cache, load_table
+from derived import DERIVED, derived_frame
+
+# =====================================================
+# OUTAGE IMPACT
+# =====================================================
+# Each outage is scored once, when the snapshot is built:
+#   subscriber-minutes  affected_subscribers x duration
+#   revenue at risk     subscriber-minutes x monthly ARPU of its (city, zone)
+#                       / minutes per month
+#   ticket uplift       tickets raised in the zone from the outage day to
+#                       UPLIFT_WINDOW_HOURS after it ended, minus the zone's
+#                       baseline daily rate over the same window
+#
+# Tickets are counted through a zone x time index: ticket times sorted within
+# each (city, zone) segment, so every outage window is two binary searches.
+# The scored outages are stored sorted by start time; a date filter reads the
+# candidate row range with searchsorted (starts bounded by the longest outage)
+# and clips each outage to the filtered period.
+
+UPLIFT_WINDOW_HOURS = 24
+MINUTES_PER_MONTH = 30 * 24 * 60
+OUTAGE_COLUMNS = ["outage_id", "city", "zone", "outage_type", "outage_start_time", "outage_end_time",
+                  "outage_duration_mins", "affected_subscribers"]
+
+
+def zone_window_counts(event_key, event_time, key, lo, hi):
+    """Events per query: same zone key and event_time in [lo, hi).
+
+    Keys are integer codes; times are datetime64[ns] arrays.
+    """
+    order = np.lexsort((event_time, event_key))
+    keys, times = event_key[order], event_time[order]
+    start = np.searchsorted(keys, key, side="left")
+    end = np.searchsorted(keys, key, side="right")
+    counts = np.zeros(len(key), dtype=np.int64)
+    for k in np.unique(key):
+        q = key == k
+        seg = times[start[q][0]:end[q][0]]
+        counts[q] = np.searchsorted(seg, hi[q], side="left") - np.searchsorted(seg, lo[q], side="left")
+    return counts
+
+
+def _zone_arpu(outages):
+    """Mean monthly bill per (city, zone), falling back to city, then overall."""
+    bills = derived_frame("billing_fact", ("city", "zone", "bill_amount"))
+    by_zone = bills.groupby(["city", "zone"])["bill_amount"].mean()
+    by_city = bills.groupby("city")["bill_amount"].mean()
+    arpu = pd.Series(by_zone.reindex(pd.MultiIndex.from_arrays([outages["city"], outages["zone"]])).to_numpy())
+    arpu = arpu.fillna(pd.Series(outages["city"].map(by_city).to_numpy()))
+    return arpu.fillna(bills["bill_amount"].mean()).to_numpy()
+
+
+def build_outage_impact():
+    outages = load_table("outages", OUTAGE_COLUMNS).dropna(subset=["outage_start_time", "outage_end_time"])
+    outages = outages.sort_values("outage_start_time", kind="stable", ignore_index=True)
+    start = outages["outage_start_time"].to_numpy(dtype="datetime64[ns]")
+    end = outages["outage_end_time"].to_numpy(dtype="datetime64[ns]")
+    minutes = outages["outage_duration_mins"].to_numpy(dtype=float)
+    affected = outages["affected_subscribers"].to_numpy(dtype=float)
+
+    tickets = derived_frame("ticket_fact", ("city", "zone", "ticket_date"))
+    ticket_time = tickets["ticket_date"].to_numpy(dtype="datetime64[ns]")
+    zones = pd.MultiIndex.from_arrays([
+        np.r_[tickets["city"].to_numpy(dtype=object), outages["city"].to_numpy(dtype=object)],
+        np.r_[tickets["zone"].to_numpy(), outages["zone"].to_numpy()],
+    ])
+    codes = pd.factorize(zones)[0]
+    ticket_key, outage_key = codes[:len(tickets)], codes[len(tickets):]
+
+    # Tickets carry a date only, so the window opens at the start of the outage day.
+    lo = start.astype("datetime64[D]").astype("datetime64[ns]")
+    hi = end + np.timedelta64(UPLIFT_WINDOW_HOURS, "h")
+    observed = zone_window_counts(ticket_key, ticket_time, outage_key, lo, hi)
+
+    span_days = 1
+    if len(tickets):
+        span_days = max((ticket_time.max() - ticket_time.min()) / np.timedelta64(1, "D") + 1, 1)
+    daily_rate = np.bincount(ticket_key, minlength=codes.max() + 1) / span_days
+    expected = daily_rate[outage_key] * (hi - lo) / np.timedelta64(1, "D")
+
+    sub_minutes = affected * minutes
+    return pd.DataFrame({
+        "outage_id": outages["outage_id"],
+        "city": outages["city"],
+        "zone": outages["zone"],
+        "outage_type": outages["outage_type"],
+        "start": start,
+        "end": end,
+        "minutes": minutes,
+        "affected_subscribers": affected,
+        "subscriber_minutes": sub_minutes,
+        "revenue_at_risk": sub_minutes * _zone_arpu(outages) / MINUTES_PER_MONTH,
+        "tickets": observed,
+        "expected_tickets": expected,
+        "ticket_uplift": observed - expected,
+    })
+
+
+DERIVED["outage_impact"] = (build_outage_impact, ("outages", "tickets", "subscribers", "billing"), 1)
+
+
+# =====================================================
+# QUERIES
+# =====================================================
+def outage_slice(filters):
+    """Outages in the filter's cities / zones overlapping its date range.
+
+    With a date range, minute-based measures are clipped to the period.
+    """
+    frame = derived_frame("outage_impact")
+    if filters.date_range is None:
+        rows = frame
+    else:
+        d0 = np.datetime64(pd.to_datetime(filters.date_range[0]), "ns")
+        d1 = np.datetime64(pd.to_datetime(filters.date_range[1]) + pd.Timedelta(days=1), "ns")
+        start = frame["start"].to_numpy(dtype="datetime64[ns]")
+        longest = np.timedelta64(int(frame["minutes"].max() if len(frame) else 0) + 1, "m")
+        lo, hi = np.searchsorted(start, [d0 - longest, d1])
+        rows = frame.iloc[lo:hi]
+        rows = rows[(rows["end"] > d0).to_numpy()].copy()
+        clipped = (np.minimum(rows["end"].to_numpy(), d1) - np.maximum(rows["start"].to_numpy(), d0))
+        share = np.where(rows["minutes"] > 0,
+                         clipped / np.timedelta64(1, "m") / np.maximum(rows["minutes"].to_numpy(), 1e-9), 0)
+        share = np.clip(share, 0, 1)
+        for col in ["minutes", "subscriber_minutes", "revenue_at_risk"]:
+            rows[col] = rows[col].to_numpy() * share
+
+    mask = rows["city"].isin(filters.cities).to_numpy() & filters.location_mask(rows)
+    if filters.zones is not None:
+        mask = mask & rows["zone"].isin(filters.zones).to_numpy()
+    return rows[mask]
+
+
+@data_cache("outages", "tickets", "subscribers", "billing", show_spinner=False)
+def outage_view(filters):
+    rows = outage_slice(filters)
+    by_type = rows.groupby("outage_type").agg(
+        outages=("outage_id", "size"),
+        subscriber_minutes=("subscriber_minutes", "sum"),
+        revenue_at_risk=("revenue_at_risk", "sum"),
+        ticket_uplift=("ticket_uplift", "mean"),
+    )
+    return {
+        "kpis": {
+            "outages": len(rows),
+            "subscriber_minutes": rows["subscriber_minutes"].sum(),
+            "revenue_at_risk": rows["revenue_at_risk"].sum(),
+            "ticket_uplift": rows["ticket_uplift"].sum(),
+        },
+        "by_type": by_type,
+        "top_outages": rows.nlargest(20, "revenue_at_risk")[
+            ["outage_id", "city", "zone", "outage_type", "start", "minutes", "affected_subscribers",
+             "revenue_at_risk", "tickets", "ticket_uplift"]],
+    }
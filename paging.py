@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+
+from data_layer import data_resource
+from derived import DERIVED, derived_frame, open_at
+
+# =====================================================
+# SERVER-SIDE PAGED RECORD LISTS
+# =====================================================
+# Raw-record tables never ship the full filtered frame to the browser. Filter,
+# search and sort run here and produce an array of row positions into the
+# snapshot-backed fact table (cached per query); each page is then one iloc of
+# at most MAX_PAGE_CELLS cells, whatever the number of matching rows.
+
+PAGE_SIZES = [25, 50, 100, 200]
+MAX_PAGE_CELLS = 2_500
+RANKED = {"priority": ["Critical", "High", "Medium", "Low"]}     # sort by rank, not by name
+
+RECORD_LISTS = {
+    "backlog": {
+        "frame": "ticket_fact",
+        "columns": ["ticket_id", "subscriber_id", "ticket_date", "priority", "status",
+                    "ticket_category", "ticket_channel", "assigned_team", "city", "zone",
+                    "service_tier", "sla_target_hours"],
+        "where": lambda f, filters: open_at(f, filters.date_range and filters.date_range[1]),
+        "search": ["ticket_id", "subscriber_id"],
+        "sort": ["ticket_date", "priority", "sla_target_hours", "service_tier", "assigned_team",
+                 "city", "zone"],
+        "ascending": True,                        # oldest open tickets first
+        "date": None,                             # open at the period end, whenever opened
+    },
+    "overdue": {
+        "frame": "billing_fact",
+        "columns": ["bill_id", "subscriber_id", "billing_month", "bill_amount", "city", "zone",
+                    "plan_type", "plan_name", "service_tier"],
+        "where": lambda f, filters: (f["payment_status"] == "Overdue").to_numpy(),
+        "search": ["bill_id", "subscriber_id"],
+        "sort": ["bill_amount", "billing_month", "city", "zone", "plan_name", "service_tier"],
+        "ascending": False,                       # largest bills first
+        "date": "billing_month",
+    },
+}
+
+
+def paged(frame, lo, hi, page, page_size):
+    """Rows [lo, hi) of `frame`, one page at a time."""
+    start = lo + page * page_size
+    return frame.iloc[start:min(start + page_size, hi)]
+
+
+def page_size_cap(page_size, n_columns):
+    return max(1, min(page_size, MAX_PAGE_CELLS // max(n_columns, 1)))
+
+
+def _filter_mask(frame, filters, date_col):
+    mask = filters.subscriber_mask(frame)
+    if filters.zones is not None:
+        mask &= frame["zone"].isin(filters.zones).to_numpy()
+    if filters.plan_name != "All":
+        mask &= (frame["plan_name"] == filters.plan_name).to_numpy()
+    if date_col and filters.date_range is not None:                # whole days, end day included
+        start, end = (pd.to_datetime(d).normalize() for d in filters.date_range)
+        mask &= ((frame[date_col] >= start) & (frame[date_col] < end + pd.Timedelta(days=1))).to_numpy()
+    return mask
+
+
+# Positions are cached as a shared read-only array (cache_resource), so a page
+# turn neither re-filters nor copies millions of row numbers.
+@data_resource(lambda kind, *args, **kwargs: DERIVED[RECORD_LISTS[kind]["frame"]][1],
+               show_spinner=False, max_entries=32)
+def record_order(kind, filters, search="", sort_by=None, ascending=True):
+    """Row positions of the matching records, in display order."""
+    spec = RECORD_LISTS[kind]
+    frame = derived_frame(spec["frame"])
+    rows = np.flatnonzero(spec["where"](frame, filters) & _filter_mask(frame, filters, spec["date"]))
+
+    if search:
+        hit = np.zeros(len(rows), dtype=bool)
+        for col in spec["search"]:
+            values = frame[col].iloc[rows]
+            hit |= values.str.contains(search, case=False, regex=False).fillna(False).to_numpy(dtype=bool)
+        rows = rows[hit]
+
+    if sort_by:
+        key = frame[sort_by].iloc[rows].reset_index(drop=True)
+        if sort_by in RANKED:
+            key = pd.Series(pd.Categorical(key, categories=RANKED[sort_by], ordered=True))
+        rows = rows[key.sort_values(ascending=ascending, kind="stable", na_position="last").index.to_numpy()]
+
+    rows.flags.writeable = False
+    return rows
+
+
+def record_page(kind, filters, search="", sort_by=None, ascending=True, page=0, page_size=50):
+    """One page of a record list and the total number of matching rows."""
+    spec = RECORD_LISTS[kind]
+    rows = record_order(kind, filters, search.strip(), sort_by, ascending)
+    page_size = page_size_cap(page_size, len(spec["columns"]))
+    window = rows[page * page_size:(page + 1) * page_size]
+    frame = derived_frame(spec["frame"], tuple(spec["columns"]))
+    return frame.iloc[window], len(rows)
@@ -0,0 +1,93 @@
+import http.client
+import json
+import pickle
+import queue
+from urllib.parse import urlsplit
+
+import streamlit as st
+
+from query_server import QUERIES, encode
+
+# =====================================================
+# THIN CLIENT FOR THE QUERY SERVER
+# =====================================================
+# A Streamlit process pointed at the query server (TELECOM_QUERY_SERVER)
+# sends its engine queries over a small pool of keep-alive HTTP connections
+# instead of computing them itself. RemoteEngine exposes the engine's
+# interface, so app.py does not change shape: names in QUERIES (views, paged
+# lists, drill-down lookups, the live feed) are forwarded, everything else
+# (Filters, constants, label helpers) stays local. The dashboard process still
+# imports the engine for those, and exports (tables.py -> exports.py) are
+# still built in-process from the local snapshots.
+
+
+class QueryError(RuntimeError):
+    pass
+
+
+class QueryClient:
+    def __init__(self, url, pool_size=8, timeout=60):
+        parts = urlsplit(url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.timeout = timeout
+        self.idle = queue.LifoQueue(maxsize=pool_size)
+
+    def _connection(self):
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _release(self, conn):
+        try:
+            self.idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _request(self, method, path, body=None):
+        payload = None if body is None else json.dumps(body).encode()
+        headers = {"Content-Type": "application/json"} if payload is not None else {}
+        for attempt in (1, 2):              # a pooled connection may have been closed by the server
+            conn = self._connection()
+            try:
+                conn.request(method, path, body=payload, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+            except (ConnectionError, http.client.HTTPException):
+                conn.close()
+                if attempt == 2:
+                    raise
+                continue
+            self._release(conn)
+            return response, data
+
+    def health(self):
+        response, data = self._request("GET", "/health")
+        return json.loads(data)
+
+    def query(self, name, *args, cache=True, **kwargs):
+        response, data = self._request("POST", "/query", {
+            "query": name, "args": encode(list(args)), "kwargs": encode(kwargs), "cache": cache,
+        })
+        if response.status != 200:
+            raise QueryError(json.loads(data).get("error", f"HTTP {response.status}"))
+        return pickle.loads(data)
+
+
+class RemoteEngine:
+    """Stands in for the engine module, forwarding QUERIES to the server."""
+
+    def __init__(self, engine, client):
+        self._engine = engine
+        self._client = client
+
+    def __getattr__(self, name):
+        if name in QUERIES:
+            return lambda *args, **kwargs: self._client.query(name, *args, **kwargs)
+        return getattr(self._engine, name)
+
+
+@st.cache_resource(show_spinner=False)
+def connect(url):
+    """One connection pool per Streamlit process, shared by its sessions."""
+    return QueryClient(url)
@@ -0,0 +1,168 @@
+"""Local analytics query server for the dashboard.
+
+One HTTP front end dispatches typed engine queries to a pool of worker
+processes. Each worker owns its engine caches; derived frames are
+memory-mapped snapshots, so the OS shares their pages between workers
+instead of every Streamlit process holding its own copy. Usage:
+
+    python query_server.py [--host 127.0.0.1] [--port 8765] [--workers 4]
+
+Point dashboards at it with TELECOM_QUERY_SERVER=http://127.0.0.1:8765.
+"""
+import argparse
+import json
+import logging
+import os
+import pickle
+import signal
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields, is_dataclass
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger("telecom.query_server")
+
+# =====================================================
+# WIRE FORMAT
+# =====================================================
+# Requests are JSON, so the server never unpickles client input:
+#   {"query": "executive_view", "args": [...], "kwargs": {...}, "cache": true}
+# Filters travel as {"__filters__": {...}}, dates as {"__date__": iso}; JSON
+# lists come back as tuples so arguments stay hashable for the engine caches.
+# Responses are pickled engine results (frames, series, dicts) - the client
+# only ever talks to its own local server.
+
+# Engine functions a client may call, by name.
+QUERIES = [
+    "filter_options", "plan_name_options", "zone_options", "location_options",
+    "executive_view", "leakage_view", "ageing_view", "cohort_view", "location_view",
+    "ops_view", "ticket_trend", "outage_view", "sla_risk", "anomalies",
+    "executive_comparison", "ops_comparison", "live_view",
+    "record_page", "slice_summary", "subscribers_in_slice", "subscriber_profile", "subscriber_records",
+]
+
+
+def encode(value):
+    if is_dataclass(value):
+        return {"__filters__": {f.name: encode(getattr(value, f.name)) for f in fields(value)}}
+    if isinstance(value, (datetime, date)):
+        return {"__date__": value.isoformat()}
+    if isinstance(value, (list, tuple)):
+        return [encode(v) for v in value]
+    if isinstance(value, dict):
+        return {k: encode(v) for k, v in value.items()}
+    if hasattr(value, "item"):                                               # numpy scalar
+        return value.item()
+    return value
+
+
+def decode(value):
+    if isinstance(value, list):
+        return tuple(decode(v) for v in value)
+    if isinstance(value, dict):
+        if "__filters__" in value:
+            import engine
+            return engine.Filters(**{k: decode(v) for k, v in value["__filters__"].items()})
+        if "__date__" in value:
+            import pandas as pd
+            return pd.Timestamp(value["__date__"])
+        return {k: decode(v) for k, v in value.items()}
+    return value
+
+
+# =====================================================
+# WORKERS
+# =====================================================
+def _init_worker():
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    import engine  # noqa: F401  load modules (and register derived frames) once per worker
+
+
+def run_query(name, args, kwargs, cache=True):
+    """Runs in a worker process; returns the pickled result."""
+    import engine
+
+    fn = getattr(engine, name)
+    if not cache:
+        fn = getattr(fn, "__wrapped__", fn)
+    return pickle.dumps(fn(*decode(args), **decode(kwargs)), protocol=pickle.HIGHEST_PROTOCOL)
+
+
+# =====================================================
+# HTTP FRONT END
+# =====================================================
+class QueryHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"           # keep-alive, so clients can pool connections
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status, payload):
+        self._send(status, json.dumps(payload).encode(), "application/json")
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"workers": self.server.workers, "queries": QUERIES})
+        else:
+            self._send_json(404, {"error": f"unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/query":
+            self._send_json(404, {"error": f"unknown path {self.path}"})
+            return
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            name = request["query"]
+        except (ValueError, KeyError) as exc:
+            self._send_json(400, {"error": f"bad request: {exc!r}"})
+            return
+        if name not in QUERIES:
+            self._send_json(400, {"error": f"unknown query {name!r}"})
+            return
+        try:
+            body = self.server.pool.submit(
+                run_query, name, request.get("args", []), request.get("kwargs", {}),
+                request.get("cache", True),
+            ).result()
+        except Exception as exc:
+            logger.exception("Query %s failed", name)
+            self._send_json(500, {"error": repr(exc)})
+            return
+        self._send(200, body, "application/x-python-pickle")
+
+    def log_message(self, fmt, *args):
+        logger.debug(fmt, *args)
+
+
+def serve(host="127.0.0.1", port=8765, workers=None):
+    workers = workers or os.cpu_count() or 1
+    server = ThreadingHTTPServer((host, port), QueryHandler)
+    server.daemon_threads = True
+    server.workers = workers
+    server.pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+    # Warm the pool so the first queries don't pay for worker start-up and imports.
+    list(server.pool.map(abs, range(workers)))
+    logger.info("Query server on http://%s:%d with %d workers", host, port, workers)
+    # SIGTERM exits through the finally below, so the workers don't outlive the server.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        server.serve_forever()
+    finally:
+        server.pool.shutdown(cancel_futures=True)
+        server.server_close()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    serve(args.host, args.port, args.workers)
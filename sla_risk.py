@@ -0,0 +1,141 @@
+import heapq
+import threading
+from collections import Counter, defaultdict
+
+import pandas as pd
+
+from data_layer import data_resource
+from derived import OPEN_STATUSES, TODAY, derived_frame
+from geo import ANY_SUBSCRIBER, location_label
+
+# =====================================================
+# SLA BREACH QUEUE
+# =====================================================
+# Every open ticket has a deadline = opened + sla_target_hours. Deadlines
+# are kept in one min-heap per (city, zone, team, plan type, subscriber
+# status), so the report honours every Managerial filter and:
+#   - advancing the clock pops only the tickets that just breached,
+#   - a new ticket is one heappush,
+#   - a resolved ticket is dropped from `open` and skipped lazily when popped,
+#   - "breaching within N hours" walks each heap from the root and prunes
+#     every subtree whose root is past the horizon: O(k) for k due tickets.
+# Invariant: breached[key] == open tickets under key with deadline <= now.
+
+RISK_COLUMNS = ("ticket_id", "ticket_date", "status", "city", "zone", "assigned_team",
+                "plan_type", "sub_status", "sla_target_hours")
+KEY = ["city", "zone", "team", "plan_type", "sub_status"]
+LIST_LIMIT = 200
+
+
+class BreachQueue:
+    def __init__(self, now=None):
+        self.heaps = defaultdict(list)      # (city, zone, team, plan, status) -> [(deadline, ticket_id)]
+        self.open = {}                      # ticket_id -> (key, deadline)
+        self.breached = Counter()
+        self.now = now
+        self.lock = threading.Lock()
+
+    def seed(self, tickets):
+        """Bulk-load open tickets; sorted lists are already valid heaps.
+
+        Tickets without plan_type / sub_status columns are keyed under
+        ANY_SUBSCRIBER and kept whatever the plan type and status filters.
+        """
+        tickets = tickets[tickets["status"].isin(OPEN_STATUSES).to_numpy()]
+        deadline = tickets["ticket_date"] + pd.to_timedelta(tickets["sla_target_hours"], unit="h")
+        frame = pd.DataFrame({
+            "city": tickets["city"].to_numpy(), "zone": tickets["zone"].to_numpy(),
+            "team": tickets["assigned_team"].to_numpy(), "deadline": deadline.to_numpy(),
+            "plan_type": tickets["plan_type"].to_numpy() if "plan_type" in tickets else ANY_SUBSCRIBER,
+            "sub_status": tickets["sub_status"].to_numpy() if "sub_status" in tickets else ANY_SUBSCRIBER,
+            "ticket_id": tickets["ticket_id"].to_numpy(),
+        }).sort_values(KEY + ["deadline"], kind="stable")
+        for key, group in frame.groupby(KEY, sort=False, dropna=False):
+            entries = list(zip(group["deadline"].dt.to_pydatetime(), group["ticket_id"]))
+            self.heaps[key] = entries
+            self.open.update((tid, (key, d)) for d, tid in entries)
+        if self.now is not None:
+            now, self.now = self.now, None
+            self.advance(now)
+
+    def push(self, ticket_id, key, deadline):
+        self.open[ticket_id] = (key, deadline)
+        if self.now is not None and deadline <= self.now:
+            self.breached[key] += 1
+        else:
+            heapq.heappush(self.heaps[key], (deadline, ticket_id))
+
+    def discard(self, ticket_id):
+        entry = self.open.pop(ticket_id, None)
+        if entry is not None and self.now is not None and entry[1] <= self.now:
+            self.breached[entry[0]] -= 1
+
+    def _live(self, key, deadline, ticket_id):
+        return self.open.get(ticket_id) == (key, deadline)
+
+    def advance(self, now):
+        if self.now is not None and now <= self.now:
+            return
+        for key, heap in self.heaps.items():
+            while heap and heap[0][0] <= now:
+                deadline, tid = heapq.heappop(heap)
+                if self._live(key, deadline, tid):
+                    self.breached[key] += 1
+        self.now = now
+
+    def due(self, key, horizon):
+        """Live (deadline, ticket_id) entries of one heap with deadline <= horizon."""
+        heap, out, stack = self.heaps.get(key, []), [], [0]
+        while stack:
+            i = stack.pop()
+            if i >= len(heap) or heap[i][0] > horizon:
+                continue
+            if self._live(key, *heap[i]):
+                out.append(heap[i])
+            stack += [2 * i + 1, 2 * i + 2]
+        return out
+
+    def report(self, now, hours, cities, zones=None, plan_types=None, statuses=None, limit=LIST_LIMIT):
+        """Breached counts, due-within-`hours` counts and the soonest-to-breach list.
+
+        `zones`, `plan_types` and `statuses` are None for all; ANY_SUBSCRIBER
+        keys match every plan type and status.
+        """
+        with self.lock:
+            self.advance(now)
+            horizon = self.now + pd.Timedelta(hours=hours)
+            selected = [k for k in set(self.heaps) | set(self.breached)
+                        if k[0] in cities and (zones is None or k[1] in zones)
+                        and (plan_types is None or k[3] in plan_types or k[3] == ANY_SUBSCRIBER)
+                        and (statuses is None or k[4] in statuses or k[4] == ANY_SUBSCRIBER)]
+            rows = [(d, tid, *key) for key in selected for d, tid in self.due(key, horizon)]
+            breached = sum(self.breached[k] for k in selected)
+
+        due = pd.DataFrame(rows, columns=["deadline", "ticket_id", "city", "zone", "assigned_team",
+                                          "plan_type", "sub_status"])
+        due = due.sort_values("deadline", kind="stable")
+        due["hours_left"] = (pd.to_datetime(due["deadline"]) - pd.Timestamp(now)).dt.total_seconds() / 3600
+        # zones are numbered within a city: rows are (city, zone) locations
+        matrix = due.pivot_table(index=["city", "zone"], columns="assigned_team", values="ticket_id",
+                                 aggfunc="count", fill_value=0)
+        matrix.index = pd.Index([location_label(k) for k in matrix.index], name="location")
+        return {
+            "breached": breached,
+            "due": len(due),
+            "due_matrix": matrix,
+            "due_list": due.head(limit)[["ticket_id", "city", "zone", "assigned_team", "deadline",
+                                         "hours_left"]],
+        }
+
+
+@data_resource("tickets", "subscribers", show_spinner=False)
+def snapshot_queue():
+    """Breach queue over the ticket snapshot, clocked at the data as-of date."""
+    queue = BreachQueue(now=TODAY.to_pydatetime())
+    queue.seed(derived_frame("ticket_fact", RISK_COLUMNS))
+    return queue
+
+
+def snapshot_risk(filters, hours):
+    queue = snapshot_queue()
+    return queue.report(queue.now, hours, *filters.scope(), filters.plan_types, filters.statuses)
@@ -0,0 +1,119 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import defaultdict
+from pathlib import Path
+
+from flags import FLAGS
+from startup import optional_import
+
+logger = logging.getLogger(__name__)
+
+# =====================================================
+# ARROW IPC SNAPSHOTS OF DERIVED FRAMES
+# =====================================================
+# Derived frames are written once as uncompressed Arrow IPC files named after
+# a content hash of their inputs, then memory-mapped read-only. Every worker
+# process maps the same file, so pages are shared through the OS cache and a
+# restart only pays for the hash check.
+
+SNAPSHOT_DIR = Path(os.environ.get(
+    "TELECOM_SNAPSHOT_DIR", Path(__file__).resolve().parent / ".snapshots"
+))
+CHUNK = 1 << 20
+_BUILD_LOCKS = defaultdict(threading.Lock)
+
+
+def _tmp_path(path):
+    return path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+def _fingerprint_cache_path():
+    return SNAPSHOT_DIR / "fingerprints.json"
+
+
+def content_hash(path):
+    """blake2b of the file bytes, memoised on (size, mtime) across restarts."""
+    path = Path(path)
+    st_ = path.stat()
+    stamp = f"{st_.st_size}:{st_.st_mtime_ns}"
+
+    cache_file = _fingerprint_cache_path()
+    try:
+        cache = json.loads(cache_file.read_text())
+    except (OSError, ValueError):
+        cache = {}
+    entry = cache.get(str(path))
+    if entry and entry["stamp"] == stamp:
+        return entry["hash"]
+
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(CHUNK), b""):
+            digest.update(block)
+    cache[str(path)] = {"stamp": stamp, "hash": digest.hexdigest()}
+
+    SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = _tmp_path(cache_file)
+    tmp.write_text(json.dumps(cache))
+    os.replace(tmp, cache_file)
+    return cache[str(path)]["hash"]
+
+
+def snapshot_key(name, inputs, version):
+    digest = hashlib.blake2b(digest_size=12)
+    digest.update(f"{name}:{version}".encode())
+    for path in inputs:
+        digest.update(content_hash(path).encode())
+    return digest.hexdigest()
+
+
+def write_snapshot(frame, path):
+    pa = optional_import("pyarrow")
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    tmp = _tmp_path(path)
+    with pa.OSFile(str(tmp), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp, path)
+
+
+def read_snapshot(path, columns=None):
+    """Memory-map a snapshot read-only; unselected columns are never paged in."""
+    pa = optional_import("pyarrow")
+    source = pa.memory_map(str(path), "r")
+    table = pa.ipc.open_file(source).read_all()
+    if columns is not None:
+        table = table.select([c for c in columns if c in table.column_names])
+    # split_blocks keeps one block per column, so nothing is consolidated into
+    # copies. String columns (pandas' Arrow-backed str) and null-free numeric
+    # and datetime columns wrap the mapped buffers; only numeric and datetime
+    # columns with nulls (e.g. resolution_date, res_hours) become private
+    # copies, because numpy marks missing values in the data itself.
+    return table.to_pandas(split_blocks=True)
+
+
+def load_or_build(name, builder, inputs, columns=None, version=1):
+    """Return the snapshot for `name`, rebuilding it if any input changed.
+
+    Falls back to calling `builder` directly when snapshots are disabled or
+    pyarrow is unavailable.
+    """
+    if not FLAGS["snapshots"] or optional_import("pyarrow") is None:
+        frame = builder()
+        return frame if columns is None else frame[[c for c in columns if c in frame.columns]]
+
+    key = snapshot_key(name, inputs, version)
+    path = SNAPSHOT_DIR / f"{name}-{key}.arrow"
+    with _BUILD_LOCKS[name]:
+        if not path.exists():
+            logger.info("Building snapshot %s", path.name)
+            write_snapshot(builder(), path)
+            for stale in SNAPSHOT_DIR.glob(f"{name}-*.arrow"):
+                if stale != path:
+                    stale.unlink(missing_ok=True)
+    return read_snapshot(path, columns)
@@ -0,0 +1,132 @@
+import importlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+import streamlit as st
+
+from flags import FLAGS
+
+logger = logging.getLogger(__name__)
+
+# =====================================================
+# DEFERRED IMPORTS
+# =====================================================
+IMPORT_TIMINGS = {}
+
+
+def timed_import(name):
+    """Import `name` once per process, recording how long the first import took."""
+    # Always go through importlib: it blocks on the per-module import lock if
+    # another thread (e.g. the warm-up) is still initialising the module.
+    first = name not in sys.modules
+    t0 = time.perf_counter()
+    module = importlib.import_module(name)
+    if first:
+        IMPORT_TIMINGS[name] = time.perf_counter() - t0
+    return module
+
+
+def optional_import(name):
+    try:
+        return timed_import(name)
+    except ImportError:
+        return None
+
+
+# =====================================================
+# WARM-UP (ONCE PER VIEW PER SERVER PROCESS)
+# =====================================================
+WARM_UP = {}                        # view -> {"started", "finished", "error"}
+
+
+def _warm_up(view):
+    state = WARM_UP[view] = {"started": time.perf_counter(), "finished": None, "error": None}
+    if FLAGS["query_server"]:           # the query server owns the data
+        state["finished"] = state["started"]
+        return
+    try:
+        engine = timed_import("engine")
+        for name in engine.VIEW_FRAMES[view]:
+            engine.derived_frame(name)
+        engine.filter_options(view)
+    except Exception as exc:  # warm-up is best effort; the session loads on demand
+        state["error"] = repr(exc)
+        logger.exception("Warm-up of %s failed", view)
+    state["finished"] = time.perf_counter()
+    logger.info("Warm-up of %s finished in %.2fs", view, state["finished"] - state["started"])
+
+
+@st.cache_resource(show_spinner=False)
+def start_warm_up(view):
+    """Kick off the background warm-up of `view`'s data the first time any
+    session shows that view.
+
+    Streamlit has no server-start hook, so this runs on a session's script run,
+    not at boot; that session paints its skeleton while the thread loads, and
+    a view nobody opens is never loaded. Sessions don't wait on the thread:
+    st.cache_data serialises concurrent computations of the same key, so a
+    session asking for a table that is being warmed simply blocks on that entry.
+    """
+    if not FLAGS["warm_up"]:
+        return None
+    thread = threading.Thread(target=_warm_up, args=(view,), name="telecom-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+# =====================================================
+# RUN TIMINGS & SKELETON
+# =====================================================
+class RunTimer:
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.marks = {}
+
+    def mark(self, name):
+        self.marks[name] = time.perf_counter() - self.t0
+
+
+def begin_run():
+    return RunTimer()
+
+
+def skeleton(title, n_metrics=4):
+    """Placeholder layout shown before any data is loaded."""
+    holder = st.empty()
+    with holder.container():
+        st.title(title)
+        cols = st.columns(n_metrics)
+        for c in cols:
+            c.metric("Loading…", "—")
+    return holder
+
+
+def report(timer):
+    first_session_run = "startup_reported" not in st.session_state
+    st.session_state["startup_reported"] = True
+
+    record = {
+        "first_paint_ms": round(timer.marks.get("first_paint", 0) * 1000, 1),
+        "ready_ms": round(timer.marks.get("ready", 0) * 1000, 1),
+        "imports_ms": {k: round(v * 1000, 1) for k, v in IMPORT_TIMINGS.items()},
+        "warm_up_s": {
+            view: round(state["finished"] - state["started"], 2) if state["finished"] else None
+            for view, state in WARM_UP.items()
+        },
+    }
+
+    if first_session_run:
+        logger.info("Startup timings: %s", record)
+        log_path = os.environ.get("TELECOM_STARTUP_LOG")
+        if log_path:
+            with open(log_path, "a") as fh:
+                fh.write(json.dumps({"ts": time.time(), **record}) + "\n")
+
+    with st.sidebar.expander("⏱ Startup Timings"):
+        st.caption(f"First paint: {record['first_paint_ms']} ms · Ready: {record['ready_ms']} ms")
+        st.json(record, expanded=False)
+    return record
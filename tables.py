@@ -0,0 +1,70 @@
+from pathlib import Path
+
+import streamlit as st
+
+from exports import (EXPORTS, FORMATS, PRESETS, available_formats, export_file, export_name, export_to_disk,
+                     stored_report)
+from flags import FLAGS
+from paging import PAGE_SIZES, RECORD_LISTS, page_size_cap
+
+# =====================================================
+# PAGED TABLE WIDGETS
+# =====================================================
+# Only the visible page is sent to st.dataframe; search, sort and paging
+# controls are passed down to engine.record_page (local or on the query server).
+
+
+def pager(total, page_size, key, noun="rows"):
+    """Page number input (0-based result). Resets when the result size changes."""
+    pages = max((total - 1) // page_size + 1, 1)
+    return st.number_input(f"Page (of {pages}, {total:,} {noun})", 1, pages, 1,
+                           key=f"{key}_page_{total}") - 1
+
+
+def paged_table(engine, kind, filters, key, noun="rows"):
+    spec = RECORD_LISTS[kind]
+    c1, c2, c3, c4 = st.columns([3, 2, 1, 1])
+    search = c1.text_input("Search", key=f"{key}_search",
+                           placeholder=" or ".join(c.replace("_", " ") for c in spec["search"]))
+    sort_by = c2.selectbox("Sort by", spec["sort"], key=f"{key}_sort")
+    order = c3.selectbox("Order", ["Ascending", "Descending"], index=0 if spec["ascending"] else 1,
+                         key=f"{key}_order")
+    page_size = page_size_cap(c4.selectbox("Rows", PAGE_SIZES, index=1, key=f"{key}_rows"),
+                              len(spec["columns"]))
+
+    query = (kind, filters, search, sort_by, order == "Ascending")
+    _, total = engine.record_page(*query, page=0, page_size=0)
+    page = pager(total, page_size, key, noun)
+    rows, _ = engine.record_page(*query, page=page, page_size=page_size)
+    st.dataframe(rows, hide_index=True)
+    return total
+
+
+# =====================================================
+# EXPORT WIDGETS
+# =====================================================
+# Downloads are deferred: the export streams into a temporary file only when
+# the button is clicked, never on a rerun.
+
+
+def export_panel(kinds, filters, key):
+    formats = available_formats()
+    c1, c2 = st.columns(2)
+    kind = c1.selectbox("Records", kinds, format_func=lambda k: EXPORTS[k]["label"], key=f"{key}_kind")
+    fmt = c2.selectbox("Format", formats, format_func=lambda f: FORMATS[f][0], key=f"{key}_format")
+    name = export_name(kind, fmt, filters)
+    b1, b2 = st.columns(2)
+    b1.download_button(f"Download {name}", lambda: export_file(kind, filters, fmt), file_name=name,
+                       mime=FORMATS[fmt][1], on_click="ignore", key=f"{key}_download")
+    if FLAGS["export_dir"] and b2.button("Save on server", key=f"{key}_save"):
+        path = Path(FLAGS["export_dir"]) / name
+        st.caption(f"{export_to_disk(kind, filters, fmt, path):,} rows written to {path}.")
+    if "xlsx" not in formats:
+        st.caption("Excel export needs the xlsxwriter package.")
+
+    r1, r2 = st.columns(2)
+    preset = r1.selectbox("KPI report", list(PRESETS), format_func=lambda p: PRESETS[p]["label"],
+                          key=f"{key}_preset")
+    r2.download_button("Download KPI report (HTML)", lambda: stored_report(preset),
+                       file_name=f"kpi_report_{preset}.html", mime="text/html", on_click="ignore",
+                       key=f"{key}_report")
@@ -0,0 +1,11 @@
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("TELECOM_WARM_UP", "0")
+
+from streamlit import logger  # noqa: E402
+
+logger.set_log_level("error")
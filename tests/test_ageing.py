@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+from ageing import ageing_matrix, as_of_grid
+
+NAT = np.datetime64("NaT")
+
+
+def test_as_of_grid_is_month_ends():
+    grid = as_of_grid("2025-01-15", "2025-03-02")
+    assert list(grid) == list(pd.to_datetime(["2025-01-31", "2025-02-28", "2025-03-31"]))
+
+
+def test_ageing_matrix_by_hand():
+    as_of = pd.to_datetime(["2025-01-31", "2025-02-28", "2025-03-31"])
+    billing_month = pd.to_datetime(["2025-01-01", "2025-01-01", "2025-02-01", "2025-03-01"]).to_numpy()
+    settled_at = np.array(["2025-02-10", NAT, "2025-02-28", NAT], dtype="datetime64[ns]")
+    amount = np.array([100.0, 50.0, 20.0, 7.0])
+    # Jan 31: both January bills open, 30 days old          -> 150 in 0-30
+    # Feb 28: the 100 is paid; the 50 is 58 days old          ->  50 in 31-60
+    #         the February bill settles on the as-of date itself, so it is closed
+    # Mar 31: the 50 is 89 days old, the March bill 30 days   ->  50 in 61-90, 7 in 0-30
+    expected = [[150, 0, 0, 0],
+                [0, 50, 0, 0],
+                [7, 0, 50, 0]]
+    np.testing.assert_array_equal(ageing_matrix(billing_month, settled_at, amount, as_of), expected)
+
+
+def test_ageing_matrix_moves_unpaid_bills_into_90_plus():
+    as_of = pd.to_datetime(["2025-04-30"])
+    matrix = ageing_matrix(pd.to_datetime(["2025-01-01"]).to_numpy(), np.array([NAT], dtype="datetime64[ns]"),
+                           np.array([12.5]), as_of)
+    np.testing.assert_array_equal(matrix, [[0, 0, 0, 12.5]])
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import anomalies
+
+
+def test_detect_scores_a_jump_against_a_flat_history():
+    values = np.array([[10.0]] * 20 + [[40.0]])
+    robust, ewma, baseline, _ = anomalies.detect(values)
+    # MAD and EWMA variance are both 0, so the scale is the floor sqrt(10)
+    assert np.isnan(robust[:14]).all() and np.isnan(ewma[:14]).all()
+    assert robust[14:20] == pytest.approx(np.zeros((6, 1)))
+    assert robust[20, 0] == pytest.approx(30 / np.sqrt(10))
+    assert ewma[20, 0] == pytest.approx(30 / np.sqrt(10))
+    assert baseline[20, 0] == 10
+
+
+def test_detect_robust_scale_is_the_mad():
+    values = np.array([[90.0], [110.0]] * 10 + [[200.0]])
+    robust, _, baseline, _ = anomalies.detect(values)
+    # median 100, MAD 10: z = (200 - 100) / (1.4826 * 10)
+    assert baseline[20, 0] == 100
+    assert robust[20, 0] == pytest.approx(100 / 14.826)
+
+
+def test_detect_state_resumes_the_same_scores():
+    values = np.random.default_rng(0).poisson(20, (90, 3)).astype(float)
+    whole = anomalies.detect(values)
+    first = anomalies.detect(values[:50])
+    rest = anomalies.detect(values[50:], first[3])
+    for i in range(3):
+        np.testing.assert_allclose(np.vstack([first[i], rest[i]]), whole[i])
+
+
+def test_score_only_adds_new_days():
+    matrix = pd.DataFrame(np.random.default_rng(1).poisson(20, (120, 2)).astype(float),
+                          index=pd.date_range("2024-01-01", periods=120), columns=["a", "b"])
+    matrix.iloc[60, 1] = 90
+    anomalies.score("test", matrix.iloc[:70])
+    pd.testing.assert_frame_equal(anomalies.score("test", matrix), anomalies.flagged(matrix)[0])
+    matrix.iloc[5, 0] = 60                                  # an edited past day rescores everything
+    pd.testing.assert_frame_equal(anomalies.score("test", matrix), anomalies.flagged(matrix)[0])
+
+
+@pytest.mark.parametrize("stream, narrowed", [("revenue", True), ("usage_gb", True), ("outage_minutes", False)])
+def test_plan_type_filter_narrows_subscriber_streams(stream, narrowed):
+    everything = anomalies.series_matrix(stream, "city").to_numpy().sum()
+    postpaid = anomalies.series_matrix(stream, "city", plan_types=("Postpaid",)).to_numpy().sum()
+    assert (postpaid < everything) if narrowed else postpaid == pytest.approx(everything)
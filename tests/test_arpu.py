@@ -0,0 +1,11 @@
+import numpy as np
+
+from arpu import merge_ordered_sums
+
+
+def test_merge_ordered_sums_outer_joins_sorted_keys():
+    keys, (left, right) = merge_ordered_sums(np.array([1, 3, 5]), [np.array([10.0, 30.0, 50.0])],
+                                             np.array([3, 4]), [np.array([7.0, 8.0])])
+    assert keys.tolist() == [1, 3, 4, 5]
+    assert left.tolist() == [10, 30, 0, 50]
+    assert right.tolist() == [0, 7, 8, 0]
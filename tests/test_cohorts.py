@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from cohorts import churn_months, month_index, revenue_matrix, survival_matrix
+
+
+def test_month_index():
+    idx = month_index(pd.to_datetime(["1970-01-01", "1970-02-10", "2025-03-31", None]))
+    np.testing.assert_array_equal(idx, [1970 * 12, 1970 * 12 + 1, 2025 * 12 + 2, -1])
+
+
+def test_survival_matrix_by_hand():
+    # cohort 10: three subscribers, churning in period 0, period 1 and never
+    # cohort 12: one subscriber churning in period 8, beyond the 3-period window
+    activation = np.array([10, 10, 10, 12])
+    churn = np.array([10, 11, -1, 20])
+    cohorts, survival = survival_matrix(activation, churn, as_of_idx=13, periods=3)
+    np.testing.assert_array_equal(cohorts, [10, 12])
+    # survivors 2, 1, 1, 1 of 3; cohort 12 is only observed up to month 13 (periods 0 and 1)
+    np.testing.assert_allclose(survival, [[2 / 3, 1 / 3, 1 / 3, 1 / 3],
+                                          [1, 1, np.nan, np.nan]])
+
+
+def test_inactive_subscriber_without_churn_date_counts_as_churned():
+    subs = pd.DataFrame({"status": ["Active", "Suspended", "Churned"],
+                         "churn_date": pd.to_datetime([None, None, "1970-03-15"])})
+    activation = np.array([1970 * 12] * 3)
+    churn = churn_months(subs, activation)
+    np.testing.assert_array_equal(churn, [-1, 1970 * 12, 1970 * 12 + 2])
+    _, survival = survival_matrix(activation, churn, as_of_idx=1970 * 12 + 2, periods=2)
+    np.testing.assert_allclose(survival, [[2 / 3, 2 / 3, 1 / 3]])
+
+
+def test_revenue_matrix_is_relative_to_the_first_covered_period():
+    cohorts = np.array([10, 12])
+    bill_cohort = np.array([10, 10, 10, 12, 12])
+    bill_month = np.array([11, 12, 13, 12, 13])
+    amount = np.array([100.0, 80.0, 50.0, 40.0, 10.0])
+    # billing covers months 11..13: cohort 10's periods 1-3, cohort 12's periods 0-1
+    relative = revenue_matrix(cohorts, bill_cohort, bill_month, amount, coverage=(11, 13), periods=3)
+    np.testing.assert_allclose(relative, [[np.nan, 1, 0.8, 0.5],
+                                          [1, 0.25, np.nan, np.nan]])
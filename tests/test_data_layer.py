@@ -0,0 +1,39 @@
+import data_layer
+from data_layer import _ENTRIES, data_cache
+
+CALLS = []
+
+
+@data_cache("tickets", max_entries=3)
+def _square(x, columns=None):
+    CALLS.append(x)
+    return x * x
+
+
+def registered(fn):
+    """Registry records for `fn`'s cache (CachedFunc -> versioned compute -> fn)."""
+    return sum(len(entries) for cache, entries in _ENTRIES["tickets"].items()
+               if cache.__wrapped__.__wrapped__ is fn)
+
+
+def test_entry_registry_is_deduped_and_capped():
+    _square.clear()
+    for x in [1, 2, 1, 3, 4, 5, 1, 2] * 3:
+        assert _square(x, columns=["a"]) == x * x
+    assert registered(_square.__wrapped__) == 3
+    assert len(CALLS) > 5                        # the cache did evict and recompute
+
+
+def test_version_change_clears_registered_entries(monkeypatch):
+    _square.clear()
+    CALLS.clear()
+    _square(7)
+    _square(7)
+    assert CALLS == [7]
+    assert registered(_square.__wrapped__) == 1
+    version = data_layer.data_version("tickets")
+    monkeypatch.setitem(data_layer._VERSIONS, "tickets", (0, None, "old"))   # force a re-check that differs
+    assert data_layer.data_version("tickets") == version
+    assert registered(_square.__wrapped__) == 0
+    _square(7)
+    assert CALLS == [7, 7]
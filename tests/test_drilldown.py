@@ -0,0 +1,15 @@
+import pandas as pd
+
+import engine
+
+
+def test_all_cities_list_keeps_to_the_city_filter():
+    cities = ("Sharjah", "Dubai")
+    summary = engine.slice_summary()
+    _, total = engine.subscribers_in_slice(page_size=0, cities=cities)
+    assert total == summary[list(cities)].sum() < summary.sum()
+    # pages of 7 rows straddle the boundary between the two cities' runs
+    pages = [engine.subscribers_in_slice(page=p, page_size=7, cities=cities)[0] for p in range(-(-total // 7))]
+    listed = pd.concat(pages)
+    assert len(listed) == total and listed["subscriber_id"].is_unique
+    assert set(listed["city"]) == set(cities)
@@ -0,0 +1,28 @@
+import pytest
+
+import engine
+from test_period_kpis import all_filters
+
+
+@pytest.mark.parametrize("narrow", [
+    {"cities": ("Dubai",)},
+    {"cities": ("Dubai", "Sharjah")},
+    {"plan_types": ("Postpaid",)},
+    {"statuses": ("Active",)},
+])
+def test_network_node_honours_the_global_filters(narrow):
+    base = all_filters(engine.EXECUTIVE, date_range=tuple(engine.filter_options(engine.EXECUTIVE)["billing_months"]))
+    filters = engine.Filters(**{"cities": base.cities, "plan_types": base.plan_types, "statuses": base.statuses,
+                                "date_range": base.date_range, **narrow})
+    node = engine.location_view(filters)["node"]
+    assert node["revenue"] == pytest.approx(engine.executive_view(filters)["kpis"]["total_revenue"])
+    assert node["subscribers"] == len(engine.subscriber_slice(engine.EXECUTIVE, filters))
+
+
+def test_zone_rows_are_keyed_by_city():
+    base = all_filters(engine.EXECUTIVE, date_range=tuple(engine.filter_options(engine.EXECUTIVE)["billing_months"]))
+    options = engine.location_options(base.cities)
+    assert len(options) == len(set(options))
+    zones = engine.location_view(engine.Filters(base.cities, base.plan_types, base.statuses,
+                                                date_range=base.date_range, location=("Dubai",)))["children"]
+    assert all(label.startswith("Dubai › Zone ") for label in zones.index)
@@ -0,0 +1,38 @@
+import pandas as pd
+
+from live_feed import SEED_COLUMNS, LiveTickets
+
+
+def seeded(*rows):
+    state = LiveTickets()
+    columns = [c for c in SEED_COLUMNS if c not in ("plan_type", "sub_status")]     # kept under every filter
+    frame = pd.DataFrame(rows, columns=columns).astype({"ticket_date": "datetime64[ns]"})
+    state.seed(frame)
+    return state
+
+
+def test_backlog_keeps_same_zone_number_apart_across_cities():
+    state = seeded(
+        ("T1", "2026-01-01 08:00", "Open", "Dubai", 1, "Tier 1", float("nan"), 24),
+        ("T2", "2026-01-01 09:00", "Escalated", "Dubai", 1, "Tier 2", float("nan"), 24),
+        ("T3", "2026-01-01 09:00", "Open", "Sharjah", 1, "Tier 1", float("nan"), 24),
+        ("T4", "2026-01-01 07:00", "Resolved", "Sharjah", 1, "Tier 1", 2.0, 24),
+    )
+    backlog = state.view({"Dubai", "Sharjah"})["backlog_by_zone"]
+    assert backlog.to_dict() == {"Dubai › Zone 1": 2, "Sharjah › Zone 1": 1}
+    assert backlog.index.name == "location"
+
+
+def test_events_update_the_keyed_backlog_and_kpis():
+    state = seeded(("T1", "2026-01-01 08:00", "Open", "Dubai", 1, "Tier 1", float("nan"), 24))
+    state.apply({"type": "open", "ticket_id": "T2", "ts": "2026-01-01T10:00:00", "city": "Sharjah", "zone": 1,
+                 "sla_target_hours": 4})
+    state.apply({"type": "resolve", "ticket_id": "T1", "ts": "2026-01-01T20:00:00"})
+    state.apply({"type": "resolve", "ticket_id": "T1", "ts": "2026-01-01T21:00:00"})   # already resolved
+    view = state.view({"Dubai", "Sharjah"})
+    assert view["backlog_by_zone"].to_dict() == {"Dubai › Zone 1": 0, "Sharjah › Zone 1": 1}
+    assert view["kpis"]["total_tickets"] == 2
+    assert view["kpis"]["avg_resolution_hours"] == 12
+    assert view["kpis"]["sla_compliance"] == 100
+    assert (view["events"], view["skipped"]) == (2, 1)
+    assert state.view({"Dubai"})["kpis"]["backlog"] == 0
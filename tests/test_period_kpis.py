@@ -0,0 +1,96 @@
+import datetime as dt
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import engine
+import exports
+import paging
+from conftest import ROOT
+
+JAN = (dt.date(2026, 1, 1), dt.date(2026, 1, 1))
+DEC = (dt.date(2025, 12, 1), dt.date(2025, 12, 31))
+
+
+def all_filters(view, **kwargs):
+    options = engine.filter_options(view)
+    return engine.Filters(tuple(options["cities"]), tuple(options["plan_types"]), tuple(options["statuses"]),
+                          **kwargs)
+
+
+@pytest.mark.parametrize("date_range", [JAN, (dt.date(2025, 11, 1), dt.date(2026, 1, 1))])
+@pytest.mark.parametrize("mode", ["MoM", "QoQ"])
+def test_executive_cards_are_the_current_side_of_their_delta(date_range, mode):
+    filters = all_filters(engine.EXECUTIVE, date_range=date_range)
+    shown = engine.executive_view(filters)["kpis"]
+    compared = engine.executive_comparison(filters, mode)["kpis"]
+    for name, value in shown.items():
+        assert compared[name]["current"] == pytest.approx(value), name
+
+
+@pytest.mark.parametrize("date_range", [DEC, (dt.date(2025, 9, 4), dt.date(2026, 1, 3))])
+def test_ops_cards_are_the_current_side_of_their_delta(date_range):
+    filters = all_filters(engine.MANAGERIAL, date_range=date_range)
+    shown = engine.ops_view(filters)["kpis"]
+    compared = engine.ops_comparison(filters, "MoM")["kpis"]
+    for name, value in shown.items():
+        assert compared[name]["current"] == pytest.approx(value, nan_ok=True), name
+
+
+def run_app(view, period_label, period):
+    at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=300).run()
+    at.sidebar.radio[0].set_value(view).run()
+    next(w for w in at.sidebar.date_input if w.label == period_label).set_value(period)
+    next(w for w in at.sidebar.selectbox if w.label == "Compare With").set_value("MoM")
+    at.run()
+    assert not at.exception
+    return {m.label: m.value for m in at.metric}
+
+
+def test_displayed_executive_metrics_match_delta_current():
+    metrics = run_app(engine.EXECUTIVE, "Billing Period", JAN)
+
+    current = engine.executive_comparison(all_filters(engine.EXECUTIVE, date_range=JAN), "MoM")["kpis"]
+    assert metrics["Total Revenue (AED)"] == f"{current['total_revenue']['current']:,.0f}"
+    assert metrics["ARPU (AED)"] == f"{current['arpu']['current']:.2f}"
+    assert metrics["Retention Ratio (%)"] == f"{current['retention']['current']:.1f}"
+    assert metrics["Overdue Revenue (AED)"] == f"{current['overdue_revenue']['current']:,.0f}"
+
+
+def test_displayed_ops_metrics_match_delta_current():
+    metrics = run_app(engine.MANAGERIAL, "Operations Period", DEC)
+    filters = all_filters(engine.MANAGERIAL, date_range=DEC)
+    filters = engine.Filters(filters.cities, filters.plan_types, filters.statuses, date_range=DEC,
+                             zones=tuple(engine.zone_options(filters)))
+    current = engine.ops_comparison(filters, "MoM")["kpis"]
+    assert metrics["Total Tickets"] == str(current["total_tickets"]["current"])
+    assert metrics["Ticket Backlog"] == str(current["backlog"]["current"])
+    assert metrics["Avg Resolution Time (hrs)"] == f"{current['avg_resolution_hours']['current']:.1f}"
+    assert metrics["SLA Compliance (%)"] == f"{current['sla_compliance']['current']:.1f}"
+
+
+def test_window_totals_sums_each_inclusive_window():
+    dates = ["2026-01-01", "2026-01-15", "2026-02-01", "2026-03-01"]
+    values = [[1, 10], [2, 20], [4, 40], [8, 80]]
+    windows = [("2026-01-01", "2026-01-31"), ("2026-01-15", "2026-02-01"), ("2026-04-01", "2026-04-30")]
+    assert engine.window_totals(dates, values, windows).tolist() == [[3, 30], [6, 60], [0, 0]]
+
+
+@pytest.mark.parametrize("date_range", [(dt.date(2025, 12, 1), dt.date(2025, 12, 7)), None])
+def test_ops_panels_count_like_the_cards(date_range):
+    filters = all_filters(engine.MANAGERIAL, date_range=date_range)
+    view = engine.ops_view(filters)
+    assert view["backlog_by_zone"].sum() == view["kpis"]["backlog"]
+    assert paging.record_page("backlog", filters)[1] == view["kpis"]["backlog"]
+    assert view["outages_vs_tickets"]["Ticket Count"].sum() == view["kpis"]["total_tickets"]
+    tickets = engine.derived_frame("ticket_fact", engine.TICKET_COLUMNS)
+    resolved = tickets[(tickets["status"] == "Resolved").to_numpy()
+                       & engine.in_period(tickets["resolution_date"], date_range)]
+    counts = resolved.groupby("ticket_channel").size()
+    assert (view["sla_by_channel"] * counts).sum() / counts.sum() == pytest.approx(view["kpis"]["avg_resolution_hours"])
+
+
+def test_tickets_export_matches_the_total_tickets_card():
+    filters = all_filters(engine.MANAGERIAL, date_range=(dt.date(2025, 12, 1), dt.date(2025, 12, 7)))
+    exported = sum(len(chunk) for chunk in exports.export_chunks("tickets", filters))
+    assert exported == engine.ops_view(filters)["kpis"]["total_tickets"]
@@ -0,0 +1,33 @@
+import json
+import pickle
+
+import numpy as np
+import pandas as pd
+
+import engine
+from query_server import QUERIES, decode, encode, run_query
+from test_period_kpis import all_filters
+
+
+def over_the_wire(*args):
+    return json.loads(json.dumps(encode(list(args))))
+
+
+def test_filters_and_dates_round_trip():
+    filters = all_filters(engine.MANAGERIAL, date_range=(pd.Timestamp("2025-12-01"), pd.Timestamp("2025-12-31")),
+                          zones=(np.int64(1), np.int64(3)), location=("Dubai", np.int64(1)))
+    assert decode(over_the_wire(filters)) == (filters,)
+
+
+def test_paged_lists_and_drilldown_run_on_the_server():
+    for name in ("record_page", "slice_summary", "subscribers_in_slice", "subscriber_profile",
+                 "subscriber_records", "live_view"):
+        assert name in QUERIES and callable(getattr(engine, name))
+    filters = all_filters(engine.MANAGERIAL)
+    remote, total = pickle.loads(run_query("record_page", over_the_wire("backlog", filters),
+                                           {"page": 1, "page_size": 20}))
+    local, local_total = engine.record_page("backlog", filters, page=1, page_size=20)
+    assert total == local_total
+    pd.testing.assert_frame_equal(remote, local)
+    summary = pickle.loads(run_query("slice_summary", over_the_wire("Dubai"), {}))
+    pd.testing.assert_series_equal(summary, engine.slice_summary("Dubai"))
@@ -0,0 +1,89 @@
+from datetime import datetime
+
+import pandas as pd
+
+from geo import ANY_SUBSCRIBER
+from sla_risk import BreachQueue
+
+NOW = datetime(2026, 1, 1, 12)
+KEY = ("Dubai", 1, "Tier 1", ANY_SUBSCRIBER, ANY_SUBSCRIBER)
+
+
+def tickets(*rows):
+    return pd.DataFrame(rows, columns=["ticket_id", "ticket_date", "status", "city", "zone", "assigned_team",
+                                       "sla_target_hours"]).astype({"ticket_date": "datetime64[ns]"})
+
+
+def queue(*rows):
+    q = BreachQueue(now=NOW)
+    q.seed(tickets(*rows))
+    return q
+
+
+def test_seed_counts_breached_and_skips_closed_tickets():
+    q = queue(
+        ("T1", "2026-01-01 00:00", "Open", "Dubai", 1, "Tier 1", 4),      # deadline 04:00 -> breached
+        ("T2", "2026-01-01 10:00", "Open", "Dubai", 1, "Tier 1", 4),      # deadline 14:00 -> due in 2 h
+        ("T3", "2026-01-01 00:00", "Resolved", "Dubai", 1, "Tier 1", 4),  # closed: ignored
+    )
+    report = q.report(NOW, 24, {"Dubai"})
+    assert report["breached"] == 1
+    assert report["due"] == 1
+    assert list(report["due_list"]["ticket_id"]) == ["T2"]
+    assert report["due_list"]["hours_left"].iloc[0] == 2
+
+
+def test_push_discard_and_advance_keep_the_breached_count():
+    q = queue(("T1", "2026-01-01 10:00", "Open", "Dubai", 1, "Tier 1", 4))     # deadline 14:00
+    key = KEY
+    q.push("T2", key, datetime(2026, 1, 1, 11))         # already past the clock: breached at once
+    assert q.breached[key] == 1
+    q.discard("T2")
+    assert q.breached[key] == 0
+    q.advance(datetime(2026, 1, 1, 15))                 # T1 breaches
+    assert q.breached[key] == 1
+    q.discard("T1")
+    assert q.breached[key] == 0
+
+
+def test_due_stops_at_the_horizon_and_skips_discarded_tickets():
+    q = queue(*[(f"T{h}", "2026-01-01 12:00", "Open", "Dubai", 1, "Tier 1", h) for h in (1, 2, 5, 30)])
+    q.discard("T2")
+    due = q.due(KEY, datetime(2026, 1, 1, 18))
+    assert sorted(tid for _, tid in due) == ["T1", "T5"]
+
+
+def test_due_matrix_keeps_same_numbered_zones_of_different_cities_apart():
+    q = queue(
+        ("T1", "2026-01-01 10:00", "Open", "Dubai", 1, "Tier 1", 4),
+        ("T2", "2026-01-01 10:00", "Open", "Sharjah", 1, "Tier 1", 4),
+        ("T3", "2026-01-01 10:00", "Open", "Sharjah", 1, "Tier 2", 4),
+    )
+    matrix = q.report(NOW, 24, {"Dubai", "Sharjah"})["due_matrix"]
+    assert list(matrix.index) == ["Dubai › Zone 1", "Sharjah › Zone 1"]
+    assert matrix.loc["Dubai › Zone 1", "Tier 1"] == 1
+    assert matrix.loc["Sharjah › Zone 1"].tolist() == [1, 1]
+
+
+def test_report_filters_by_city_and_zone():
+    q = queue(
+        ("T1", "2026-01-01 10:00", "Open", "Dubai", 1, "Tier 1", 4),
+        ("T2", "2026-01-01 10:00", "Open", "Dubai", 2, "Tier 1", 4),
+        ("T3", "2026-01-01 10:00", "Open", "Sharjah", 1, "Tier 1", 4),
+    )
+    assert q.report(NOW, 24, {"Dubai"}, zones={2})["due"] == 1
+    assert q.report(NOW, 24, {"Dubai"})["due"] == 2
+
+
+def test_report_filters_by_plan_type_and_status():
+    q = BreachQueue(now=NOW)
+    q.seed(tickets(
+        ("T1", "2026-01-01 10:00", "Open", "Dubai", 1, "Tier 1", 4),
+        ("T2", "2026-01-01 10:00", "Open", "Dubai", 1, "Tier 1", 4),
+        ("T3", "2026-01-01 00:00", "Open", "Dubai", 1, "Tier 1", 4),
+    ).assign(plan_type=["Postpaid", "Prepaid", "Postpaid"], sub_status=["Active", "Active", "Suspended"]))
+    q.push("T4", ("Dubai", 1, "Tier 1", ANY_SUBSCRIBER, ANY_SUBSCRIBER), datetime(2026, 1, 1, 14))
+    postpaid = q.report(NOW, 24, {"Dubai"}, plan_types={"Postpaid"})
+    assert (postpaid["breached"], postpaid["due"]) == (1, 2)                 # T3 breached; T1 and feed ticket T4 due
+    active = q.report(NOW, 24, {"Dubai"}, plan_types={"Postpaid"}, statuses={"Active"})
+    assert (active["breached"], sorted(active["due_list"]["ticket_id"])) == (0, ["T1", "T4"])
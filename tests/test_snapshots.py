@@ -0,0 +1,43 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import snapshots
+
+pytest.importorskip("pyarrow")
+
+
+def mapped_ranges(path):
+    ranges = []
+    for line in Path("/proc/self/maps").read_text().splitlines():
+        if line.endswith(str(path)):
+            lo, hi = (int(x, 16) for x in line.split()[0].split("-"))
+            ranges.append((lo, hi))
+    return ranges
+
+
+def addresses(series):
+    arr = series.array
+    if hasattr(arr, "_pa_array"):
+        return [b.address for chunk in arr._pa_array.chunks for b in chunk.buffers() if b is not None and b.size]
+    return [np.asarray(arr).__array_interface__["data"][0]]
+
+
+@pytest.mark.skipif(not Path("/proc/self/maps").exists(), reason="needs /proc/self/maps")
+def test_read_snapshot_wraps_mapped_buffers(tmp_path):
+    frame = pd.DataFrame({
+        "subscriber_id": [f"SUB_{i:05d}" for i in range(1000)],
+        "ticket_date": pd.date_range("2025-09-01", periods=1000, freq="h"),
+        "zone": np.arange(1000) % 8 + 1,
+        "res_hours": np.where(np.arange(1000) % 3, 1.5, np.nan),
+    })
+    path = tmp_path / "frame.arrow"
+    snapshots.write_snapshot(frame, path)
+    read = snapshots.read_snapshot(path)
+    pd.testing.assert_frame_equal(read, frame, check_dtype=False)
+
+    ranges = mapped_ranges(path)
+    inside = {col: all(any(lo <= a < hi for lo, hi in ranges) for a in addresses(read[col])) for col in read}
+    assert inside["subscriber_id"] and inside["ticket_date"] and inside["zone"]     # res_hours has nulls: copied
@@ -0,0 +1,46 @@
+import pytest
+
+import engine
+import snapshots
+import startup
+from data_layer import table
+from derived import DERIVED, derived_frame
+
+SHARED_INPUTS = {"subscribers", "ticket_fact", "billing_fact"}
+
+
+@pytest.fixture
+def built(monkeypatch):
+    """Names of the derived frames loaded or built from a cold frame cache."""
+    names = []
+    load_or_build = snapshots.load_or_build
+
+    def spy(name, *args, **kwargs):
+        names.append(name)
+        return load_or_build(name, *args, **kwargs)
+
+    derived_frame.clear()
+    monkeypatch.setattr(snapshots, "load_or_build", spy)
+    return names
+
+
+def test_view_frames_are_registered():
+    for view in engine.VIEWS:
+        assert set(engine.VIEW_FRAMES[view]) <= set(DERIVED)
+
+
+def test_managerial_options_do_not_read_billing(built):
+    start, end = engine.filter_options(engine.MANAGERIAL)["ops_period"]
+    assert built and not [name for name in built if "billing" in DERIVED[name][1]]
+
+    outages = table("outages", ("outage_start_time", "outage_end_time")).frame
+    assert start <= outages["outage_start_time"].min() and end >= outages["outage_end_time"].max()
+
+
+@pytest.mark.parametrize("view", engine.VIEWS)
+def test_warm_up_builds_only_the_view(view, built, monkeypatch):
+    monkeypatch.setitem(startup.FLAGS, "query_server", "")
+    startup._warm_up(view)
+    assert startup.WARM_UP[view]["error"] is None
+    others = set().union(*(engine.VIEW_FRAMES[v] for v in engine.VIEWS if v != view))
+    assert not (others - set(engine.VIEW_FRAMES[view]) - SHARED_INPUTS) & set(built)
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+
+from derived import DERIVED, derived_frame
+
+# =====================================================
+# PRE-BINNED TICKET TIME SERIES
+# =====================================================
+# Ticket counts are stored once per (time bucket x dimension combination), so
+# any trend under any filter is a boolean mask over a small table plus a
+# groupby-sum, instead of a re-merge and per-row date conversion.
+
+DIMENSIONS = [
+    "city", "plan_type", "sub_status", "zone",
+    "ticket_channel", "ticket_category", "priority", "assigned_team", "service_tier",
+]
+
+GRAINS = {"day": "datetime64[D]", "hour": "datetime64[h]"}
+
+RESAMPLE = {"Hourly": ("hour", None), "Daily": ("day", None),
+            "Weekly": ("day", "W"), "Monthly": ("day", "MS")}
+
+
+def build_rollup(grain):
+    fact = derived_frame("ticket_fact")
+    fact = fact[fact["ticket_date"].notna()]
+
+    keys = pd.DataFrame({
+        "bucket": fact["ticket_date"].values.astype(GRAINS[grain]).astype("datetime64[ns]"),
+    })
+    for dim in DIMENSIONS:
+        col = fact[dim] if dim in fact.columns else pd.Series("Unassigned", index=fact.index)
+        keys[dim] = pd.Categorical(col.to_numpy())
+
+    rollup = (
+        keys.groupby(["bucket"] + DIMENSIONS, observed=True, dropna=False)
+        .size()
+        .rename("tickets")
+        .reset_index()
+    )
+    rollup["tickets"] = rollup["tickets"].astype(np.int32)
+    return rollup.sort_values("bucket", ignore_index=True)
+
+
+DERIVED["ticket_daily"] = (lambda: build_rollup("day"), ("tickets", "subscribers"), 1)
+DERIVED["ticket_hourly"] = (lambda: build_rollup("hour"), ("tickets", "subscribers"), 1)
+
+
+# Daily ticket KPI flows: tickets opened per opening day, and resolutions
+# (count, hours, within SLA) per resolution day. Any period's KPIs - and the
+# backlog at any date, opened minus resolved up to it - are sums over rows.
+KPI_DIMENSIONS = ["city", "zone", "plan_type", "sub_status"]
+KPI_FLOWS = ["opened", "resolved", "res_hours", "sla_met"]
+
+
+def build_kpi_rollup():
+    fact = derived_frame("ticket_fact", ("ticket_date", "resolution_date", "status", "res_hours",
+                                         "sla_target_hours", *KPI_DIMENSIONS))
+    dims = {dim: fact[dim].to_numpy() for dim in KPI_DIMENSIONS}
+    opened = pd.DataFrame({"day": fact["ticket_date"].dt.normalize(), **dims,
+                           "opened": 1, "resolved": 0, "res_hours": 0.0, "sla_met": 0})
+    done = ((fact["status"] == "Resolved") & fact["resolution_date"].notna()).to_numpy()
+    res_hours = fact["res_hours"].to_numpy()[done]
+    resolved = pd.DataFrame({"day": fact["resolution_date"][done].dt.normalize().to_numpy(),
+                             **{dim: v[done] for dim, v in dims.items()},
+                             "opened": 0, "resolved": 1, "res_hours": res_hours,
+                             "sla_met": (res_hours <= fact["sla_target_hours"].to_numpy()[done]).astype(int)})
+    rows = pd.concat([opened, resolved], ignore_index=True).dropna(subset=["day"])
+    return (rows.groupby(["day"] + KPI_DIMENSIONS, dropna=False)[KPI_FLOWS].sum()
+            .reset_index().sort_values("day", ignore_index=True))
+
+
+DERIVED["ticket_kpi_daily"] = (build_kpi_rollup, ("tickets", "subscribers"), 1)
+
+
+def ticket_volume(filters=None, granularity="Daily"):
+    """Ticket counts per bucket for rows matching `filters` ({dimension: values}).
+
+    Daily and hourly series are zero-filled; weekly and monthly are
+    resampled from the daily rollup.
+    """
+    grain, rule = RESAMPLE[granularity]
+    rollup = derived_frame("ticket_daily" if grain == "day" else "ticket_hourly")
+
+    mask = np.ones(len(rollup), dtype=bool)
+    for dim, values in (filters or {}).items():
+        mask &= rollup[dim].isin(values).to_numpy()
+
+    series = rollup.loc[mask, "tickets"].groupby(rollup.loc[mask, "bucket"]).sum()
+    if series.empty:
+        return series
+    if rule is None:
+        return series.asfreq("D" if grain == "day" else "h", fill_value=0)
+    return series.resample(rule).sum()